@@ -1,106 +1,364 @@
 import json
 import os
 import logging
-import io
 import urllib
 import time
 import asyncio
-import threading
 from typing import List, Any, Optional, Union
 
 import boto3
-from botocore.exceptions import NoCredentialsError, PartialCredentialsError
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Form, UploadFile, File, HTTPException
-from fastapi.responses import StreamingResponse
-from google.cloud import speech
-from pydub import AudioSegment
+from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Form, UploadFile, File, Header, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from .provider.database_manager import DatabaseManager
-from .provider.audio_manager import ResumableMicrophoneSocketStream, listen_print_loop
+from .provider.audio_manager import ResumableMicrophoneSocketStream, VoiceActivityDetector, listen_print_loop
+from .provider.audio_decoder import AudioDecoderPool, PCM
 from .service.chat_service import ChatServiceManager
 from .service.llm.gpt_service import GptServiceManager
+from .service.llm.rolling_summary_service import RollingSummaryService
+from .service.llm.summary_cache import SummaryCache
 from .service.mail_service import MailServiceManager
-from .service.transcribe_service import TranscriptionService
+from .service.mail_dispatcher import MailDispatcher
+from .service.storage_service import StorageServiceManager, MB
+from .service.transcribe_service import TranscriptionService, STT_SESSIONS
+from .service.batch_transcription_service import BatchTranscriptionService
+from .service.stt.base import SttBackend
+from .service.stt.google_backend import GoogleSttBackend
+from .service.stt.local_backend import LocalSttBackend
 from .service.audio_stream_service import AudioStreamServiceManager
+from .service.audio_archiver import AudioArchiver
+from .service.broker.base import MessageBroker
+from .service.broker.memory_broker import InProcessBroker
+from .service.broker.unix_broker import UnixSocketBroker
+from .service.meeting_service import MeetingRoom, MeetingRoomManager
+from .service.transcript_writer import TranscriptWriter
+from .service.transcription_scheduler import TranscriptionScheduler
+from .service.transcript_coalescer import InterimCoalescer
+from .service.utterance_tracer import UtteranceTracer
 from .model.file_info import FileInfo
 from .model.attendee import Attendance
 from .model.utterance import Utterance
 from .util.time_util import TimeUtil
+from .util.metrics import REGISTRY
 
 
 app = FastAPI()
 logger = logging.getLogger("uvicorn")
 logger.setLevel(logging.INFO)
 
+REGISTRY.enabled = os.environ.get("METRICS_ENABLED", "1") != "0"
+
 db_manager = DatabaseManager(
     user=os.environ["DB_USER"],
     password=os.environ["DB_PASSWORD"],
     host=os.environ["DB_HOST"],
     database_name=os.environ["DB_NAME"],
+    port=int(os.environ.get("DB_PORT", 3306)),
+    min_pool_size=int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+    max_pool_size=int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", 3600)),
+    health_check_interval=float(os.environ.get("DB_HEALTH_CHECK_INTERVAL", 30)),
 )
-# db_manager.drop_meeting_table()
-# db_manager.drop_attendee_table()
-db_manager.create_meeting_table()
-db_manager.create_attendee_table()
-db_manager.create_qa_table()
 
 s3_client = boto3.client(
     "s3",
     aws_access_key_id=os.environ["OBJECT_STORAGE_ACCESS_KEY"],
     aws_secret_access_key=os.environ["OBJECT_STORAGE_SECRET_KEY"],
     region_name='kr-standard',
-    endpoint_url='https://kr.object.ncloudstorage.com'
+    endpoint_url=os.environ.get("OBJECT_STORAGE_ENDPOINT", 'https://kr.object.ncloudstorage.com')
+)
+storage_service = StorageServiceManager(
+    s3_client,
+    bucket=os.environ.get("OBJECT_STORAGE_BUCKET", "ggd-bucket01"),
+    chunk_size=int(os.environ.get("OBJECT_STORAGE_CHUNK_MB", 1)) * MB,
+    multipart_chunksize=int(os.environ.get("OBJECT_STORAGE_PART_MB", 8)) * MB,
+    max_concurrency=int(os.environ.get("OBJECT_STORAGE_PART_CONCURRENCY", 4)),
 )
 
-chat_manager = ChatServiceManager()
-audio_stream_manager = AudioStreamServiceManager()
-gpt_service = GptServiceManager(logger)
+summary_cache = SummaryCache(
+    max_entries=int(os.environ.get("SUMMARY_CACHE_MAX_ENTRIES", 1024)),
+    ttl=float(os.environ.get("SUMMARY_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    directory=os.environ.get("SUMMARY_CACHE_DIR"),
+) if os.environ.get("SUMMARY_CACHE_ENABLED", "1") != "0" else None
+gpt_service = GptServiceManager(
+    logger,
+    chunk_token_budget=int(os.environ.get("SUMMARY_CHUNK_TOKENS", 24000)),
+    max_concurrency=int(os.environ.get("SUMMARY_MAX_CONCURRENCY", 8)),
+    cache=summary_cache,
+)
 mail_service = MailServiceManager(
     os.environ["MAIL_ACCOUNT"],
-    os.environ["MAIL_APP_NUMBER"].replace("_", " ")
+    os.environ["MAIL_APP_NUMBER"].replace("_", " "),
+    host=os.environ.get("MAIL_SMTP_HOST", "smtp.gmail.com"),
+    port=int(os.environ.get("MAIL_SMTP_PORT", 465)),
+    use_ssl=os.environ.get("MAIL_SMTP_SSL", "1") != "0",
 )
-# transcription_service = TranscriptionService(logger=logger)
-
-client = speech.SpeechClient()
-config = speech.RecognitionConfig(
-    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,  # 오디오 인코딩 방식
-    sample_rate_hertz=16000,  # 샘플 레이트 (클라이언트의 마이크에 맞게 조정 가능)
-    language_code="ko-KR",  # 인식할 언어 코드
-    model="latest_long",
+mail_dispatcher = MailDispatcher(
+    mail_service,
+    db_manager,
+    pool_size=int(os.environ.get("MAIL_POOL_SIZE", 2)),
+    max_attempts=int(os.environ.get("MAIL_MAX_ATTEMPTS", 5)),
+    base_backoff=float(os.environ.get("MAIL_RETRY_BACKOFF_SECONDS", 5)),
+    # 1 보다 크게 하면 수신자들이 한 transaction 으로 나가고 To 에는 서로의 주소가 보이지 않는다.
+    recipients_per_transaction=int(os.environ.get("MAIL_RECIPIENTS_PER_TRANSACTION", 1)),
 )
-streaming_config = speech.StreamingRecognitionConfig(config=config, interim_results=True)
 
 
-def wrap_async_transcribe(manager, id):
-    asyncio.run(transcribe(manager, id))
+def build_stt_backend() -> SttBackend:
+    backend = os.environ.get("STT_BACKEND", "google")
 
+    if backend == "local":
+        kwargs = {
+            "ms_per_word": int(os.environ.get("STT_LOCAL_MS_PER_WORD", 300)),
+            "latency_ms": int(os.environ.get("STT_LOCAL_LATENCY_MS", 150)),
+        }
+        if "STT_LOCAL_SCRIPT" in os.environ:
+            return LocalSttBackend.from_file(os.environ["STT_LOCAL_SCRIPT"], **kwargs)
 
-async def transcribe(manager: ResumableMicrophoneSocketStream, client_id: int):
-    with manager as stream:
-        while not stream.closed:
-            stream.audio_input = []
-            audio_generator = stream.generator()
+        return LocalSttBackend(**kwargs)
+
+    return GoogleSttBackend(
+        language_code="ko-KR",  # 인식할 언어 코드
+        sample_rate=16000,  # 샘플 레이트 (클라이언트의 마이크에 맞게 조정 가능)
+        model="latest_long",
+    )
+
+
+transcription_service = TranscriptionService(build_stt_backend(), logger=logger)
+batch_transcription_service = BatchTranscriptionService(
+    transcription_service,
+    max_concurrency=int(os.environ.get("BATCH_STT_MAX_CONCURRENCY", 8)),
+    decode_processes=int(os.environ.get("BATCH_DECODE_PROCESSES", 2)),
+    target_segment_seconds=float(os.environ.get("BATCH_SEGMENT_SECONDS", 30)),
+    overlap_ms=int(os.environ.get("BATCH_SEGMENT_OVERLAP_MS", 1000)),
+    ffmpeg=os.environ.get("FFMPEG_BINARY", "ffmpeg"),
+    temp_dir=os.environ.get("BATCH_TEMP_DIR"),
+)
+
+
+utterance_tracer = UtteranceTracer(
+    sample_rate=float(os.environ.get("TRACE_SAMPLE_RATE", 0.1)),
+    export_path=os.environ.get("TRACE_EXPORT_PATH"),
+)
+
+decoder_pool = AudioDecoderPool(
+    ffmpeg=os.environ.get("FFMPEG_BINARY", "ffmpeg"),
+    max_decoders=int(os.environ.get("AUDIO_MAX_DECODERS", 64)),
+)
+
+
+def build_broker() -> MessageBroker:
+    # uvicorn --workers 를 2 이상으로 띄울 때는 unix 나 redis 를 써야 한 회의의 참석자들이 서로의 메시지를 받는다.
+    backend = os.environ.get("BROKER_BACKEND", "memory")
+
+    if backend == "unix":
+        return UnixSocketBroker(os.environ.get("BROKER_UNIX_SOCKET", "/tmp/smart_meeting_broker.sock"))
+
+    if backend == "redis":
+        from .service.broker.redis_broker import RedisBroker
+
+        return RedisBroker(os.environ.get("BROKER_REDIS_URL", "redis://localhost:6379/0"))
+
+    return InProcessBroker()
+
+
+broker = build_broker()
+
+
+# AUDIO_ARCHIVE_DIR 를 정하지 않으면 audio 를 남기지 않는다.
+audio_archiver = AudioArchiver(
+    os.environ.get("AUDIO_ARCHIVE_DIR"),
+    db_manager,
+    broker,
+    upload=storage_service.upload if os.environ.get("AUDIO_ARCHIVE_UPLOAD", "0") != "0" else None,
+    format=os.environ.get("AUDIO_ARCHIVE_FORMAT", "wav"),
+    segment_seconds=float(os.environ.get("AUDIO_ARCHIVE_SEGMENT_MINUTES", 5)) * 60,
+    flush_interval=float(os.environ.get("AUDIO_ARCHIVE_FLUSH_SECONDS", 1.0)),
+    max_batch_bytes=int(float(os.environ.get("AUDIO_ARCHIVE_BATCH_MB", 4)) * MB),
+    max_pending_bytes=int(float(os.environ.get("AUDIO_ARCHIVE_MAX_PENDING_MB", 64)) * MB),
+    fsync=os.environ.get("AUDIO_ARCHIVE_FSYNC", "segment"),
+    ffmpeg=os.environ.get("FFMPEG_BINARY", "ffmpeg"),
+)
+
+
+transcript_writer = TranscriptWriter(
+    db_manager,
+    batch_size=int(os.environ.get("QA_WRITE_BATCH_SIZE", 50)),
+    flush_interval=float(os.environ.get("QA_WRITE_INTERVAL_SECONDS", 1.0)),
+)
+
+
+def build_meeting_room(meeting_id: int) -> MeetingRoom:
+    chat_manager = ChatServiceManager(broker=broker, channel=f"meeting:{meeting_id}:chat")
+
+    async def load_named_utterances() -> List[Utterance]:
+        attendees = await db_manager.select_attendee_table_with_meeting_id(meeting_id)
+        attendee_id_name_map = {
+            attendee["id"]: attendee["name"] for attendee in attendees
+        }
+
+        return [
+            Utterance(timestamp=x.timestamp, text=x.text, speaker=attendee_id_name_map.get(int(x.speaker), x.speaker) if x.speaker.isdigit() else x.speaker) 
+            for x in list(chat_manager.qa_list)
+        ]
+
+    rolling_summary_service = RollingSummaryService(
+        gpt_service,
+        db_manager,
+        load_named_utterances,
+        meeting_id=meeting_id,
+        block_size=int(os.environ.get("SUMMARY_BLOCK_UTTERANCES", 20)),
+        interval=float(os.environ.get("SUMMARY_INTERVAL_SECONDS", 30)),
+    )
+
+    return MeetingRoom(
+        meeting_id, chat_manager, AudioStreamServiceManager(), rolling_summary_service, transcript_writer, broker
+    )
+
+
+async def meeting_exists(meeting_id: int) -> bool:
+    return len(await db_manager.select_meeting_table_with_id(meeting_id)) > 0
+
+
+meeting_rooms = MeetingRoomManager(build_meeting_room, meeting_exists, broker)
+
+
+async def open_meeting_room(meeting_id: int) -> MeetingRoom:
+    room = await meeting_rooms.get(meeting_id)
+    if room is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    return room
 
-            requests = (
-                speech.StreamingRecognizeRequest(audio_content=content) for content in audio_generator
-            )                
 
-            responses = client.streaming_recognize(streaming_config, requests)
-            message_generator = listen_print_loop(responses, stream, client_id)
+AUDIO_QUEUE_CHUNKS = REGISTRY.gauge(
+    "audio_queue_chunks", "Audio chunks waiting for the STT session.", ["meeting_id", "client_id"]
+)
+AUDIO_DROPPED_CHUNKS = REGISTRY.gauge(
+    "audio_dropped_chunks", "Audio chunks dropped because the queue was full.", ["meeting_id", "client_id"]
+)
+STT_SESSION_RESTARTS = REGISTRY.gauge(
+    "stt_session_restarts", "STT sessions restarted for the stream (restart_counter).", ["meeting_id", "client_id"]
+)
+CHAT_CONNECTIONS = REGISTRY.gauge("chat_connections", "Chat websockets connected to this worker.", ["meeting_id"])
+MEETING_ROOMS_OPEN = REGISTRY.gauge("meeting_rooms_open", "Meeting rooms open in this worker.")
+DB_POOL_CONNECTIONS = REGISTRY.gauge("db_pool_connections", "Database pool connections.", ["state"])
+TRANSCRIPT_WRITER_PENDING = REGISTRY.gauge("transcript_writer_pending", "Utterances not yet written to the qa table.")
+AUDIO_DECODERS_ACTIVE = REGISTRY.gauge("audio_decoders_active", "ffmpeg decoders running for compressed audio streams.")
+
+
+def collect_metrics() -> None:
+    # 연결이 끊긴 stream 의 값이 남지 않도록 매번 새로 채운다.
+    for gauge in (AUDIO_QUEUE_CHUNKS, AUDIO_DROPPED_CHUNKS, STT_SESSION_RESTARTS, CHAT_CONNECTIONS):
+        gauge.clear()
+
+    for meeting_id, room in list(meeting_rooms.rooms.items()):
+        CHAT_CONNECTIONS.labels(meeting_id).set(len(room.chat.active_connections))
+        for client_id, stream in list(room.audio.stream_status.items()):
+            usage = stream.memory_usage()
+            AUDIO_QUEUE_CHUNKS.labels(meeting_id, client_id).set(usage["queued_chunks"])
+            AUDIO_DROPPED_CHUNKS.labels(meeting_id, client_id).set(usage["dropped_chunks"])
+            STT_SESSION_RESTARTS.labels(meeting_id, client_id).set(stream.restart_counter)
+
+    MEETING_ROOMS_OPEN.set(len(meeting_rooms.rooms))
+    pool = db_manager.pool_status()
+    DB_POOL_CONNECTIONS.labels("size").set(pool["size"])
+    DB_POOL_CONNECTIONS.labels("free").set(pool["free"])
+    TRANSCRIPT_WRITER_PENDING.set(transcript_writer.stats()["pending"])
+    AUDIO_DECODERS_ACTIVE.set(len(decoder_pool.active))
+
+
+REGISTRY.add_collector(collect_metrics)
+
+
+async def latest_meeting_id() -> Optional[int]:
+    meetings = await db_manager.select_latest_meeting_table()
+
+    return meetings[0]["id"] if len(meetings) >= 1 else None
+
+
+async def current_meeting_id() -> int:
+    # 회의를 지정하지 않는 기존 route 들은 가장 최근에 예약된 회의를 대상으로 한다.
+    meeting_id = await latest_meeting_id()
+    if meeting_id is None:
+        raise HTTPException(status_code=404, detail="No meeting has been reserved.")
+
+    return meeting_id
+
+
+@app.on_event("startup")
+async def startup():
+    logger.info(f"STT backend : {transcription_service.backend.name}")
+    await broker.start()
+    logger.info(f"Broker backend : {broker.name} ({broker.node_id})")
+    await db_manager.connect()
+    # await db_manager.drop_meeting_table()
+    # await db_manager.drop_attendee_table()
+    await db_manager.migrate()
+    transcript_writer.start()
+    utterance_tracer.start()
+    audio_archiver.start()
+    meeting_rooms.start()
+    # 재시작 전에 진행 중이던 회의는 발언과 요약을 바로 복구해 둔다.
+    meeting_id = await latest_meeting_id()
+    if meeting_id is not None:
+        await meeting_rooms.get(meeting_id)
+    await mail_dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await meeting_rooms.close_all()
+    await transcript_writer.stop()
+    await utterance_tracer.stop()
+    await mail_dispatcher.stop()
+    await transcription_scheduler.shutdown()
+    await decoder_pool.close()
+    await audio_archiver.stop()
+    await batch_transcription_service.close()
+    await transcription_service.close()
+    await db_manager.close()
+    await broker.close()
+
+
+async def transcribe(manager: ResumableMicrophoneSocketStream, key: tuple[int, int]):
+    meeting_id, client_id = key
+    room = await meeting_rooms.get(meeting_id)
+    if room is None:
+        return
+
+    async def send_transcript(message: dict) -> None:
+        await room.chat.broadcast_json(message)
+        utterance_tracer.finish(message)
+
+    coalescer = InterimCoalescer(
+        send_transcript,
+        max_interim_per_second=float(os.environ.get("STT_INTERIM_MAX_PER_SECOND", 5)),
+    )
+
+    with manager as stream, coalescer:
+        while not stream.closed:
+            # 긴 침묵 동안에는 STT session 을 열지 않고 다시 말하기 시작할 때까지 기다린다.
+            await stream.wait_for_speech()
+            stream.session_start = stream.audio_buffer.end
+            results = transcription_service.streaming_recognize(stream.generator())
+            STT_SESSIONS.inc()
 
             try:
-                for message_dict in message_generator:
+                message_generator = listen_print_loop(results, stream, client_id)
+
+                async for message_dict in message_generator:
+                    utterance_tracer.begin(meeting_id, client_id, message_dict, stream)
+
                     if not message_dict["is_done"]:
-                        for attendee_id in audio_stream_manager.stream_status:
-                            if attendee_id == client_id:
-                                continue
-                            audio_stream_manager.stream_status[attendee_id].paused = True
-                        
-                        await chat_manager.broadcast(json.dumps(message_dict))
+                        await room.pause_listeners(client_id, True)
+                        await coalescer.push(message_dict)
 
                     else:
                         if message_dict["message"].strip() != "":
-                            chat_manager.qa_list.append(
+                            await room.add_utterance(
                                 Utterance(
                                     timestamp=TimeUtil.convert_unixtime_to_timestamp(message_dict["timestamp"]),
                                     speaker=str(client_id),
@@ -108,28 +366,47 @@ async def transcribe(manager: ResumableMicrophoneSocketStream, client_id: int):
                                 )
                             )
 
-                            await chat_manager.broadcast(json.dumps(message_dict))
+                            await coalescer.push(message_dict)
+                        else:
+                            coalescer.cancel()
 
                         await asyncio.sleep(2)
-                        for attendee_id in audio_stream_manager.stream_status:
-                            if attendee_id == client_id:
-                                continue
-                            audio_stream_manager.stream_status[attendee_id].paused = False                                                
+                        await room.pause_listeners(client_id, False)
                     
             except Exception as e:
                 logger.error(f"#{client_id} Client Transcription error : {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                # 이전 session 의 request generator 가 다음 session 의 audio 를 가져가지 않도록 끊는다.
+                await results.aclose()
 
             if stream.result_end_time > 0:
                 stream.final_request_end_time = stream.is_final_end_time
             stream.result_end_time = 0
-            stream.last_audio_input = []
-            stream.last_audio_input = stream.audio_input
-            stream.audio_input = []
+            stream.last_session = (stream.session_start, stream.audio_buffer.end)
             stream.restart_counter = stream.restart_counter + 1
 
             stream.new_stream = True
 
 
+transcription_scheduler = TranscriptionScheduler(
+    transcribe,
+    max_concurrent_streams=int(os.environ.get("STT_MAX_CONCURRENT_STREAMS", 200)),
+)
+
+
+def build_voice_activity_detector() -> Optional[VoiceActivityDetector]:
+    if os.environ.get("VAD_ENABLED", "1") == "0":
+        return None
+
+    return VoiceActivityDetector(
+        energy_threshold=int(os.environ.get("VAD_ENERGY_THRESHOLD", 300)),
+        hangover_ms=int(os.environ.get("VAD_HANGOVER_MS", 400)),
+        preroll_ms=int(os.environ.get("VAD_PREROLL_MS", 300)),
+        pause_after_ms=int(os.environ.get("VAD_PAUSE_AFTER_MS", 5000)),
+    )
+
+
 def is_blank_or_none(value: str):
     if value is None or value == "'":
         return True
@@ -143,41 +420,48 @@ async def reserve(
     attendees_data: str = Form(...),
     files: List[Union[UploadFile, None]] = File(None)
 ):
-    db_manager.delete_all_meeting_table()
-    db_manager.delete_all_attendee_table()
+    meeting_info: dict[str, Any] = json.loads(reserve_data)    
+    # start_time, end_time 은 DATETIME column 이라 MySQL 이 읽을 수 있는 형식으로 바꿔서 넣는다.
+    # 파일을 올리기 전에 확인해서 잘못된 예약이 파일만 남기지 않게 한다.
+    try:
+        for key in ("start_time", "end_time"):
+            meeting_info[key] = TimeUtil.normalize_timestamp(meeting_info[key])
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid meeting time : {e}")
 
     files_info = []
     if files is not None:        
-        for file in files:                
-            try:
-                s3_client.put_object(
-                    Bucket="ggd-bucket01",
-                    Key=file.filename,
-                    Body=file.file,
-                )
-                files_info.append({"file": file.filename})
-
-            except NoCredentialsError:
-                raise HTTPException(status_code=401, detail="Naver Cloud credentials not available")
-            except PartialCredentialsError:
-                raise HTTPException(status_code=401, detail="Incomplete Naver Cloud credentials")
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+        try:
+            uploaded = await storage_service.upload_files(files)
+            files_info = [{"file": file_name} for file_name in uploaded]
+
+        except NoCredentialsError:
+            raise HTTPException(status_code=401, detail="Naver Cloud credentials not available")
+        except PartialCredentialsError:
+            raise HTTPException(status_code=401, detail="Incomplete Naver Cloud credentials")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
         
-    meeting_info: dict[str, Any] = json.loads(reserve_data)    
     meeting_info["files"] = json.dumps(files_info, ensure_ascii=False)
     meeting_info["pt_contents"] = "Presentation contents should be updated"
     meeting_info["status"] = "회의 시작 전"
-    db_manager.insert_meeting_table(meeting_info)
 
     attendees: List[dict[str, Any]] = json.loads(attendees_data)
     for attendee in attendees:    
         attendee["meeting_name"] = f"{meeting_info['name']}_{meeting_info['start_time']}"
-        db_manager.insert_attendee_info_table(attendee)
+
+    meeting_id = await db_manager.insert_meeting_with_attendees(meeting_info, attendees)
+
+    return {"meeting_id": meeting_id}
 
 
 @app.get("/update_meeting/{status}", status_code=200)
 async def update_meeting(status: str):
+    return await update_meeting_with_id(await current_meeting_id(), status)
+
+
+@app.get("/meetings/{meeting_id}/update_meeting/{status}", status_code=200)
+async def update_meeting_with_id(meeting_id: int, status: str):
     meeting_status: dict[str, int] = {
         "회의 시작 전": 1,
         "PT발표": 2,
@@ -189,43 +473,111 @@ async def update_meeting(status: str):
 
     if status not in meeting_status:
         return HTTPException(500, "meeting status is not correct.")
-    logger.info(f"Update meeting status : {status}")
+    logger.info(f"#{meeting_id} Update meeting status : {status}")
     
     if status not in ["정회", "재개"]:
-        db_manager.update_meeting_status_table(status)
+        await db_manager.update_meeting_status_table(meeting_id, status)
+
+    if status == "회의 종료상태":
+        await audio_archiver.finish_meeting(meeting_id)
 
-    await chat_manager.broadcast(json.dumps(
+    room = await open_meeting_room(meeting_id)
+    await room.chat.broadcast_json(
         {"type": "meeting_status", "status": meeting_status[status]}
-    ))
+    )
+
+    if status == "회의 종료상태":
+        await meeting_rooms.finish(meeting_id)
 
 
 @app.get("/meeting_detail", status_code=200)
 async def get_meeting_detail():
-    meetings: tuple[dict] = db_manager.select_all_meeting_table()
-    meeting: dict = meetings[-1] if len(meetings) >= 1 else {}
+    meeting_id = await latest_meeting_id()
+    if meeting_id is None:
+        return {"meeting": {}, "attendees": []}
+
+    return await get_meeting_detail_with_id(meeting_id)
+
+
+@app.get("/meetings/{meeting_id}", status_code=200)
+async def get_meeting_detail_with_id(meeting_id: int):
+    meetings: tuple[dict] = await db_manager.select_meeting_table_with_id(meeting_id)
+    if len(meetings) == 0:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    attendees: tuple[dict] = await db_manager.select_attendee_table_with_meeting_id(meeting_id)
 
-    attendees: tuple[dict] = db_manager.select_all_attendee_table()
+    return {"meeting": meetings[0], "attendees": list(attendees)}
 
-    return {"meeting": meeting, "attendees": list(attendees)}
+
+@app.get("/meeting_rooms", status_code=200)
+async def get_meeting_rooms():
+    return meeting_rooms.stats()
+
+
+@app.get("/fanout_status", status_code=200)
+async def get_fanout_status():
+    return {
+        meeting_id: {
+            "chat": room.chat.queue_stats(),
+            "audio": room.audio.queue_stats(),
+            "evicted": {
+                "chat": room.chat.fanout.evicted,
+                "audio": room.audio.fanout.evicted,
+            },
+        }
+        for meeting_id, room in list(meeting_rooms.rooms.items())
+    }
+
+
+@app.get("/audio_stream_status", status_code=200)
+async def get_audio_stream_status():
+    streams = {
+        meeting_id: room.audio.stream_stats() for meeting_id, room in list(meeting_rooms.rooms.items())
+    }
+
+    return {
+        "scheduler": transcription_scheduler.status(),
+        "decoders": decoder_pool.stats(),
+        "total_buffer_bytes": sum(x["ring_buffer_bytes"] for room in streams.values() for x in room.values()),
+        "streams": streams,
+    }
 
 
 @app.post("/download_file", status_code=201)
-async def download_file(file_info: FileInfo):
+async def download_file(file_info: FileInfo, range_header: Optional[str] = Header(None, alias="Range")):
     try:                
         logger.info(f"file name : {file_info.file_name}")
-        s3_object = s3_client.get_object(Bucket="ggd-bucket01", Key=file_info.file_name)
+        size = await storage_service.get_size(file_info.file_name)
+        byte_range = storage_service.parse_range(range_header, size)
+        start, end = byte_range if byte_range is not None else (0, size - 1)
+
+        headers = {
+            "Content-Disposition": f"attachment; filename*=UTF-8\'\'{urllib.parse.quote(file_info.file_name)}",
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(end - start + 1),
+        }
+        if byte_range is not None:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        body = await storage_service.open_range(file_info.file_name, start, end) if size > 0 else iter([])
 
         return StreamingResponse(
-            io.BytesIO(s3_object['Body'].read()), 
+            body, 
+            status_code=206 if byte_range is not None else 200,
             media_type="application/octet-stream", 
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8\'\'{urllib.parse.quote(file_info.file_name)}"},
+            headers=headers,
         )
+    except HTTPException:
+        raise
     except NoCredentialsError:
         raise HTTPException(status_code=401, detail="AWS Credentials not available")
     except PartialCredentialsError:
         raise HTTPException(status_code=401, detail="Incomplete AWS credentials")
-    except s3_client.exceptions.NoSuchKey:
-        raise HTTPException(status_code=404, detail="File not found in S3 bucket")
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            raise HTTPException(status_code=404, detail="File not found in S3 bucket")
+        raise HTTPException(status_code=500, detail=f"File download failed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File download failed: {str(e)}")
     
@@ -236,92 +588,271 @@ async def attend(attendance: Attendance):
     attendance_info["attendance_status"] = True
     attendance_info["initial_attendance_time"] = TimeUtil.convert_unixtime_to_timestamp(int(time.time()))
 
-    db_manager.update_attendee_attendance_info_table(attendance_info)
+    await db_manager.update_attendee_attendance_info_table(attendance_info)
 
 
 @app.get("/mail_send/{client_id}", status_code=200)
 async def send_mail(client_id: int):
-    mail_service.login(
-        os.environ["MAIL_ACCOUNT"], 
-        os.environ["MAIL_APP_NUMBER"].replace("_", " ")
-    )
-    
-    attendees = db_manager.select_attendee_table_with_id(client_id)
-    summary: str = db_manager.select_all_meeting_table()[0]["summary"]
+    attendees = await db_manager.select_attendee_table_with_id(client_id)
+    if len(attendees) == 0:
+        raise HTTPException(status_code=404, detail="Attendee not found")
+
+    meetings = await db_manager.select_meeting_table_with_id(attendees[0]["meeting_id"])
+    summary: str = meetings[0]["summary"] if len(meetings) >= 1 else None
 
     if summary is None or summary == "":
         return HTTPException(500, "Summary has not been updated.")    
 
-    try:
-        for attendee in attendees:
-            address: str = attendee["email_address"]        
-            content = mail_service.build_email(address, summary)
-            mail_service.send_email(content)
-    except:
-        return HTTPException(500, "Sending e-mail failed")
+    addresses = [attendee["email_address"] for attendee in attendees]
+    job_id = await mail_dispatcher.submit(summary, addresses)
+
+    return {"job_id": job_id, "recipients": len(addresses)}
 
 
 @app.get("/mail_send", status_code=201)
 async def send_mail():
-    mail_service.login(
-        os.environ["MAIL_ACCOUNT"], 
-        os.environ["MAIL_APP_NUMBER"].replace("_", " ")
-    )
+    return await send_meeting_mail(await current_meeting_id())
+
 
-    attendees = db_manager.select_all_attendee_table()
-    summary: str = db_manager.select_all_meeting_table()[0]["summary"]
+@app.get("/meetings/{meeting_id}/mail_send", status_code=201)
+async def send_meeting_mail(meeting_id: int):
+    attendees = await db_manager.select_attendee_table_with_meeting_id(meeting_id)
+    meetings = await db_manager.select_meeting_table_with_id(meeting_id)
+    summary: str = meetings[0]["summary"] if len(meetings) >= 1 else None
 
     if summary is None or summary == "":
         return HTTPException(500, "Summary has not been updated.")    
     
-    try:
-        for attendee in attendees:
-            if attendee["email_delivery_status"] == 0:
-                continue
+    addresses = [
+        attendee["email_address"] for attendee in attendees if attendee["email_delivery_status"] != 0
+    ]
+    job_id = await mail_dispatcher.submit(summary, addresses)
 
-            address: str = attendee["email_address"]        
-            content = mail_service.build_email(address, summary)
-            mail_service.send_email(content)
-    except:
-        return HTTPException(500, "Sending e-mail failed")
+    return {"job_id": job_id, "recipients": len(addresses)}
+
+
+@app.get("/mail_jobs/{job_id}", status_code=200)
+async def get_mail_job(job_id: int):
+    status = await mail_dispatcher.job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Mail job not found")
+
+    return status
+
+
+@app.get("/mail_dispatcher_status", status_code=200)
+async def get_mail_dispatcher_status():
+    return mail_dispatcher.stats()
 
 
 @app.get("/summarize", status_code=201)
 async def summarize():
-    attendees = db_manager.select_all_attendee_table()
-    attendee_id_name_map = {
-        attendee["id"]: attendee["name"] for attendee in attendees
-    }
+    return await summarize_meeting(await current_meeting_id())
 
-    utterances = [
-        Utterance(timestamp=x.timestamp, text=x.text, speaker=attendee_id_name_map[int(x.speaker)]) 
-        for x in chat_manager.qa_list
-    ]
 
-    summary: str = gpt_service.summarize(utterances)
-    logger.info(f"Summary : \n {summary}")
-    db_manager.update_meeting_summary_table(summary)
+@app.get("/meetings/{meeting_id}/summarize", status_code=201)
+async def summarize_meeting(meeting_id: int):
+    room = await open_meeting_room(meeting_id)
+    # 회의 중에 구간별 요약을 미리 해 두었으므로 마지막 구간만 요약해서 합친다.
+    summary: str = await room.rolling_summary.summarize()
+    logger.info(f"#{meeting_id} Summary : \n {summary}")
+    await db_manager.update_meeting_summary_table(meeting_id, summary)
 
     return {"summary": summary}
 
 
+SUMMARY_BROADCAST_INTERVAL = float(os.environ.get("SUMMARY_BROADCAST_INTERVAL_SECONDS", 0.1))
+
+
+async def produce_summary_stream(room: MeetingRoom, events: asyncio.Queue) -> None:
+    # 요청한 client 가 중간에 끊겨도 요약은 끝까지 만들어서 저장하고 회의 참석자에게 알린다.
+    summary = ""
+    last_broadcast = 0.0
+    await room.chat.broadcast_json({"type": "summary_progress", "status": "started", "message": ""})
+    try:
+        async for token in room.rolling_summary.summarize_stream():
+            summary += token
+            events.put_nowait({"type": "token", "text": token})
+            # token 마다 전체 요약을 직렬화해서 broker 로 보내면 O(n^2) 이므로 interval 마다 한 번만 보내고,
+            # 마지막까지의 전체 요약은 done 에 실린다.
+            now = time.monotonic()
+            if now - last_broadcast >= SUMMARY_BROADCAST_INTERVAL:
+                last_broadcast = now
+                await room.chat.broadcast_json({"type": "summary_progress", "status": "streaming", "message": summary})
+
+        logger.info(f"#{room.meeting_id} Summary : \n {summary}")
+        await db_manager.update_meeting_summary_table(room.meeting_id, summary)
+        events.put_nowait({"type": "done", "summary": summary})
+        await room.chat.broadcast_json({"type": "summary_progress", "status": "done", "message": summary})
+    except Exception as e:
+        logger.error(f"#{room.meeting_id} Streaming summary failed : {e}")
+        events.put_nowait({"type": "error", "detail": str(e)})
+        await room.chat.broadcast_json({"type": "summary_progress", "status": "failed", "message": summary})
+    finally:
+        events.put_nowait(None)
+
+
+summary_stream_tasks: set[asyncio.Task] = set()
+
+
+@app.get("/summarize/stream", status_code=200)
+async def summarize_stream():
+    return await summarize_meeting_stream(await current_meeting_id())
+
+
+@app.get("/meetings/{meeting_id}/summarize/stream", status_code=200)
+async def summarize_meeting_stream(meeting_id: int):
+    room = await open_meeting_room(meeting_id)
+    events: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(produce_summary_stream(room, events))
+    summary_stream_tasks.add(task)
+    task.add_done_callback(summary_stream_tasks.discard)
+
+    async def event_stream():
+        while (event := await events.get()) is not None:
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/transcript_writer_status", status_code=200)
+async def get_transcript_writer_status():
+    return transcript_writer.stats()
+
+
+@app.get("/meetings/{meeting_id}/latency_report", status_code=200)
+async def get_meeting_latency_report(meeting_id: int):
+    return utterance_tracer.report(meeting_id)
+
+
+@app.get("/utterance_tracer_status", status_code=200)
+async def get_utterance_tracer_status():
+    return utterance_tracer.stats()
+
+
+@app.get("/meetings/{meeting_id}/audio_segments", status_code=200)
+async def get_meeting_audio_segments(meeting_id: int, speaker: Optional[str] = None, at: Optional[int] = None):
+    # at 은 unix time (ms). 주면 그 시각의 audio 를 담은 segment 만 돌려준다.
+    return await db_manager.select_audio_segment_table(meeting_id, speaker, at)
+
+
+@app.get("/audio_archive_status", status_code=200)
+async def get_audio_archive_status():
+    return audio_archiver.stats()
+
+
+@app.get("/metrics", status_code=200)
+async def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/broker_status", status_code=200)
+async def get_broker_status():
+    return broker.stats()
+
+
+@app.get("/summary_cache_status", status_code=200)
+async def get_summary_cache_status():
+    return summary_cache.stats() if summary_cache is not None else {"enabled": False}
+
+
+@app.get("/live_summary", status_code=200)
+async def get_live_summary():
+    return await get_meeting_live_summary(await current_meeting_id())
+
+
+@app.get("/meetings/{meeting_id}/live_summary", status_code=200)
+async def get_meeting_live_summary(meeting_id: int):
+    room = await open_meeting_room(meeting_id)
+
+    return await room.rolling_summary.status()
+
+
 @app.post("/update_qa", status_code=201)
 async def update_qa(utterances: List[Utterance]):
-    db_manager.delete_all_qa_table()
+    await update_meeting_qa(await current_meeting_id(), utterances)
+
 
-    for utterance in utterances:
-        db_manager.insert_qa_table(
+@app.post("/meetings/{meeting_id}/update_qa", status_code=201)
+async def update_meeting_qa(meeting_id: int, utterances: List[Utterance]):
+    room = await open_meeting_room(meeting_id)
+    # 아직 기록되지 않은 발언이 교체한 뒤에 다시 들어가지 않도록 먼저 비운다.
+    await transcript_writer.flush()
+    await db_manager.replace_qa_table(
+        meeting_id,
+        [
             {
                 "speaker": utterance.speaker, 
-                "timestamp": utterance.timestamp,
+                # timestamp 는 DATETIME column 이라 unixtime 으로 온 값은 문자열로 바꿔서 넣는다.
+                "timestamp": (
+                    TimeUtil.convert_unixtime_to_timestamp(utterance.timestamp)
+                    if isinstance(utterance.timestamp, int) else utterance.timestamp
+                ),
                 "message": utterance.text,
             }
-        )    
+            for utterance in utterances
+        ]
+    )
+    # 채팅의 발언 목록과 요약 상태가 지워진 발언을 가리키지 않도록 새 발언으로 맞춘다.
+    await room.replace_utterances()
+
+
+@app.post("/meetings/{meeting_id}/transcribe_recording", status_code=200)
+async def transcribe_meeting_recording(
+    meeting_id: int,
+    file: UploadFile = File(...),
+    speaker: Optional[int] = Form(None),
+    started_at: Optional[int] = Form(None),
+    save: bool = Form(False),
+):
+    # 진행 상황과 발언을 한 줄에 하나씩 json 으로 보낸다. started_at 은 녹음이 시작된 unix time (ms) 이다.
+    # 저장한 발언은 요약과 채팅에서 참석자 id 로 읽으므로 save 할 때는 speaker 가 꼭 있어야 한다.
+    if save and speaker is None:
+        raise HTTPException(status_code=422, detail="speaker must be an attendee id when save is true")
+
+    room = await open_meeting_room(meeting_id) if save else None
+    path = await batch_transcription_service.save_upload(file.file, file.filename)
+    started_at = started_at if started_at is not None else int(time.time() * 1000)
+    logger.info(f"#{meeting_id} Batch transcription of {file.filename} started")
+
+    async def events():
+        async for event in batch_transcription_service.run(path, "" if speaker is None else str(speaker), started_at):
+            if room is not None and event["type"] == "utterance":
+                await room.add_utterance(
+                    Utterance(timestamp=event["timestamp"], speaker=event["speaker"], text=event["text"])
+                )
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    # client 가 응답을 읽기 전에 끊으면 events() 가 시작되지 않아 run() 이 file 을 지우지 못하므로 응답이 끝난 뒤 한번 더 지운다.
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(batch_transcription_service.discard, path),
+    )
+
+
+@app.get("/batch_transcription_status", status_code=200)
+async def get_batch_transcription_status():
+    return batch_transcription_service.stats()
+
+
+@app.get("/meetings/{meeting_id}/qa", status_code=200)
+async def get_meeting_qa(meeting_id: int, start: Optional[str] = None, end: Optional[str] = None):
+    if start is None and end is None:
+        return await db_manager.select_qa_table_with_meeting_id(meeting_id)
+
+    return await db_manager.select_qa_table_with_time_range(
+        meeting_id, start or "1000-01-01 00:00:00", end or "9999-12-31 23:59:59"
+    )
 
 
 @app.get("/summarize_test", status_code=201)
 async def update_qa():    
-    qa_list = db_manager.select_all_qa_table()
+    qa_list = await db_manager.select_qa_table_with_meeting_id(await current_meeting_id())
 
     utterances = [
         Utterance(
@@ -331,44 +862,101 @@ async def update_qa():
         ) for x in qa_list
     ]
 
-    summary: str = gpt_service.summarize(utterances)
+    summary: str = await gpt_service.summarize(utterances)
     logger.info(f"Summary : \n {summary}")
     return {"summary": summary}
 
 
 @app.websocket("/ws/transcribe/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: int):
+    meeting_id = await latest_meeting_id()
+    if meeting_id is None:
+        await websocket.close(code=1008)
+        return
+
+    await transcribe_websocket_endpoint(websocket, meeting_id, client_id)
+
+
+@app.websocket("/meetings/{meeting_id}/ws/transcribe/{client_id}")
+async def transcribe_websocket_endpoint(websocket: WebSocket, meeting_id: int, client_id: int):
+    room = await meeting_rooms.get(meeting_id)
+    if room is None:
+        await websocket.close(code=1008)
+        return
+
+    audio_stream_manager = room.audio
     await audio_stream_manager.connect(websocket, client_id)
 
     if client_id not in audio_stream_manager.active_connections:
-        audio_stream_manager.active_connections[client_id] = websocket
-        audio_stream_manager.stream_status[client_id] = ResumableMicrophoneSocketStream()
-        task = threading.Thread(
-            target=wrap_async_transcribe, args=(audio_stream_manager.stream_status[client_id], client_id)
-        )    
-        audio_stream_manager.stream_task[client_id] = task
-        task.start()
-        logger.info(f"#{client_id} thread task : {task.getName()}")
+        audio_stream_manager.add_connection(websocket, client_id)
+        audio_stream_manager.stream_status[client_id] = ResumableMicrophoneSocketStream(
+            vad=build_voice_activity_detector()
+        )
+        task = transcription_scheduler.start((meeting_id, client_id), audio_stream_manager.stream_status[client_id])
+        logger.info(f"#{meeting_id}/{client_id} transcription task : {task.get_name()}, {transcription_scheduler.status()}")
+
+    stream = audio_stream_manager.stream_status[client_id]
+
+    def on_pcm(pcm: bytes) -> None:
+        stream._fill_buffer(pcm)
+        audio_archiver.append(meeting_id, client_id, pcm)
+
+    # codecs query 가 없는 기존 client 는 지금처럼 16 kHz LINEAR16 을 보낸다.
+    # 있으면 (예: ?codecs=webm,ogg,pcm) 그중 decode 할 수 있는 첫 codec 을 골라 알려준다.
+    codec, decoder = PCM, None
+    offered = websocket.query_params.get("codecs")
 
     try:
+        # 알려주는 중에 client 가 끊겨도 아래에서 ffmpeg 를 정리하도록 try 안에서 연다.
+        if offered:
+            codec, decoder = await decoder_pool.open(offered.split(","), on_pcm)
+            await websocket.send_text(json.dumps({"type": "audio_config", "codec": codec, "sample_rate": 16000}))
+            logger.info(f"#{meeting_id}/{client_id} audio codec : {codec}")
+
         while True:
             audio_chunk = await websocket.receive_bytes()
-            audio_stream_manager.stream_status[client_id]._fill_buffer(audio_chunk)
+            if decoder is not None:
+                await decoder.feed(audio_chunk)
+            else:
+                on_pcm(audio_chunk)
 
     except WebSocketDisconnect:
+        await decoder_pool.release(decoder)
+        audio_archiver.close_stream(meeting_id, client_id)
         audio_stream_manager.disconnect(websocket, client_id)
+        await transcription_scheduler.stop((meeting_id, client_id))
 
         # if client_id in chat_manager.active_connections:
         #     await chat_manager.send_personal_message(json.dumps({"type": "stt_error"}), client_id)
-        logger.info(f"#{client_id} Client disconnected")
+        logger.info(f"#{meeting_id}/{client_id} Client disconnected")
     except Exception as e:
         logger.error(f"Error: {e}")        
+        await decoder_pool.release(decoder)
+        audio_archiver.close_stream(meeting_id, client_id)
+        audio_stream_manager.disconnect(websocket, client_id)
+        await transcription_scheduler.stop((meeting_id, client_id))
 
 
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: int):
+    meeting_id = await latest_meeting_id()
+    if meeting_id is None:
+        await websocket.close(code=1008)
+        return
+
+    await chat_websocket_endpoint(websocket, meeting_id, client_id)
+
+
+@app.websocket("/meetings/{meeting_id}/ws/{client_id}")
+async def chat_websocket_endpoint(websocket: WebSocket, meeting_id: int, client_id: int):
+    room = await meeting_rooms.get(meeting_id)
+    if room is None:
+        await websocket.close(code=1008)
+        return
+
+    chat_manager = room.chat
     await chat_manager.connect(websocket, client_id)
-    logger.info(f"{chat_manager.active_connections}")
+    logger.info(f"#{meeting_id} {chat_manager.active_connections}")
 
     try:
         while True:
@@ -379,7 +967,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: int):
                 logger.info(f"{client_id} client has changed mic status : {json_data['status']}")            
             
             if json_data["type"] == "q&a" and json_data["is_done"]:
-                chat_manager.qa_list.append(
+                await room.add_utterance(
                     Utterance(
                         timestamp=TimeUtil.convert_unixtime_to_timestamp(json_data["timestmap"]),
                         speaker=str(json_data["id"]),
@@ -387,9 +975,13 @@ async def websocket_endpoint(websocket: WebSocket, client_id: int):
                     )
                 )
 
-            await chat_manager.broadcast(data)
+            interim_key = None
+            if json_data["type"] == "q&a" and not json_data["is_done"]:
+                interim_key = f"q&a:{json_data['id']}"
+
+            await chat_manager.broadcast(data, interim_key)
 
     except WebSocketDisconnect:
         chat_manager.disconnect(websocket, client_id)
         # await chat_manager.broadcast(f"Client #{client_id} left the chat")
-        logger.info(f"Client #{client_id} left the chat")
+        logger.info(f"Client #{client_id} left the chat of meeting #{meeting_id}")
@@ -0,0 +1,86 @@
+from typing import List
+
+
+class AudioRingBuffer:
+    """Ring buffer of PCM audio addressed by absolute byte position.
+
+    ``end`` is the number of bytes ever written, so a position stays valid
+    for as long as it is within the last ``capacity`` bytes. Views handed
+    out by ``segments`` point into the buffer itself and must be consumed
+    before the next ``write``. Memory is allocated as audio arrives, doubling
+    up to ``capacity``, so a stream that only talks briefly does not hold
+    the whole window.
+    """
+
+    def __init__(self, capacity_ms: int, rate: int = 16000, sample_width: int = 2, initial_ms: int = 5000) -> None:
+        self.bytes_per_ms = rate * sample_width // 1000
+        self.sample_width = sample_width
+        self.capacity = capacity_ms * self.bytes_per_ms
+        self._buffer = bytearray(min(self.capacity, initial_ms * self.bytes_per_ms))
+        self._view = memoryview(self._buffer)
+        self.end = 0
+
+    @property
+    def start(self) -> int:
+        return max(0, self.end - self.capacity)
+
+    @property
+    def memory_usage(self) -> int:
+        return len(self._buffer)
+
+    def ms_to_bytes(self, ms: int) -> int:
+        position = int(ms) * self.bytes_per_ms
+        return position - position % self.sample_width
+
+    def bytes_to_ms(self, size: int) -> int:
+        return round(size / self.bytes_per_ms)
+
+    def write(self, data: bytes) -> None:
+        size = len(data)
+        if size >= self.capacity:
+            data = memoryview(data)[size - self.capacity:]
+            self.end += size - self.capacity
+            size = self.capacity
+        if len(self._buffer) < self.capacity:
+            self._grow(min(self.capacity, self.end + size))
+
+        offset = self.end % self.capacity
+        first = min(size, self.capacity - offset)
+        self._view[offset:offset + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+
+        self.end += size
+
+    def _grow(self, size: int) -> None:
+        # 한 바퀴 돌기 전에는 위치가 그대로 offset 이므로 앞부분만 복사하면 된다.
+        # 이미 내준 view 가 있을 수 있어서 bytearray 를 늘리지 않고 새로 만든다.
+        if size <= len(self._buffer):
+            return
+
+        buffer = bytearray(min(self.capacity, max(size, len(self._buffer) * 2)))
+        buffer[:len(self._buffer)] = self._buffer
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+
+    def segments(self, start: int, end: int) -> List[memoryview]:
+        """Returns zero-copy views of [start, end), clamped to the retained audio.
+
+        The result has one view, or two when the range wraps around the
+        end of the buffer.
+        """
+        start = max(start, self.start)
+        end = min(end, self.end)
+        if start >= end:
+            return []
+
+        offset = start % self.capacity
+        size = end - start
+        if offset + size <= self.capacity:
+            return [self._view[offset:offset + size]]
+
+        first = self.capacity - offset
+        return [self._view[offset:], self._view[:size - first]]
+
+    def read(self, start: int, end: int) -> bytes:
+        return b"".join(self.segments(start, end))
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import shutil
+from typing import Callable, Iterable, Optional
+
+
+# client 가 보낼 수 있는 codec 과 ffmpeg 의 입력 format. pcm 은 기존처럼 16 kHz LINEAR16 을 그대로 받는다.
+CODEC_FORMATS = {
+    "webm": "matroska",  # 브라우저 MediaRecorder 의 audio/webm;codecs=opus
+    "ogg": "ogg",  # ogg/opus
+    "flac": "flac",  # ffmpeg 의 flac parser 는 frame 여러 개를 보고 나서 내보내므로 client 는 frame 을 짧게(20 ms) 만든다.
+}
+PCM = "pcm"
+
+
+class StreamingDecoder:
+    """One ffmpeg process that turns a compressed stream into 16 kHz mono LINEAR16.
+
+    ``feed`` writes what the websocket received without waiting for a whole
+    utterance, and a reader task hands decoded PCM to ``on_pcm`` as soon as
+    ffmpeg writes it.
+    """
+
+    def __init__(self, codec: str, process: asyncio.subprocess.Process, on_pcm: Callable[[bytes], None], read_size: int):
+        self.codec = codec
+        self.process = process
+        self.received_bytes = 0
+        self.decoded_bytes = 0
+
+        self._on_pcm = on_pcm
+        self._read_size = read_size
+        self._reader = asyncio.create_task(self._read(), name=f"decoder-{process.pid}")
+
+        self.logger = logging.getLogger("uvicorn")
+
+    async def feed(self, data: bytes) -> None:
+        self.received_bytes += len(data)
+        self.process.stdin.write(data)
+        # ffmpeg 가 따라오지 못하면 websocket 을 덜 읽어서 client 쪽에서 기다리게 한다.
+        await self.process.stdin.drain()
+
+    async def close(self, timeout: float = 2.0) -> None:
+        if not self.process.stdin.is_closing():
+            self.process.stdin.close()
+
+        try:
+            await asyncio.wait_for(self._reader, timeout)
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"{self.codec} decoder (pid {self.process.pid}) did not exit, killing it")
+            self._reader.cancel()
+            self.process.kill()
+            await self.process.wait()
+
+    async def _read(self) -> None:
+        remainder = b""
+        while data := await self.process.stdout.read(self._read_size):
+            # sample 중간에서 잘리지 않도록 2 byte 단위로만 넘긴다.
+            data = remainder + data
+            usable = len(data) - len(data) % 2
+            remainder = data[usable:]
+            if usable:
+                self.decoded_bytes += usable
+                self._on_pcm(data[:usable])
+
+
+class AudioDecoderPool:
+    """Bounded set of ffmpeg decoders shared by every transcription websocket.
+
+    A client offers codecs in order of preference and gets the first one
+    this server can decode. When ffmpeg is missing or all ``max_decoders``
+    are in use, the answer is ``pcm`` and the client keeps sending raw
+    LINEAR16, so a busy server costs bandwidth rather than refusing speakers.
+    """
+
+    def __init__(self, ffmpeg: str = "ffmpeg", max_decoders: int = 64, sample_rate: int = 16000, read_size: int = 3200):
+        self.ffmpeg = shutil.which(ffmpeg)
+        self.max_decoders = max_decoders
+        self.sample_rate = sample_rate
+        self.read_size = read_size
+        self.active: set[StreamingDecoder] = set()
+        self.fallbacks = 0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+        if self.ffmpeg is None:
+            self.logger.warning(f"{ffmpeg} was not found, only pcm audio is accepted")
+
+    def supported(self) -> list[str]:
+        return [PCM] + (list(CODEC_FORMATS) if self.ffmpeg is not None else [])
+
+    async def open(self, offered: Iterable[str], on_pcm: Callable[[bytes], None]) -> tuple[str, Optional[StreamingDecoder]]:
+        offered = [codec.strip().lower() for codec in offered]
+        for codec in offered:
+            if codec == PCM:
+                return PCM, None
+            if codec not in CODEC_FORMATS or self.ffmpeg is None:
+                continue
+            if len(self.active) >= self.max_decoders:
+                self.fallbacks += 1
+                break
+
+            decoder = await self._spawn(codec, on_pcm)
+            self.active.add(decoder)
+            return codec, decoder
+
+        return PCM, None
+
+    async def release(self, decoder: Optional[StreamingDecoder]) -> None:
+        if decoder is None or decoder not in self.active:
+            return
+
+        self.active.discard(decoder)
+        await decoder.close()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(self.release(decoder) for decoder in list(self.active)))
+
+    def stats(self) -> dict:
+        return {
+            "ffmpeg": self.ffmpeg,
+            "codecs": self.supported(),
+            "active": len(self.active),
+            "max_decoders": self.max_decoders,
+            "fallbacks": self.fallbacks,
+            "received_bytes": sum(decoder.received_bytes for decoder in self.active),
+            "decoded_bytes": sum(decoder.decoded_bytes for decoder in self.active),
+        }
+
+    async def _spawn(self, codec: str, on_pcm: Callable[[bytes], None]) -> StreamingDecoder:
+        process = await asyncio.create_subprocess_exec(
+            self.ffmpeg,
+            "-hide_banner", "-loglevel", "error",
+            # 앞부분만 보고 바로 decode 를 시작하고, 나온 sample 은 모아두지 않고 바로 쓴다.
+            "-fflags", "nobuffer", "-probesize", "4096", "-analyzeduration", "0",
+            "-f", CODEC_FORMATS[codec], "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(self.sample_rate), "-flush_packets", "1", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        return StreamingDecoder(codec, process, on_pcm, self.read_size)
@@ -1,16 +1,24 @@
 import re
 import time
-import queue
-import json
-from typing import Generator
+import asyncio
+import audioop
+from collections import deque
+from typing import AsyncGenerator, AsyncIterator, Optional
 
-from ..service.chat_service import ChatServiceManager
+from .audio_buffer import AudioRingBuffer
+from ..service.stt.base import SttResult
+from ..service.transcribe_service import STT_RESULTS
 
 
 # Audio recording parameters
 STREAMING_LIMIT = 240000  # 4 minutes
 SAMPLE_RATE = 16000
 CHUNK_SIZE = 1366  # 100ms
+MAX_BUFFERED_CHUNKS = 600  # 약 1분
+MAX_ARRIVAL_RECORDS = 4096
+
+# generator 에게 현재 STT session 을 끝내라고 알리는 신호
+PAUSE_SIGNAL = object()
 
 
 def get_current_time() -> int:
@@ -23,6 +31,113 @@ def get_current_time() -> int:
     return int(round(time.time() * 1000))
 
 
+class VoiceActivityDetector:
+    """Energy / zero-crossing VAD for 16-bit mono LINEAR16 audio.
+
+    Audio is cut into ``frame_ms`` frames. A frame is speech when its RMS is
+    above the threshold, or above half of it with a high zero-crossing rate
+    (unvoiced consonants). The threshold follows the background noise floor.
+    Speech is forwarded together with ``preroll_ms`` of audio before the
+    onset and ``hangover_ms`` after it, so word edges are not clipped.
+    After ``pause_after_ms`` of silence the detector is marked as paused
+    until speech starts again.
+    """
+
+    def __init__(
+        self: object,
+        rate: int = SAMPLE_RATE,
+        frame_ms: int = 20,
+        energy_threshold: int = 300,
+        zero_crossing_threshold: float = 0.25,
+        noise_ratio: float = 3.0,
+        hangover_ms: int = 400,
+        preroll_ms: int = 300,
+        pause_after_ms: int = 5000,
+    ) -> None:
+        self.frame_bytes = rate * 2 * frame_ms // 1000
+        self.energy_threshold = energy_threshold
+        self.zero_crossing_threshold = zero_crossing_threshold
+        self.noise_ratio = noise_ratio
+        self.noise_floor = 0.0
+
+        self._hangover_frames = hangover_ms // frame_ms
+        self._pause_frames = pause_after_ms // frame_ms
+        self._preroll = deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._remainder = b""
+        self._silent_run = 0
+
+        self.in_speech = False
+        self.paused = True
+        self.pauses = 0
+        self.resumes = 0
+        self.total_frames = 0
+        self.forwarded_frames = 0
+
+    @property
+    def suppressed_ratio(self: object) -> float:
+        if self.total_frames == 0:
+            return 0.0
+
+        return 1 - self.forwarded_frames / self.total_frames
+
+    def is_speech(self: object, frame: bytes) -> bool:
+        rms = audioop.rms(frame, 2)
+        crossing_rate = audioop.cross(frame, 2) / (len(frame) // 2)
+        threshold = max(self.energy_threshold, self.noise_floor * self.noise_ratio)
+
+        if rms >= threshold or (rms >= threshold / 2 and crossing_rate >= self.zero_crossing_threshold):
+            return True
+
+        self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return False
+
+    def process(self: object, chunk: bytes) -> bytes:
+        """Returns the part of the chunk that should be sent to STT.
+
+        Args:
+        self: The class instance.
+        chunk: LINEAR16 audio of any length.
+
+        returns: The voiced frames, with pre-roll and hangover.
+        """
+        data = self._remainder + chunk
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = data[usable:]
+
+        voiced = []
+        for offset in range(0, usable, self.frame_bytes):
+            frame = data[offset:offset + self.frame_bytes]
+            self.total_frames += 1
+
+            if self.is_speech(frame):
+                if not self.in_speech:
+                    voiced.extend(self._preroll)
+                    self._preroll.clear()
+                    self.in_speech = True
+
+                if self.paused:
+                    self.paused = False
+                    self.resumes += 1
+
+                self._silent_run = 0
+                voiced.append(frame)
+                continue
+
+            self._silent_run += 1
+            if self.in_speech and self._silent_run <= self._hangover_frames:
+                voiced.append(frame)
+                continue
+
+            self.in_speech = False
+            self._preroll.append(frame)
+            if not self.paused and self._silent_run >= self._pause_frames:
+                self.paused = True
+                self.pauses += 1
+
+        self.forwarded_frames += len(voiced)
+        return b"".join(voiced)
+
+
 class ResumableMicrophoneSocketStream:
     """Opens a recording stream as a generator yielding the audio chunks."""
 
@@ -30,6 +145,9 @@ class ResumableMicrophoneSocketStream:
         self: object,
         rate: int = SAMPLE_RATE,
         chunk_size: int = 1366,
+        max_buffered_chunks: int = MAX_BUFFERED_CHUNKS,
+        buffer_ms: int = STREAMING_LIMIT,
+        vad: Optional[VoiceActivityDetector] = None,
     ) -> None:
         """Creates a resumable microphone stream.
 
@@ -37,19 +155,30 @@ class ResumableMicrophoneSocketStream:
         self: The class instance.
         rate: The audio file's sampling rate.
         chunk_size: The audio file's chunk size.
+        max_buffered_chunks: Chunks kept while the STT session is not consuming.
+        buffer_ms: Audio kept for bridging into the next session.
+        vad: Drops silence before it is queued, when given.
 
         returns: None
         """
         self._rate = rate
         self.chunk_size = chunk_size
         self._num_channels = 1
-        self._buff = queue.Queue()
+        self._buff = asyncio.Queue(maxsize=max_buffered_chunks)
+        self.dropped_chunks = 0
+        self.vad = vad
+        self._speech = asyncio.Event()
+        if vad is None:
+            self._speech.set()
         self.closed = True
         self.paused = False
         self.start_time = get_current_time()
         self.restart_counter = 0
-        self.audio_input = []
-        self.last_audio_input = []
+        self.audio_buffer = AudioRingBuffer(buffer_ms, rate)
+        self.session_start = 0
+        self.last_session = (0, 0)
+        # ring buffer 에 쓴 chunk 의 끝 위치, websocket 으로 받은 시각, STT 로 넘긴 시각 (ms)
+        self._arrivals = deque(maxlen=MAX_ARRIVAL_RECORDS)
         self.result_end_time = 0
         self.is_final_end_time = 0
         self.final_request_end_time = 0
@@ -101,7 +230,7 @@ class ResumableMicrophoneSocketStream:
         self.closed = True
         # Signal the generator to terminate so that the client's
         # streaming_recognize method will not block the process termination.
-        self._buff.put(None)
+        self._put_nowait(None)
         # self._audio_interface.terminate()
 
     def _fill_buffer(
@@ -120,10 +249,55 @@ class ResumableMicrophoneSocketStream:
 
         returns: None
         """
-        self._buff.put(in_data)
+        if self.vad is None:
+            self._put_nowait((in_data, get_current_time()))
+            return None
+
+        received_at = get_current_time()
+        pauses, resumes = self.vad.pauses, self.vad.resumes
+        voiced = self.vad.process(in_data)
+
+        if voiced:
+            self._put_nowait((voiced, received_at))
+        if self.vad.resumes != resumes:
+            self._speech.set()
+        if self.vad.pauses != pauses:
+            self._put_nowait(PAUSE_SIGNAL)
+            if self.vad.paused:
+                self._speech.clear()
         return None
 
-    def generator(self: object) -> object:
+    async def wait_for_speech(self: object) -> None:
+        """Waits until the VAD hears speech, so no STT session idles on silence.
+
+        Args:
+        self: The class instance.
+
+        returns: None
+        """
+        await self._speech.wait()
+
+    def _put_nowait(self: object, item: object) -> None:
+        """Puts an item into the buffer, dropping the oldest chunk when full.
+
+        The buffer is bounded so that a speaker waiting for an STT slot
+        cannot grow memory without limit.
+
+        Args:
+        self: The class instance.
+        item: The audio chunk with its receive time, or a stream signal.
+
+        returns: None
+        """
+        while True:
+            try:
+                self._buff.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                self._buff.get_nowait()
+                self.dropped_chunks += 1
+
+    async def generator(self: object) -> AsyncGenerator[bytes, None]:
         """Stream Audio from microphone to API and to local buffer
 
         Args:
@@ -136,87 +310,120 @@ class ResumableMicrophoneSocketStream:
         while not self.closed:
             data = []
 
-            if self.new_stream and self.last_audio_input:
-                chunk_time = STREAMING_LIMIT / len(self.last_audio_input)
-
-                if chunk_time != 0:
-                    if self.bridging_offset < 0:
-                        self.bridging_offset = 0
-
-                    if self.bridging_offset > self.final_request_end_time:
-                        self.bridging_offset = self.final_request_end_time
+            last_start, last_end = self.last_session
+            if self.new_stream and last_end > last_start:
+                if self.bridging_offset < 0:
+                    self.bridging_offset = 0
 
-                    chunks_from_ms = round(
-                        (self.final_request_end_time - self.bridging_offset)
-                        / chunk_time
-                    )
+                if self.bridging_offset > self.final_request_end_time:
+                    self.bridging_offset = self.final_request_end_time
 
-                    self.bridging_offset = round(
-                        (len(self.last_audio_input) - chunks_from_ms) * chunk_time
-                    )
+                # 이전 session 에서 마지막 final 결과 이후의 audio 를 ring buffer 에서 그대로 다시 보낸다.
+                replay_start = last_start + self.audio_buffer.ms_to_bytes(
+                    self.final_request_end_time - self.bridging_offset
+                )
+                replay_start = min(max(replay_start, self.audio_buffer.start), last_end)
 
-                    for i in range(chunks_from_ms, len(self.last_audio_input)):
-                        data.append(self.last_audio_input[i])
+                self.bridging_offset = self.audio_buffer.bytes_to_ms(last_end - replay_start)
+                data.extend(self.audio_buffer.segments(replay_start, last_end))
 
                 self.new_stream = False
 
             # Use a blocking get() to ensure there's at least one chunk of
             # data, and stop iteration if the chunk is None, indicating the
             # end of the audio stream.
-            chunk = self._buff.get()
-            self.audio_input.append(chunk)
+            bridged = len(data)
+            received = []
+            chunk = await self._buff.get()
 
             if chunk is None:
                 return
-            data.append(chunk)
+            if chunk is PAUSE_SIGNAL:
+                return
+            data.append(chunk[0])
+            received.append(chunk[1])
             # Now consume whatever other data's still buffered.
+            pause = False
             while True:
                 try:
-                    chunk = self._buff.get(block=False)
+                    chunk = self._buff.get_nowait()
 
                     if chunk is None:
                         return
-                    data.append(chunk)
-                    self.audio_input.append(chunk)
+                    if chunk is PAUSE_SIGNAL:
+                        pause = True
+                        break
+                    data.append(chunk[0])
+                    received.append(chunk[1])
 
-                except queue.Empty:
+                except asyncio.QueueEmpty:
                     break
 
-            yield b"".join(data)
+            # bridging view 가 가리키는 영역을 덮어쓰기 전에 먼저 합친다.
+            payload = b"".join(data)
+            sent_at = get_current_time()
+            for chunk, received_at in zip(data[bridged:], received):
+                self.audio_buffer.write(chunk)
+                self._arrivals.append((self.audio_buffer.end, received_at, sent_at))
 
+            yield payload
 
-def listen_print_loop(responses: object, stream: object, client_id: int):
-    for response in responses:
-        if get_current_time() - stream.start_time > STREAMING_LIMIT:
-            stream.start_time = get_current_time()
-            break        
+            if pause:
+                return
 
-        if not response.results:
-            continue
+    def arrival(self: object, result_end_time: int) -> Optional[tuple[int, int]]:
+        """Finds when the audio at a result's end position was received and sent to STT.
 
-        result = response.results[0]
+        Args:
+            self: The class instance.
+            result_end_time: The result end time within the current session, in ms.
 
-        if not result.alternatives:
-            continue
+        returns:
+            The receive and send times in ms, or None when they are no longer recorded.
+        """
+        position = self.session_start + self.audio_buffer.ms_to_bytes(
+            result_end_time - self.bridging_offset
+        )
+
+        arrival = None
+        for end, received_at, sent_at in reversed(self._arrivals):
+            if end < position:
+                break
+            arrival = (received_at, sent_at)
+
+        return arrival
+
+    def memory_usage(self: object) -> dict:
+        """Reports the memory held by this stream.
+
+        Args:
+            self: The class instance.
 
-        transcript = result.alternatives[0].transcript
+        returns:
+            Ring buffer capacity and the chunks waiting in the input queue.
+        """
+        return {
+            "ring_buffer_bytes": self.audio_buffer.memory_usage,
+            "queued_chunks": self._buff.qsize(),
+            "dropped_chunks": self.dropped_chunks,
+            "vad_suppressed_ratio": 0.0 if self.vad is None else round(self.vad.suppressed_ratio, 4),
+        }
 
-        result_seconds = 0
-        result_micros = 0
 
-        if result.result_end_time.seconds:
-            result_seconds = result.result_end_time.seconds
+async def listen_print_loop(
+    results: AsyncIterator[SttResult], stream: object, client_id: int
+) -> AsyncGenerator[dict, None]:
+    interim_results, final_results = STT_RESULTS.labels("interim"), STT_RESULTS.labels("final")
 
-        if result.result_end_time.microseconds:
-            result_micros = result.result_end_time.microseconds
+    async for result in results:
+        (final_results if result.is_final else interim_results).inc()
+        if get_current_time() - stream.start_time > STREAMING_LIMIT:
+            stream.start_time = get_current_time()
+            break        
 
-        stream.result_end_time = int((result_seconds * 1000) + (result_micros / 1000))
+        transcript = result.transcript
 
-        corrected_time = (
-            stream.result_end_time
-            - stream.bridging_offset
-            + (STREAMING_LIMIT * stream.restart_counter)
-        )        
+        stream.result_end_time = result.result_end_time
 
         if result.is_final:            
             stream.is_final_end_time = stream.result_end_time
@@ -230,7 +437,7 @@ def listen_print_loop(responses: object, stream: object, client_id: int):
                 "id": client_id,
                 "message": transcript,
                 "is_done": True,
-                "timestamp": int(round(time.time()))
+                "timestamp": int(round(time.time())),
             }
             
             print(f"{client_id}-Final : {transcript}")
@@ -248,5 +455,5 @@ def listen_print_loop(responses: object, stream: object, client_id: int):
                 "id": client_id,
                 "message": transcript,
                 "is_done": False,
-                "timestamp": int(round(time.time()))
+                "timestamp": int(round(time.time())),
             }
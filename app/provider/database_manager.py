@@ -1,9 +1,56 @@
+import time
+import weakref
 import logging
-from typing import List, Any
+import functools
+from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Callable, List, Any, Optional
+
+import aiomysql
+
+from .migrations import MIGRATIONS, Migration
+from ..util.time_util import TimeUtil
+from ..util.metrics import REGISTRY
+
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_seconds", "Time spent in a DatabaseManager method, including pool wait.", ["method"]
+)
+DB_QUERY_ERRORS = REGISTRY.counter("db_query_errors_total", "DatabaseManager calls that raised.", ["method"])
+
+
+def observe_query(method):
+    latency = DB_QUERY_SECONDS.labels(method.__name__)
+    errors = DB_QUERY_ERRORS.labels(method.__name__)
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - started)
+
+    return wrapper
 
-import pymysql
 
 class DatabaseManager:
+    # 모든 column 을 가져오지 않고 나열해서, table 에 column 이 늘어도 응답과 전송량이 바뀌지 않게 한다.
+    MEETING_COLUMNS = "id, name, start_time, end_time, room, subject, topic, files, pt_contents, status, summary"
+    ATTENDEE_COLUMNS = (
+        "id, meeting_id, meeting_name, name, organization, position, email_address, role, "
+        "email_delivery_status, attendance_status, initial_attendance_time, connected_device"
+    )
+    QA_COLUMNS = "id, meeting_id, utterance_key, speaker, `timestamp`, message"
+    SUMMARY_STATE_COLUMNS = "meeting_id, summarized_count, partial_summaries, summary, updated_at"
+    MAIL_JOB_COLUMNS = "id, subject, content, created_at"
+    MAIL_OUTBOX_COLUMNS = "id, job_id, address, status, attempts, last_error, updated_at"
+    AUDIO_SEGMENT_COLUMNS = (
+        "id, segment_key, meeting_id, speaker, session_started_at, sequence, path, format, "
+        "started_at, offset_ms, duration_ms, bytes, storage_key"
+    )
 
     def __init__(
         self,
@@ -11,67 +58,113 @@ class DatabaseManager:
         password: str,
         host: str,
         database_name: str,
+        port: int = 3306,
+        min_pool_size: int = 1,
+        max_pool_size: int = 10,
+        pool_recycle: int = 3600,
+        health_check_interval: float = 30.0,
     ):
         self.user = user
         self.password = password
         self.host = host
+        self.port = port
         self.db_name = database_name
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.pool_recycle = pool_recycle
+        self.health_check_interval = health_check_interval
         self.logger = logging.getLogger("uvicorn")
         self.logger.setLevel(logging.INFO)        
 
-    def _get_connetion(self):
-        return pymysql.connect(
+        self._pool: Optional[aiomysql.Pool] = None
+        # pool 이 닫은 connection 은 알아서 빠지도록 connection 자체를 weak key 로 쓴다.
+        self._last_health_check: weakref.WeakKeyDictionary[aiomysql.Connection, float] = weakref.WeakKeyDictionary()
+
+    async def connect(self) -> None:
+        if self._pool is not None:
+            return
+
+        # autocommit 으로 두어야 pool 에 반납된 connection 이 이전 snapshot 을 들고 있지 않는다.
+        self._pool = await aiomysql.create_pool(
             host=self.host,
+            port=self.port,
             user=self.user,
             password=self.password,
             db=self.db_name,
             charset="utf8",
+            minsize=self.min_pool_size,
+            maxsize=self.max_pool_size,
+            pool_recycle=self.pool_recycle,
+            autocommit=True,
         )
+        self.logger.info(f"Database pool created (min={self.min_pool_size}, max={self.max_pool_size})")
+
+    async def close(self) -> None:
+        if self._pool is None:
+            return
+
+        self._pool.close()
+        await self._pool.wait_closed()
+        self._pool = None
+        self._last_health_check.clear()
+
+    def pool_status(self) -> dict[str, int]:
+        if self._pool is None:
+            return {"size": 0, "free": 0, "max_size": self.max_pool_size}
+
+        return {"size": self._pool.size, "free": self._pool.freesize, "max_size": self._pool.maxsize}
+
+    @asynccontextmanager
+    async def _get_connetion(self):
+        if self._pool is None:
+            await self.connect()
+
+        async with self._pool.acquire() as connection:
+            await self._check_health(connection)
+            yield connection
+
+    async def _check_health(self, connection: aiomysql.Connection) -> None:
+        # 오래 놀고 있던 connection 만 ping 해서 끊어진 경우 다시 연결한다.
+        now = time.monotonic()
+
+        if now - self._last_health_check.get(connection, 0.0) < self.health_check_interval:
+            return
+
+        await connection.ping(reconnect=True)
+        self._last_health_check[connection] = now
     
-    def _build_create_meeting_table_query(self) -> str:
-        return f"""
-        CREATE TABLE IF NOT EXISTS meeting (
-            id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
-            name TEXT,
-            start_time TEXT,
-            end_time TEXT,
-            room TEXT,
-            subject TEXT,
-            topic TEXT,
-            files TEXT,
-            pt_contents TEXT,
-            status TEXT,
-            summary TEXT            
-        )
+    def _build_get_migration_lock_query(self) -> str:
+        return """
+            SELECT GET_LOCK('schema_migration', 60) AS locked
         """
     
-    def _build_create_attendee_table_query(self) -> str:
-        return f"""
-        CREATE TABLE IF NOT EXISTS attendee (
-            id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
-            meeting_name TEXT,
-            name TEXT,
-            organization TEXT,
-            position TEXT,
-            email_address TEXT,
-            role TEXT,
-            email_delivery_status BOOL,
-            attendance_status BOOL,
-            initial_attendance_time TEXT,
-            connected_device TEXT
-        )
+    def _build_release_migration_lock_query(self) -> str:
+        return """
+            SELECT RELEASE_LOCK('schema_migration')
         """
     
-    def _build_create_qa_table_query(self) -> str:
+    def _build_create_schema_version_table_query(self) -> str:
         return f"""
-        CREATE TABLE IF NOT EXISTS qa (
-            id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
-            speaker TEXT,
-            timestamp TEXT,
-            message TEXT
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT NOT NULL PRIMARY KEY,
+            description VARCHAR(255),
+            applied_at DATETIME
         )
         """
     
+    def _build_select_schema_version_query(self) -> str:
+        return """
+            SELECT COALESCE(MAX(version), 0) AS version FROM schema_version
+        """
+    
+    def _build_insert_schema_version_query(self, migration: Migration) -> tuple[str, tuple]:
+        query = """
+            INSERT INTO schema_version (version, description, applied_at)
+            VALUES (%s, %s, NOW())
+        """
+        params = (migration.version, migration.description)
+        return query, params
+    
     def _build_insert_meeting_table_query(self, data: dict) -> tuple[str, tuple]:
         query = """
             INSERT INTO meeting (name, start_time, end_time, room, subject, topic, files, pt_contents, status)
@@ -82,18 +175,80 @@ class DatabaseManager:
 
     def _build_insert_attendee_info_table_query(self, data: dict) -> tuple[str, tuple]:
         query = """
-            INSERT INTO attendee (meeting_name, name, organization, position, email_address, role, email_delivery_status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            INSERT INTO attendee (meeting_id, meeting_name, name, organization, position, email_address, role, email_delivery_status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
-        params = (data["meeting_name"], data["name"], data["organization"], data["position"], data["email_address"], data["role"], data["email_delivery_status"])
+        params = (data["meeting_id"], data["meeting_name"], data["name"], data["organization"], data["position"], data["email_address"], data["role"], data["email_delivery_status"])
         return query, params
     
     def _build_insert_qa_table_query(self, data: dict) -> tuple[str, tuple]:
         query = """
-            INSERT INTO qa (speaker, timestamp, message)
-            VALUES (%s, %s, %s)
+            INSERT INTO qa (meeting_id, speaker, timestamp, message)
+            VALUES (%s, %s, %s, %s)
+        """
+        params = (data["meeting_id"], data["speaker"], data["timestamp"], data["message"])
+        return query, params
+    
+    def _build_insert_attendee_info_table_bulk_query(self, data_list: List[dict]) -> tuple[str, List[tuple]]:
+        query, _ = self._build_insert_attendee_info_table_query(data_list[0])
+        params = [self._build_insert_attendee_info_table_query(data)[1] for data in data_list]
+        return query, params
+
+    def _build_insert_qa_table_bulk_query(self, data_list: List[dict]) -> tuple[str, List[tuple]]:
+        query, _ = self._build_insert_qa_table_query(data_list[0])
+        params = [self._build_insert_qa_table_query(data)[1] for data in data_list]
+        return query, params
+
+    def _build_upsert_qa_table_bulk_query(self, data_list: List[dict]) -> tuple[str, List[tuple]]:
+        # 같은 batch 를 다시 보내도 utterance_key 가 겹치는 row 는 그대로 둔다.
+        query = """
+            INSERT INTO qa (utterance_key, meeting_id, speaker, timestamp, message)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE id = id
+        """
+        params = [
+            (data["utterance_key"], data["meeting_id"], data["speaker"], data["timestamp"], data["message"])
+            for data in data_list
+        ]
+        return query, params
+
+    def _build_upsert_audio_segment_table_bulk_query(self, data_list: List[dict]) -> tuple[str, List[tuple]]:
+        query = """
+            INSERT INTO audio_segment (
+                segment_key, meeting_id, speaker, session_started_at, sequence, path, format,
+                started_at, offset_ms, duration_ms, bytes, storage_key
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE storage_key = COALESCE(VALUES(storage_key), storage_key)
+        """
+        params = [
+            (
+                data["segment_key"], data["meeting_id"], data["speaker"], data["session_started_at"], data["sequence"],
+                data["path"], data["format"], data["started_at"], data["offset_ms"], data["duration_ms"], data["bytes"],
+                data["storage_key"],
+            )
+            for data in data_list
+        ]
+        return query, params
+
+    def _build_insert_mail_job_table_query(self, data: dict) -> tuple[str, tuple]:
+        query = """
+            INSERT INTO mail_job (subject, content, created_at) VALUES (%s, %s, %s)
+        """
+        params = (data["subject"], data["content"], data["created_at"])
+        return query, params
+    
+    def _build_insert_mail_outbox_table_bulk_query(self, job_id: int, addresses: List[str], updated_at: str) -> tuple[str, List[tuple]]:
+        query = """
+            INSERT INTO mail_outbox (job_id, address, status, attempts, updated_at) VALUES (%s, %s, 'pending', 0, %s)
         """
-        params = (data["speaker"], data["timestamp"], data["message"])
+        return query, [(job_id, address, updated_at) for address in addresses]
+    
+    def _build_update_mail_outbox_table_query(self, data: dict) -> tuple[str, tuple]:
+        query = """
+            UPDATE mail_outbox SET status = %s, attempts = %s, last_error = %s, updated_at = %s WHERE id = %s
+        """
+        params = (data["status"], data["attempts"], data["last_error"], data["updated_at"], data["id"])
         return query, params
     
     def _build_update_attendee_attendance_info_table_query(self, data: dict) -> tuple[str, tuple]:
@@ -104,38 +259,125 @@ class DatabaseManager:
         params = (data["attendance_status"], data["initial_attendance_time"], data["connected_device"], data["id"])
         return query, params
     
-    def _build_update_meeting_status_table_query(self, status: str) -> tuple[str, tuple]:
+    def _build_update_meeting_status_table_query(self, meeting_id: int, status: str) -> tuple[str, tuple]:
+        query = """
+            UPDATE meeting SET status = %s WHERE id = %s
+        """
+        params = (status, meeting_id)
+        return query, params
+    
+    def _build_update_meeting_summary_table_query(self, meeting_id: int, summary: str) -> tuple[str, tuple]:
         query = """
-            UPDATE meeting SET status = %s            
+            UPDATE meeting SET summary = %s WHERE id = %s
         """
-        params = (status)
+        params = (summary, meeting_id)
         return query, params
     
-    def _build_update_meeting_summary_table_query(self, summary: str) -> tuple[str, tuple]:
+    def _build_upsert_summary_state_table_query(self, data: dict) -> tuple[str, tuple]:
         query = """
-            UPDATE meeting SET summary = %s            
+            INSERT INTO summary_state (meeting_id, summarized_count, partial_summaries, summary, updated_at)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                summarized_count = VALUES(summarized_count),
+                partial_summaries = VALUES(partial_summaries),
+                summary = VALUES(summary),
+                updated_at = VALUES(updated_at)
         """
-        params = (summary)
+        params = (data["meeting_id"], data["summarized_count"], data["partial_summaries"], data["summary"], data["updated_at"])
         return query, params
     
     def _build_select_all_meeting_table_query(self) -> str:
         return f"""
-            SELECT * FROM meeting ORDER BY id desc
+            SELECT {self.MEETING_COLUMNS} FROM meeting ORDER BY id desc
+        """
+    
+    def _build_select_latest_meeting_table_query(self) -> str:
+        return f"""
+            SELECT {self.MEETING_COLUMNS} FROM meeting ORDER BY id desc LIMIT 1
         """
     
     def _build_select_all_attendee_table_query(self) -> str:
         return f"""
-            SELECT * FROM attendee ORDER BY id
+            SELECT {self.ATTENDEE_COLUMNS} FROM attendee ORDER BY id
         """
     
     def _build_select_all_qa_table_query(self) -> str:
         return f"""
-            SELECT * FROM qa ORDER BY id
+            SELECT {self.QA_COLUMNS} FROM qa ORDER BY id
+        """
+    
+    def _build_select_meeting_table_query(self, meeting_id: int) -> str:
+        return f"""
+            SELECT {self.MEETING_COLUMNS} FROM meeting WHERE id = {meeting_id}
+        """
+    
+    def _build_select_attendee_table_with_meeting_id_query(self, meeting_id: int) -> str:
+        return f"""
+            SELECT {self.ATTENDEE_COLUMNS} FROM attendee WHERE meeting_id = {meeting_id} ORDER BY id
+        """
+    
+    def _build_select_qa_table_with_meeting_id_query(self, meeting_id: int) -> str:
+        return f"""
+            SELECT {self.QA_COLUMNS} FROM qa WHERE meeting_id = {meeting_id} ORDER BY id
+        """
+    
+    def _build_select_qa_table_with_time_range_query(self, meeting_id: int, start: str, end: str) -> tuple[str, tuple]:
+        query = f"""
+            SELECT {self.QA_COLUMNS} FROM qa
+            WHERE meeting_id = %s AND `timestamp` >= %s AND `timestamp` < %s
+            ORDER BY `timestamp`, id
+        """
+        params = (meeting_id, start, end)
+        return query, params
+    
+    def _build_select_audio_segment_table_query(
+        self, meeting_id: int, speaker: Optional[str], at: Optional[int]
+    ) -> tuple[str, tuple]:
+        conditions, params = ["meeting_id = %s"], [meeting_id]
+        if speaker is not None:
+            conditions.append("speaker = %s")
+            params.append(speaker)
+        if at is not None:
+            conditions.append("started_at <= %s AND started_at + duration_ms > %s")
+            params.extend([at, at])
+
+        query = f"""
+            SELECT {self.AUDIO_SEGMENT_COLUMNS} FROM audio_segment
+            WHERE {" AND ".join(conditions)}
+            ORDER BY speaker, started_at, sequence
+        """
+        return query, tuple(params)
+
+    def _build_update_audio_segment_storage_key_query(self, segment_key: str, storage_key: str) -> tuple[str, tuple]:
+        query = """
+            UPDATE audio_segment SET storage_key = %s WHERE segment_key = %s
+        """
+        params = (storage_key, segment_key)
+        return query, params
+
+    def _build_select_summary_state_table_query(self, meeting_id: int) -> str:
+        return f"""
+            SELECT {self.SUMMARY_STATE_COLUMNS} FROM summary_state WHERE meeting_id = {meeting_id}
+        """
+    
+    def _build_select_mail_job_table_query(self, id: int) -> str:
+        return f"""
+            SELECT {self.MAIL_JOB_COLUMNS} FROM mail_job WHERE id = {id}
+        """
+    
+    def _build_select_pending_mail_outbox_table_query(self) -> str:
+        return f"""
+            SELECT id, job_id, address, attempts FROM mail_outbox WHERE status = 'pending' ORDER BY id
+        """
+    
+    def _build_select_mail_outbox_table_query(self, job_id: int) -> str:
+        return f"""
+            SELECT {self.MAIL_OUTBOX_COLUMNS} FROM mail_outbox WHERE job_id = {job_id} ORDER BY id
         """
     
     def _build_select_attendee_table_query(self, id: int) -> str:
         return f"""
-            SELECT * FROM attendee WHERE id = {id}
+            SELECT {self.ATTENDEE_COLUMNS} FROM attendee WHERE id = {id}
         """
     
     def _build_delete_attendee_table_query(self, data: dict) -> tuple[str, tuple]:
@@ -159,6 +401,20 @@ class DatabaseManager:
         return """
             DELETE FROM qa
         """
+    
+    def _build_delete_qa_table_with_meeting_id_query(self, meeting_id: int) -> tuple[str, tuple]:
+        query = """
+            DELETE FROM qa WHERE meeting_id = %s
+        """
+        params = (meeting_id,)
+        return query, params
+        
+    def _build_delete_summary_state_table_query(self, meeting_id: int) -> tuple[str, tuple]:
+        query = """
+            DELETE FROM summary_state WHERE meeting_id = %s
+        """
+        params = (meeting_id,)
+        return query, params
         
     def _build_drop_meeting_table_query(self) -> str:
         return "DROP TABLE IF EXISTS meeting"
@@ -166,108 +422,345 @@ class DatabaseManager:
     def _build_drop_attendee_table_query(self) -> str:
         return "DROP TABLE IF EXISTS attendee"
         
-    def _execute_query(self, query: str) -> int:
-        with self._get_connetion() as connection:
-            cursor = connection.cursor(pymysql.cursors.DictCursor)
-            return cursor.execute(query)
+    async def _execute_query(self, query: str) -> int:
+        async with self._get_connetion() as connection:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                return await cursor.execute(query)
         
-    def _execute_select_query(self, select_table_query):
-        with self._get_connetion() as connection:
-            cursor = connection.cursor(pymysql.cursors.DictCursor)
-            cursor.execute(select_table_query)        
-            data = cursor.fetchall()
+    async def _execute_select_query(self, select_table_query, params=None):
+        async with self._get_connetion() as connection:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(select_table_query, params)        
+                data = await cursor.fetchall()
 
-            return data
+                return [self._format_row(row) for row in data]
     
-    def _execute_commit_query(self, query, params):
+    @staticmethod
+    def _format_row(row: dict) -> dict:
+        # DATETIME column 은 TEXT 로 저장하던 때와 같은 형식의 문자열로 돌려준다.
+        for key, value in row.items():
+            if isinstance(value, datetime):
+                row[key] = TimeUtil.convert_datetime_to_timestamp(value)
+
+        return row
+    
+    async def _execute_commit_query(self, query, params):
         self.logger.info(f"Executing query: {query} with params: {params}")
 
-        with self._get_connetion() as connection:
-            cursor = connection.cursor()
-            cursor.execute(query, params)
-            connection.commit()
+        async with self._get_connetion() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+            await connection.commit()
 
-    def create_meeting_table(self) -> int:
-        create_table_query = self._build_create_meeting_table_query()
-        
-        return self._execute_query(create_table_query)
-    
-    def create_attendee_table(self) -> int:
-        create_table_query = self._build_create_attendee_table_query()
-        
-        return self._execute_query(create_table_query)
-    
-    def create_qa_table(self) -> int:
-        create_table_query = self._build_create_qa_table_query()
-        
-        return self._execute_query(create_table_query)
-            
-    def drop_meeting_table(self) -> int:
+    async def _execute_transaction_query(self, queries: List[tuple[str, Any]]):
+        # 모든 query 를 한 transaction 으로 실행하고, params 가 list 이면 executemany 로 실행한다.
+        self.logger.info(f"Executing transaction with {len(queries)} queries")
+
+        async with self._get_connetion() as connection:
+            await connection.begin()
+            try:
+                async with connection.cursor() as cursor:
+                    for query, params in queries:
+                        if isinstance(params, list):
+                            if params:
+                                await cursor.executemany(query, params)
+                        else:
+                            await cursor.execute(query, params)
+                await connection.commit()
+            except Exception as e:
+                await connection.rollback()
+                self.logger.error(f"Transaction rolled back : {e}")
+                raise
+
+    async def _execute_insert_with_children_query(
+        self, parent: tuple[str, tuple], build_children: Callable[[int], Optional[tuple[str, List[tuple]]]]
+    ) -> int:
+        # 자식 row 들이 부모 id 를 참조해야 하므로 lastrowid 를 받아서 같은 transaction 에서 넣는다.
+        self.logger.info(f"Executing query: {parent[0]} with params: {parent[1]}")
+
+        async with self._get_connetion() as connection:
+            await connection.begin()
+            try:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(*parent)
+                    parent_id = cursor.lastrowid
+                    children = build_children(parent_id)
+                    if children is not None:
+                        await cursor.executemany(*children)
+                await connection.commit()
+            except Exception as e:
+                await connection.rollback()
+                self.logger.error(f"Transaction rolled back : {e}")
+                raise
+
+        return parent_id
+
+    async def migrate(self, target_version: Optional[int] = None) -> int:
+        # worker 가 여러 개 떠도 한 곳에서만 migration 하도록 같은 connection 에서 DB lock 을 잡고 진행한다.
+        async with self._get_connetion() as connection:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(self._build_get_migration_lock_query())
+                if (await cursor.fetchone())["locked"] != 1:
+                    raise RuntimeError("Timed out waiting for the schema migration lock")
+
+                try:
+                    await cursor.execute(self._build_create_schema_version_table_query())
+                    await cursor.execute(self._build_select_schema_version_query())
+                    version = (await cursor.fetchone())["version"]
+
+                    for migration in MIGRATIONS:
+                        if migration.version <= version:
+                            continue
+                        if target_version is not None and migration.version > target_version:
+                            break
+
+                        await self._apply_migration(cursor, migration)
+                        version = migration.version
+                finally:
+                    await cursor.execute(self._build_release_migration_lock_query())
+
+        self.logger.info(f"Database schema is at v{version}")
+        return version
+
+    async def _apply_migration(self, cursor: aiomysql.Cursor, migration: Migration) -> None:
+        # MySQL 의 DDL 은 transaction 으로 묶이지 않으므로 migration 이 끝날 때마다 version 을 남긴다.
+        already_applied = False
+        if migration.applied_if is not None:
+            await cursor.execute(migration.applied_if)
+            already_applied = len(await cursor.fetchall()) > 0
+
+        if already_applied:
+            self.logger.info(f"Schema v{migration.version} ({migration.description}) was applied before versioning")
+        else:
+            for query in migration.abort_if:
+                await cursor.execute(query)
+                rows = await cursor.fetchall()
+                if rows:
+                    raise RuntimeError(
+                        f"Schema v{migration.version} ({migration.description}) was not applied, "
+                        f"fix these rows first : {rows}"
+                    )
+
+            self.logger.info(f"Migrating schema to v{migration.version} : {migration.description}")
+            for statement in migration.statements:
+                await cursor.execute(statement)
+
+        await cursor.execute(*self._build_insert_schema_version_query(migration))
+
+    @observe_query
+    async def drop_meeting_table(self) -> int:
         drop_table_query = self._build_drop_meeting_table_query()
 
-        return self._execute_query(drop_table_query)
+        return await self._execute_query(drop_table_query)
     
-    def drop_attendee_table(self) -> int:
+    @observe_query
+    async def drop_attendee_table(self) -> int:
         drop_table_query = self._build_drop_attendee_table_query()
 
-        return self._execute_query(drop_table_query)
+        return await self._execute_query(drop_table_query)
     
-    def insert_meeting_table(self, data: dict) -> None:
+    @observe_query
+    async def insert_meeting_table(self, data: dict) -> None:
         query, params = self._build_insert_meeting_table_query(data)        
-        self._execute_commit_query(query, params)
+        await self._execute_commit_query(query, params)
 
-    def insert_attendee_info_table(self, data: dict) -> None:
+    @observe_query
+    async def insert_attendee_info_table(self, data: dict) -> None:
         query, params = self._build_insert_attendee_info_table_query(data)        
-        self._execute_commit_query(query, params)
+        await self._execute_commit_query(query, params)
 
-    def insert_qa_table(self, data: dict) -> None:
+    @observe_query
+    async def insert_qa_table(self, data: dict) -> None:
         query, params = self._build_insert_qa_table_query(data)        
-        self._execute_commit_query(query, params)
+        await self._execute_commit_query(query, params)
+
+    @observe_query
+    async def upsert_qa_table_bulk(self, data_list: List[dict]) -> None:
+        if not data_list:
+            return
+
+        await self._execute_transaction_query([self._build_upsert_qa_table_bulk_query(data_list)])
+
+    @observe_query
+    async def upsert_audio_segment_table_bulk(self, data_list: List[dict]) -> None:
+        if not data_list:
+            return
+
+        await self._execute_transaction_query([self._build_upsert_audio_segment_table_bulk_query(data_list)])
+
+    @observe_query
+    async def update_audio_segment_storage_key(self, segment_key: str, storage_key: str) -> None:
+        query, params = self._build_update_audio_segment_storage_key_query(segment_key, storage_key)
+        await self._execute_commit_query(query, params)
+
+    @observe_query
+    async def insert_meeting_with_attendees(self, meeting: dict, attendees: List[dict]) -> int:
+        def build_attendees(meeting_id: int) -> Optional[tuple[str, List[tuple]]]:
+            if not attendees:
+                return None
+
+            return self._build_insert_attendee_info_table_bulk_query(
+                [{**attendee, "meeting_id": meeting_id} for attendee in attendees]
+            )
+
+        return await self._execute_insert_with_children_query(
+            self._build_insert_meeting_table_query(meeting), build_attendees
+        )
 
-    def update_attendee_attendance_info_table(self, data: dict) -> None:
+    @observe_query
+    async def replace_qa_table(self, meeting_id: int, data_list: List[dict]) -> None:
+        queries = [self._build_delete_qa_table_with_meeting_id_query(meeting_id)]
+        if data_list:
+            queries.append(self._build_insert_qa_table_bulk_query(
+                [{**data, "meeting_id": meeting_id} for data in data_list]
+            ))
+
+        await self._execute_transaction_query(queries)
+
+    @observe_query
+    async def insert_mail_job_table(self, data: dict, addresses: List[str]) -> int:
+        def build_outbox(job_id: int) -> Optional[tuple[str, List[tuple]]]:
+            if not addresses:
+                return None
+
+            return self._build_insert_mail_outbox_table_bulk_query(job_id, addresses, data["created_at"])
+
+        return await self._execute_insert_with_children_query(
+            self._build_insert_mail_job_table_query(data), build_outbox
+        )
+
+    @observe_query
+    async def update_mail_outbox_table(self, data: dict) -> None:
+        query, params = self._build_update_mail_outbox_table_query(data)
+        await self._execute_commit_query(query, params)
+
+    @observe_query
+    async def update_attendee_attendance_info_table(self, data: dict) -> None:
         query, params = self._build_update_attendee_attendance_info_table_query(data)        
-        self._execute_commit_query(query, params)
+        await self._execute_commit_query(query, params)
 
-    def update_meeting_status_table(self, status: str) -> None:
-        query, params = self._build_update_meeting_status_table_query(status)
-        self._execute_commit_query(query, params)
+    @observe_query
+    async def update_meeting_status_table(self, meeting_id: int, status: str) -> None:
+        query, params = self._build_update_meeting_status_table_query(meeting_id, status)
+        await self._execute_commit_query(query, params)
 
-    def update_meeting_summary_table(self, summary: str) -> None:
-        query, params = self._build_update_meeting_summary_table_query(summary)
-        self._execute_commit_query(query, params)
+    @observe_query
+    async def update_meeting_summary_table(self, meeting_id: int, summary: str) -> None:
+        query, params = self._build_update_meeting_summary_table_query(meeting_id, summary)
+        await self._execute_commit_query(query, params)
+    
+    @observe_query
+    async def upsert_summary_state_table(self, data: dict) -> None:
+        query, params = self._build_upsert_summary_state_table_query(data)
+        await self._execute_commit_query(query, params)
     
-    def select_all_meeting_table(self) -> List[Any]:
+    @observe_query
+    async def select_all_meeting_table(self) -> List[Any]:
         select_table_query = self._build_select_all_meeting_table_query()
 
-        return self._execute_select_query(select_table_query)
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_latest_meeting_table(self) -> List[Any]:
+        select_table_query = self._build_select_latest_meeting_table_query()
+
+        return await self._execute_select_query(select_table_query)
     
-    def select_all_attendee_table(self) -> List[Any]:
+    @observe_query
+    async def select_all_attendee_table(self) -> List[Any]:
         select_table_query = self._build_select_all_attendee_table_query()
 
-        return self._execute_select_query(select_table_query)
+        return await self._execute_select_query(select_table_query)
     
-    def select_all_qa_table(self) -> List[Any]:
+    @observe_query
+    async def select_all_qa_table(self) -> List[Any]:
         select_table_query = self._build_select_all_qa_table_query()
 
-        return self._execute_select_query(select_table_query)
+        return await self._execute_select_query(select_table_query)
     
-    def select_attendee_table_with_id(self, id: int) -> List[Any]:
+    @observe_query
+    async def select_meeting_table_with_id(self, meeting_id: int) -> List[Any]:
+        select_table_query = self._build_select_meeting_table_query(meeting_id)
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_attendee_table_with_meeting_id(self, meeting_id: int) -> List[Any]:
+        select_table_query = self._build_select_attendee_table_with_meeting_id_query(meeting_id)
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_qa_table_with_meeting_id(self, meeting_id: int) -> List[Any]:
+        select_table_query = self._build_select_qa_table_with_meeting_id_query(meeting_id)
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_qa_table_with_time_range(self, meeting_id: int, start: str, end: str) -> List[Any]:
+        query, params = self._build_select_qa_table_with_time_range_query(meeting_id, start, end)
+
+        return await self._execute_select_query(query, params)
+    
+    @observe_query
+    async def select_audio_segment_table(
+        self, meeting_id: int, speaker: Optional[str] = None, at: Optional[int] = None
+    ) -> List[Any]:
+        query, params = self._build_select_audio_segment_table_query(meeting_id, speaker, at)
+
+        return await self._execute_select_query(query, params)
+    
+    @observe_query
+    async def select_summary_state_table(self, meeting_id: int) -> List[Any]:
+        select_table_query = self._build_select_summary_state_table_query(meeting_id)
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_mail_job_table_with_id(self, id: int) -> List[Any]:
+        select_table_query = self._build_select_mail_job_table_query(id)
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_pending_mail_outbox_table(self) -> List[Any]:
+        select_table_query = self._build_select_pending_mail_outbox_table_query()
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_mail_outbox_table_with_job_id(self, job_id: int) -> List[Any]:
+        select_table_query = self._build_select_mail_outbox_table_query(job_id)
+
+        return await self._execute_select_query(select_table_query)
+    
+    @observe_query
+    async def select_attendee_table_with_id(self, id: int) -> List[Any]:
         select_table_query = self._build_select_attendee_table_query(id)
 
-        return self._execute_select_query(select_table_query)
+        return await self._execute_select_query(select_table_query)
 
-    def delete_attendee_table_with_id(self, data: dict) -> None:
+    @observe_query
+    async def delete_attendee_table_with_id(self, data: dict) -> None:
         query, params = self._build_delete_attendee_table_query(data)
-        self._execute_commit_query(query, params)
+        await self._execute_commit_query(query, params)
 
-    def delete_all_meeting_table(self) -> None:
+    @observe_query
+    async def delete_all_meeting_table(self) -> None:
         query = self._build_delete_all_meeting_table_query()
-        self._execute_commit_query(query, ())
+        await self._execute_commit_query(query, ())
 
-    def delete_all_attendee_table(self) -> None:
+    @observe_query
+    async def delete_all_attendee_table(self) -> None:
         query = self._build_delete_all_attendee_table_query()
-        self._execute_commit_query(query, ())
+        await self._execute_commit_query(query, ())
 
-    def delete_all_qa_table(self) -> None:
+    @observe_query
+    async def delete_all_qa_table(self) -> None:
         query = self._build_delete_all_qa_table_query()
-        self._execute_commit_query(query, ())
+        await self._execute_commit_query(query, ())
+
+    @observe_query
+    async def delete_summary_state_table(self, meeting_id: int) -> None:
+        query, params = self._build_delete_summary_state_table_query(meeting_id)
+        await self._execute_commit_query(query, params)
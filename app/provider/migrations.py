@@ -0,0 +1,283 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class Migration:
+    version: int
+    description: str
+    statements: List[str]
+    # 버전 관리를 시작하기 전에 이미 적용된 DB 에서는 이 query 가 row 를 돌려주고, statements 는 건너뛴다.
+    applied_if: Optional[str] = None
+    # statements 를 실행하기 전에 돌려서 하나라도 row 를 돌려주면 아무것도 바꾸지 않고 migration 을 멈춘다.
+    abort_if: List[str] = field(default_factory=list)
+
+
+def _column_exists(table: str, column: str) -> str:
+    return f"""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{table}' AND COLUMN_NAME = '{column}'
+    """
+
+
+def _add_meeting_id_column(table: str) -> List[str]:
+    return [
+        f"""
+        ALTER TABLE {table}
+        ADD COLUMN meeting_id BIGINT AFTER id,
+        ADD INDEX (meeting_id),
+        ADD FOREIGN KEY (meeting_id) REFERENCES meeting(id) ON DELETE CASCADE
+        """,
+        # 회의가 하나뿐이던 때의 row 들은 마지막 회의의 것이다.
+        f"""
+        UPDATE {table} SET meeting_id = (SELECT MAX(id) FROM meeting) WHERE meeting_id IS NULL
+        """,
+    ]
+
+
+# TimeUtil 이 만드는 "24-06-01 10:00:00", reservation 의 "2024-06-01 10:00" 과
+# "2024-06-01T10:00:00.123Z" 같은 ISO 문자열을 DATETIME 으로 바꾼다. 초 아래 자리는 DATETIME 에 남지 않는다.
+DATETIME_PATTERN = "^[0-9]{2}([0-9]{2})?-[0-9]{1,2}-[0-9]{1,2}([ T][0-9]{1,2}:[0-9]{1,2}(:[0-9]{1,2}([.][0-9]+)?)?Z?)?$"
+
+DATETIME_FORMATS = [
+    (f"^[0-9]{{4}}-[0-9]{{1,2}}-[0-9]{{1,2}}{time_pattern}$", f"%Y-%m-%d{time_format}")
+    for time_pattern, time_format in (
+        ("", ""),
+        (" [0-9]{1,2}:[0-9]{1,2}", " %H:%i"),
+        (" [0-9]{1,2}:[0-9]{1,2}:[0-9]{1,2}", " %H:%i:%s"),
+    )
+]
+
+DATETIME_COLUMNS = [
+    ("meeting", "start_time"),
+    ("meeting", "end_time"),
+    ("attendee", "initial_attendance_time"),
+    ("qa", "timestamp"),
+    ("summary_state", "updated_at"),
+    ("mail_job", "created_at"),
+    ("mail_outbox", "updated_at"),
+]
+
+
+def _parse_datetime(column: str) -> str:
+    # T 를 빈칸으로 바꾸고 초 아래 자리와 Z 를 떼어낸 뒤 형식에 맞는 STR_TO_DATE 로 읽는다.
+    # 두 자리 연도는 TimeUtil.normalize_timestamp 처럼 2000 년대로 읽는다. %y 는 70 이상을 1900 년대로 읽는다.
+    # Z 가 붙은 UTC 시각은 TimeUtil 처럼 KST 로 바꾼다. 읽을 수 없으면 NULL 이다.
+    trimmed = f"TRIM(TRAILING 'Z' FROM SUBSTRING_INDEX(REPLACE(TRIM(`{column}`), 'T', ' '), '.', 1))"
+    value = f"IF({trimmed} REGEXP '^[0-9]{{2}}-', CONCAT('20', {trimmed}), {trimmed})"
+    cases = " ".join(
+        f"WHEN {value} REGEXP '{pattern}' THEN STR_TO_DATE({value}, '{date_format}')"
+        for pattern, date_format in DATETIME_FORMATS
+    )
+    parsed = f"(CASE {cases} END)"
+
+    return f"IF(TRIM(`{column}`) LIKE '%Z', CONVERT_TZ({parsed}, '+00:00', '+09:00'), {parsed})"
+
+
+def _unparsable_datetimes(table: str, column: str) -> str:
+    return f"""
+        SELECT '{table}' AS `table`, '{column}' AS `column`, `{column}` AS value FROM {table}
+        WHERE `{column}` IS NOT NULL AND TRIM(`{column}`) <> ''
+        AND (TRIM(`{column}`) NOT REGEXP '{DATETIME_PATTERN}' OR {_parse_datetime(column)} IS NULL)
+        LIMIT 10
+    """
+
+
+def _normalize_datetimes(table: str, column: str) -> str:
+    # MODIFY 가 그대로 읽을 수 있는 "2024-06-01 10:00:00" 로 맞춰 둔다. 빈 문자열은 값이 없던 것이다.
+    return f"""
+        UPDATE {table} SET `{column}` = IF(
+            TRIM(`{column}`) = '', NULL, DATE_FORMAT({_parse_datetime(column)}, '%Y-%m-%d %H:%i:%s')
+        )
+        WHERE `{column}` IS NOT NULL
+    """
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "initial schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS meeting (
+                id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                name TEXT,
+                start_time TEXT,
+                end_time TEXT,
+                room TEXT,
+                subject TEXT,
+                topic TEXT,
+                files TEXT,
+                pt_contents TEXT,
+                status TEXT,
+                summary TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS attendee (
+                id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                meeting_name TEXT,
+                name TEXT,
+                organization TEXT,
+                position TEXT,
+                email_address TEXT,
+                role TEXT,
+                email_delivery_status BOOL,
+                attendance_status BOOL,
+                initial_attendance_time TEXT,
+                connected_device TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS qa (
+                id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                speaker TEXT,
+                timestamp TEXT,
+                message TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS summary_state (
+                id BIGINT NOT NULL PRIMARY KEY,
+                summarized_count INT,
+                partial_summaries MEDIUMTEXT,
+                summary TEXT,
+                updated_at TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS mail_job (
+                id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                subject TEXT,
+                content MEDIUMTEXT,
+                created_at TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS mail_outbox (
+                id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                job_id BIGINT NOT NULL,
+                address TEXT,
+                status VARCHAR(16),
+                attempts INT,
+                last_error TEXT,
+                updated_at TEXT,
+                INDEX (job_id),
+                INDEX (status)
+            )
+            """,
+        ],
+    ),
+    Migration(
+        2,
+        "scope attendee by meeting",
+        _add_meeting_id_column("attendee"),
+        applied_if=_column_exists("attendee", "meeting_id"),
+    ),
+    Migration(
+        3,
+        "scope qa by meeting",
+        _add_meeting_id_column("qa"),
+        applied_if=_column_exists("qa", "meeting_id"),
+    ),
+    Migration(
+        4,
+        "key summary_state by meeting",
+        [
+            """
+            ALTER TABLE summary_state CHANGE id meeting_id BIGINT NOT NULL
+            """,
+            # 예전에는 id 1 인 row 하나만 있었다.
+            """
+            UPDATE summary_state SET meeting_id = COALESCE((SELECT MAX(id) FROM meeting), 1) WHERE meeting_id = 1
+            """,
+        ],
+        applied_if=_column_exists("summary_state", "meeting_id"),
+    ),
+    Migration(
+        5,
+        "typed columns and time indexes",
+        [_normalize_datetimes(table, column) for table, column in DATETIME_COLUMNS] + [
+            """
+            ALTER TABLE meeting
+            MODIFY name VARCHAR(255),
+            MODIFY start_time DATETIME,
+            MODIFY end_time DATETIME,
+            MODIFY room VARCHAR(255),
+            MODIFY status VARCHAR(32),
+            ADD INDEX idx_meeting_start_time (start_time)
+            """,
+            """
+            ALTER TABLE attendee
+            MODIFY meeting_name VARCHAR(255),
+            MODIFY name VARCHAR(255),
+            MODIFY organization VARCHAR(255),
+            MODIFY position VARCHAR(255),
+            MODIFY email_address VARCHAR(255),
+            MODIFY role VARCHAR(64),
+            MODIFY initial_attendance_time DATETIME,
+            MODIFY connected_device VARCHAR(255),
+            ADD INDEX idx_attendee_email_address (email_address)
+            """,
+            """
+            ALTER TABLE qa
+            MODIFY speaker VARCHAR(64),
+            MODIFY `timestamp` DATETIME,
+            ADD INDEX idx_qa_meeting_id_timestamp (meeting_id, `timestamp`)
+            """,
+            """
+            ALTER TABLE summary_state
+            MODIFY updated_at DATETIME
+            """,
+            """
+            ALTER TABLE mail_job
+            MODIFY subject VARCHAR(255),
+            MODIFY created_at DATETIME
+            """,
+            """
+            ALTER TABLE mail_outbox
+            MODIFY address VARCHAR(255),
+            MODIFY updated_at DATETIME
+            """,
+        ],
+        # 읽을 수 없는 시각을 지우지 않도록, 그런 값이 있으면 고칠 때까지 migration 을 멈춘다.
+        abort_if=[_unparsable_datetimes(table, column) for table, column in DATETIME_COLUMNS],
+    ),
+    Migration(
+        6,
+        "unique key for write-behind utterances",
+        [
+            # /update_qa 로 넣은 row 는 key 가 없어서 NULL 이고, UNIQUE index 는 NULL 끼리 겹쳐도 된다.
+            """
+            ALTER TABLE qa
+            ADD COLUMN utterance_key CHAR(32) AFTER meeting_id,
+            ADD UNIQUE INDEX idx_qa_utterance_key (utterance_key)
+            """,
+        ],
+    ),
+    Migration(
+        7,
+        "audio archive segments",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS audio_segment (
+                id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+                segment_key CHAR(32) NOT NULL,
+                meeting_id BIGINT NOT NULL,
+                speaker VARCHAR(64),
+                session_started_at BIGINT,
+                sequence INT,
+                path VARCHAR(1024),
+                format VARCHAR(8),
+                started_at BIGINT,
+                offset_ms BIGINT,
+                duration_ms BIGINT,
+                bytes BIGINT,
+                storage_key VARCHAR(1024),
+                UNIQUE INDEX idx_audio_segment_segment_key (segment_key),
+                INDEX idx_audio_segment_meeting_id_speaker_started_at (meeting_id, speaker, started_at)
+            )
+            """,
+        ],
+    ),
+]
@@ -0,0 +1,428 @@
+import os
+import time
+import uuid
+import wave
+import shutil
+import asyncio
+import logging
+import subprocess
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, BinaryIO, Callable, List, Optional
+
+from .broker.base import MessageBroker
+from ..provider.database_manager import DatabaseManager
+
+
+MB = 1024 * 1024
+SAMPLE_RATE = 16000
+BYTES_PER_MS = SAMPLE_RATE * 2 // 1000
+FSYNC_POLICIES = ("never", "segment", "always")
+FORMATS = ("wav", "flac")
+
+# StorageServiceManager.upload 처럼 file 과 object key 를 받는다.
+Uploader = Callable[[BinaryIO, str], Awaitable[None]]
+
+
+@dataclass
+class AudioSegment:
+    segment_key: str
+    meeting_id: int
+    speaker: int
+    # 모두 unix time (ms). offset 은 화자가 websocket 을 연 뒤 이 segment 앞까지 받은 audio 의 길이다.
+    session_started_at: int
+    sequence: int
+    path: str
+    started_at: int
+    offset_ms: int
+    bytes: int = 0
+    storage_key: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> int:
+        return self.bytes // BYTES_PER_MS
+
+    def row(self) -> dict:
+        return {
+            "segment_key": self.segment_key,
+            "meeting_id": self.meeting_id,
+            "speaker": str(self.speaker),
+            "session_started_at": self.session_started_at,
+            "sequence": self.sequence,
+            "path": self.path,
+            "format": os.path.splitext(self.path)[1].lstrip("."),
+            "started_at": self.started_at,
+            "offset_ms": self.offset_ms,
+            "duration_ms": self.duration_ms,
+            "bytes": self.bytes,
+            "storage_key": self.storage_key,
+        }
+
+
+class _ArchiveStream:
+    # chunks 는 event loop 에서만, segment 와 file 은 writer thread 에서만 건드린다.
+    def __init__(self, meeting_id: int, speaker: int, started_at: int) -> None:
+        self.meeting_id = meeting_id
+        self.speaker = speaker
+        self.started_at = started_at
+        self.chunks: List[tuple[bytes, int]] = []
+        self.closing = False
+
+        self.written = 0
+        self.sequence = 0
+        self.segment: Optional[AudioSegment] = None
+        self.file: Optional[BinaryIO] = None
+        self.wav: Optional[wave.Wave_write] = None
+
+
+class AudioArchiver:
+    """Tees every speaker's PCM into segmented files for reprocessing after the meeting.
+
+    ``append`` only queues the chunk, so the websocket receive loop never
+    waits for the disk. A background task hands everything queued to a
+    worker thread once ``max_batch_bytes`` are waiting or ``flush_interval``
+    seconds have passed, which writes one block per stream and starts a new
+    file every ``segment_seconds`` of audio. ``fsync`` is ``never``,
+    ``segment`` (when a file is closed) or ``always`` (after every batch).
+    Closed segments are indexed in the ``audio_segment`` table by meeting,
+    speaker and time. When the meeting ends every worker closes its streams
+    for it and, with ``upload`` set, uploads the files to object storage.
+    Chunks beyond ``max_pending_bytes`` are dropped and counted rather than
+    held in memory while the disk is stalled.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str],
+        db_manager: DatabaseManager,
+        broker: MessageBroker,
+        upload: Optional[Uploader] = None,
+        format: str = "wav",
+        segment_seconds: float = 300,
+        flush_interval: float = 1.0,
+        max_batch_bytes: int = 4 * MB,
+        max_pending_bytes: int = 64 * MB,
+        fsync: str = "segment",
+        ffmpeg: str = "ffmpeg",
+        channel: str = "audio_archive",
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown archive format {format}, expected one of {FORMATS}")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync}, expected one of {FSYNC_POLICIES}")
+
+        self.root = root
+        self.db_manager = db_manager
+        self.broker = broker
+        self.upload = upload
+        self.format = format
+        self.segment_bytes = int(segment_seconds * SAMPLE_RATE) * 2
+        self.flush_interval = flush_interval
+        self.max_batch_bytes = max_batch_bytes
+        self.max_pending_bytes = max_pending_bytes
+        self.fsync = fsync
+        self.channel = channel
+
+        self._streams: dict[tuple[int, int], _ArchiveStream] = {}
+        self._closing: List[_ArchiveStream] = []
+        self._pending_bytes = 0
+        self._unindexed: List[AudioSegment] = []
+        self._unuploaded: dict[int, List[AudioSegment]] = defaultdict(list)
+        self._uploads: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.written_bytes = 0
+        self.dropped_bytes = 0
+        self.segments = 0
+        self.flushes = 0
+        self.write_failures = 0
+        self.index_failures = 0
+        self.uploaded = 0
+        self.upload_failures = 0
+        self.max_flush_seconds = 0.0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+        self.ffmpeg = shutil.which(ffmpeg) if format == "flac" else None
+        if format == "flac" and self.ffmpeg is None:
+            self.logger.warning(f"{ffmpeg} was not found, audio is archived as wav")
+            self.format = "wav"
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+
+        self.broker.subscribe(self.channel, self._on_finish)
+        self._stopping = False
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audio-archiver")
+
+    async def stop(self) -> None:
+        if not self.enabled:
+            return
+
+        self.broker.unsubscribe(self.channel, self._on_finish)
+        if self._task is not None:
+            self._stopping = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # 열려 있는 segment 도 header 를 맞춰 닫아야 재생할 수 있다.
+        for meeting_id, speaker in list(self._streams):
+            self.close_stream(meeting_id, speaker)
+        await self.flush()
+
+        if self._uploads:
+            await asyncio.gather(*self._uploads, return_exceptions=True)
+
+    def append(self, meeting_id: int, speaker: int, pcm: bytes) -> None:
+        if not self.enabled:
+            return
+
+        if self._pending_bytes + len(pcm) > self.max_pending_bytes:
+            self.dropped_bytes += len(pcm)
+            return
+
+        received_at = int(time.time() * 1000)
+        stream = self._streams.get((meeting_id, speaker))
+        if stream is None:
+            stream = self._streams[(meeting_id, speaker)] = _ArchiveStream(meeting_id, speaker, received_at)
+
+        stream.chunks.append((pcm, received_at))
+        self._pending_bytes += len(pcm)
+        if self._pending_bytes >= self.max_batch_bytes:
+            self._wakeup.set()
+
+    def close_stream(self, meeting_id: int, speaker: int) -> None:
+        stream = self._streams.pop((meeting_id, speaker), None)
+        if stream is None:
+            return
+
+        stream.closing = True
+        self._closing.append(stream)
+        self._wakeup.set()
+
+    async def finish_meeting(self, meeting_id: int) -> None:
+        if self.enabled:
+            # 화자들이 다른 worker 에 붙어 있을 수 있으므로 모든 worker 가 자기 stream 을 닫게 한다.
+            await self.broker.publish(self.channel, {"meeting_id": meeting_id})
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            batch = [(stream, stream.chunks, stream.closing) for stream in [*self._streams.values(), *self._closing]]
+            batch = [item for item in batch if item[1] or item[2]]
+            for stream, _, _ in batch:
+                stream.chunks = []
+            self._closing = []
+            self._pending_bytes = 0
+
+            if batch:
+                started = time.monotonic()
+                # cancel 되어도 thread 는 계속 쓰므로 끝날 때까지 기다려서 닫힌 segment 를 잃지 않는다.
+                write = asyncio.ensure_future(asyncio.to_thread(self._write, batch))
+                try:
+                    finished, errors = await asyncio.shield(write)
+                except asyncio.CancelledError:
+                    self._written(*await write, started)
+                    raise
+                self._written(finished, errors, started)
+
+            await self._index()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "format": self.format,
+            "fsync": self.fsync,
+            "streams": len(self._streams),
+            "pending_bytes": self._pending_bytes,
+            "written_bytes": self.written_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "segments": self.segments,
+            "flushes": self.flushes,
+            "max_flush_seconds": round(self.max_flush_seconds, 3),
+            "write_failures": self.write_failures,
+            "unindexed_segments": len(self._unindexed),
+            "index_failures": self.index_failures,
+            "uploaded": self.uploaded,
+            "upload_failures": self.upload_failures,
+        }
+
+    def _written(self, finished: List[AudioSegment], errors: List[OSError], started: float) -> None:
+        self.max_flush_seconds = max(self.max_flush_seconds, time.monotonic() - started)
+        self.flushes += 1
+        if errors:
+            self.write_failures += 1
+            self.logger.error(f"Failed to archive audio of {len(errors)} streams : {errors[0]}")
+        # 쓰다가 실패한 batch 라도 그 전에 닫힌 segment 는 file 이 온전하므로 색인하고 올린다.
+        self.segments += len(finished)
+        self._unindexed.extend(finished)
+        # 올릴 곳이 없으면 회의가 끝나도 꺼내 가지 않으므로 모아 두지 않는다.
+        if self.upload is not None:
+            for segment in finished:
+                self._unuploaded[segment.meeting_id].append(segment)
+
+    async def _index(self) -> None:
+        if not self._unindexed:
+            return
+
+        segments, self._unindexed = self._unindexed, []
+        try:
+            await self.db_manager.upsert_audio_segment_table_bulk([segment.row() for segment in segments])
+        except Exception as e:
+            # segment_key 로 upsert 하므로 다음 flush 때 그대로 다시 보낸다.
+            self._unindexed[:0] = segments
+            self.index_failures += 1
+            self.logger.error(f"Failed to index {len(segments)} audio segments : {e}")
+
+    def _write(
+        self, batch: List[tuple[_ArchiveStream, List[tuple[bytes, int]], bool]]
+    ) -> tuple[List[AudioSegment], List[OSError]]:
+        """Writes the batch and returns the segments it closed with the errors of the streams that failed.
+
+        A stream that fails does not stop the others, and the segments it
+        closed before the error are still returned.
+        """
+        finished = []
+        errors = []
+        for stream, chunks, closing in batch:
+            try:
+                self._write_stream(stream, chunks, closing, finished)
+            except OSError as e:
+                errors.append(e)
+
+        return finished, errors
+
+    def _write_stream(
+        self, stream: _ArchiveStream, chunks: List[tuple[bytes, int]], closing: bool, finished: List[AudioSegment]
+    ) -> None:
+        for data, received_at in chunks:
+            view = memoryview(data)
+            position = 0
+            while position < len(view):
+                if stream.segment is None:
+                    self._open_segment(stream, received_at + position // BYTES_PER_MS)
+
+                size = min(len(view) - position, self.segment_bytes - stream.segment.bytes)
+                stream.wav.writeframesraw(view[position:position + size])
+                stream.segment.bytes += size
+                stream.written += size
+                self.written_bytes += size
+                position += size
+                if stream.segment.bytes >= self.segment_bytes:
+                    finished.append(self._close_segment(stream))
+
+        if stream.file is not None:
+            # batch 마다 한 번만 OS 에 넘긴다.
+            stream.file.flush()
+            if self.fsync == "always":
+                os.fsync(stream.file.fileno())
+        if closing and stream.segment is not None:
+            finished.append(self._close_segment(stream))
+
+    def _open_segment(self, stream: _ArchiveStream, started_at: int) -> None:
+        directory = os.path.join(self.root, str(stream.meeting_id), str(stream.speaker))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{stream.started_at}_{stream.sequence:04d}.wav")
+
+        stream.file = open(path, "wb")
+        stream.wav = wave.open(stream.file, "wb")
+        stream.wav.setnchannels(1)
+        stream.wav.setsampwidth(2)
+        stream.wav.setframerate(SAMPLE_RATE)
+        stream.segment = AudioSegment(
+            segment_key=uuid.uuid4().hex,
+            meeting_id=stream.meeting_id,
+            speaker=stream.speaker,
+            session_started_at=stream.started_at,
+            sequence=stream.sequence,
+            path=path,
+            started_at=started_at,
+            offset_ms=stream.written // BYTES_PER_MS,
+        )
+        stream.sequence += 1
+
+    def _close_segment(self, stream: _ArchiveStream) -> AudioSegment:
+        segment = stream.segment
+        # wave 는 받은 file 을 닫지 않고 header 의 길이만 고친다.
+        stream.wav.close()
+        stream.file.flush()
+        if self.fsync != "never":
+            os.fsync(stream.file.fileno())
+        stream.file.close()
+        stream.segment, stream.file, stream.wav = None, None, None
+
+        if self.format == "flac":
+            segment.path = self._encode_flac(segment.path)
+        return segment
+
+    def _encode_flac(self, path: str) -> str:
+        target = os.path.splitext(path)[0] + ".flac"
+        result = subprocess.run(
+            [self.ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", path, "-c:a", "flac", target],
+            stdin=subprocess.DEVNULL, capture_output=True,
+        )
+        if result.returncode != 0:
+            self.logger.warning(f"Failed to encode {path} as flac, keeping wav : {result.stderr.decode(errors='replace')}")
+            return path
+
+        if self.fsync != "never":
+            with open(target, "rb") as f:
+                os.fsync(f.fileno())
+        os.remove(path)
+        return target
+
+    def _on_finish(self, message: dict) -> None:
+        meeting_id = message["meeting_id"]
+        for key in [key for key in self._streams if key[0] == meeting_id]:
+            self.close_stream(*key)
+
+        if self.upload is not None:
+            task = asyncio.create_task(self._upload_meeting(meeting_id), name=f"audio-upload-{meeting_id}")
+            self._uploads.add(task)
+            task.add_done_callback(self._uploads.discard)
+
+    async def _upload_meeting(self, meeting_id: int) -> None:
+        try:
+            await self.flush()
+        finally:
+            # flush 가 실패해도 이 회의의 목록은 버려서 memory 에 남지 않게 한다.
+            segments = self._unuploaded.pop(meeting_id, [])
+        await asyncio.gather(*(self._upload(segment) for segment in segments))
+        self.logger.info(f"#{meeting_id} {len(segments)} audio segments uploaded")
+
+    async def _upload(self, segment: AudioSegment) -> None:
+        key = f"audio/{segment.meeting_id}/{segment.speaker}/{os.path.basename(segment.path)}"
+        try:
+            with open(segment.path, "rb") as f:
+                await self.upload(f, key)
+            # 아직 색인되지 않은 segment 는 다음 upsert 에 key 가 같이 실린다.
+            segment.storage_key = key
+            await self.db_manager.update_audio_segment_storage_key(segment.segment_key, key)
+            self.uploaded += 1
+        except Exception as e:
+            self.upload_failures += 1
+            self.logger.error(f"Failed to upload {segment.path} : {e}")
+
+    async def _run(self) -> None:
+        # python 3.11 의 wait_for 는 wakeup 과 동시에 들어온 cancel 을 삼킬 수 있어서 _stopping 도 본다.
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            await self.flush()
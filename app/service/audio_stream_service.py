@@ -1,10 +1,8 @@
-import json
 import logging
-from typing import List
-from threading import Thread
 
 from fastapi import WebSocket
 
+from .fanout_service import FanoutManager
 from ..provider.audio_manager import ResumableMicrophoneSocketStream
 
 
@@ -12,7 +10,7 @@ class AudioStreamServiceManager:
     def __init__(self):
         self.active_connections: dict[int, WebSocket] = {}
         self.stream_status: dict[int, ResumableMicrophoneSocketStream] = {}
-        self.stream_task: dict[int, Thread] = {}
+        self.fanout = FanoutManager()
 
         self.logger = logging.getLogger("uvicorn")
         self.logger.setLevel(logging.INFO)        
@@ -20,21 +18,30 @@ class AudioStreamServiceManager:
     async def connect(self, websocket: WebSocket, client_id: int):
         await websocket.accept()        
 
+    def add_connection(self, websocket: WebSocket, client_id: int):
+        self.active_connections[client_id] = websocket
+        self.fanout.subscribe(client_id, websocket)
+
     def disconnect(self, websocket: WebSocket, client_id: int):
         if client_id in self.active_connections:
             self.active_connections.pop(client_id)
+            self.fanout.unsubscribe(client_id)
 
         if client_id in self.stream_status:            
             self.stream_status[client_id].closed = True
             self.stream_status.pop(client_id)          
 
-        if client_id in self.stream_task:            
-            self.logger.info(f"{self.stream_task[client_id].getName()} status : {self.stream_task[client_id].is_alive()}")
-            self.stream_task.pop(client_id)
-
     async def send_personal_message(self, message: str, client_id: int):
-        await self.active_connections[client_id].send_text(message)
+        self.fanout.send(client_id, message)
 
     async def broadcast(self, message: str):
-        for client_id in self.active_connections:
-            await self.active_connections[client_id].send_text(message)    
+        self.fanout.broadcast(message)
+
+    def queue_stats(self) -> dict[int, dict]:
+        return self.fanout.stats()
+
+    def stream_stats(self) -> dict[int, dict]:
+        return {
+            client_id: {**stream.memory_usage(), "restart_counter": stream.restart_counter}
+            for client_id, stream in list(self.stream_status.items())
+        }    
@@ -0,0 +1,349 @@
+import os
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+from .transcribe_service import TranscriptionService
+from ..model.utterance import Utterance
+from ..util.time_util import TimeUtil
+
+
+SAMPLE_RATE = 16000
+BYTES_PER_MS = SAMPLE_RATE * 2 // 1000
+
+
+@dataclass
+class BatchSegment:
+    index: int
+    # start_ms ~ end_ms 에서 끝나는 발언만 이 segment 의 것이다.
+    # STT 에는 앞뒤로 overlap 을 붙인 audio_start_ms ~ audio_end_ms 를 보내서 경계의 단어가 잘리지 않게 한다.
+    start_ms: int
+    end_ms: int
+    audio_start_ms: int
+    audio_end_ms: int
+
+
+@dataclass
+class BatchUtterance:
+    start_ms: int
+    end_ms: int
+    utterance: Utterance
+
+    def to_dict(self) -> dict:
+        return {"start_ms": self.start_ms, "end_ms": self.end_ms, **self.utterance.model_dump()}
+
+
+def prepare_recording(
+    ffmpeg: str,
+    source_path: str,
+    pcm_path: str,
+    target_ms: int,
+    max_ms: int,
+    overlap_ms: int,
+    min_silence_ms: int,
+    frame_ms: int = 20,
+) -> tuple[int, List[BatchSegment]]:
+    """Decodes a recording into 16 kHz mono LINEAR16 at ``pcm_path`` and plans its segments.
+
+    Runs in a worker process, so silence detection over a long recording
+    does not hold the event loop or the GIL of the server.
+    """
+    from ..provider.audio_manager import VoiceActivityDetector
+
+    # pydub 는 decode 한 audio 전체를 memory 에 올리므로 ffmpeg 가 바로 file 로 쓰게 한다.
+    result = subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", source_path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), pcm_path],
+        stdin=subprocess.DEVNULL, capture_output=True,
+    )
+    if result.returncode != 0:
+        raise ValueError(f"Could not decode the recording : {result.stderr.decode(errors='replace').strip()}")
+
+    duration_ms = os.path.getsize(pcm_path) // BYTES_PER_MS
+    vad = VoiceActivityDetector(rate=SAMPLE_RATE, frame_ms=frame_ms)
+    frame_bytes = frame_ms * BYTES_PER_MS
+
+    # target_ms 를 넘긴 뒤 처음 나오는 min_silence_ms 이상의 침묵 가운데에서 자르고,
+    # max_ms 까지 침묵이 없으면 그 자리에서 자른다. 잘린 단어는 overlap 으로 이웃 segment 가 듣는다.
+    cuts = [0]
+    silent_ms = 0
+    now_ms = 0
+    with open(pcm_path, "rb") as f:
+        while len(frame := f.read(frame_bytes)) == frame_bytes:
+            now_ms += frame_ms
+            silent_ms = 0 if vad.is_speech(frame) else silent_ms + frame_ms
+            elapsed = now_ms - cuts[-1]
+
+            if elapsed >= target_ms and silent_ms >= min_silence_ms:
+                cuts.append(now_ms - silent_ms // 2)
+                silent_ms = 0
+            elif elapsed >= max_ms:
+                cuts.append(now_ms)
+                silent_ms = 0
+
+    if duration_ms - cuts[-1] < target_ms // 4 and len(cuts) > 1:
+        # 끝에 짧게 남은 조각은 앞 segment 에 붙인다.
+        cuts.pop()
+    cuts.append(duration_ms)
+
+    segments = [
+        BatchSegment(
+            index=index,
+            start_ms=start,
+            end_ms=end,
+            audio_start_ms=max(0, start - overlap_ms),
+            audio_end_ms=min(duration_ms, end + overlap_ms),
+        )
+        for index, (start, end) in enumerate(zip(cuts, cuts[1:]))
+        if end > start
+    ]
+    return duration_ms, segments
+
+
+class BatchTranscriptionService:
+    """Transcribes an uploaded recording in parallel segments.
+
+    A worker process decodes the recording with ffmpeg into a temporary
+    LINEAR16 file and cuts it at silences into segments of about
+    ``target_segment_seconds``, each padded with ``overlap_ms`` of its
+    neighbours. Segments are read from that file one at a time and sent to
+    the STT backend as separate streaming sessions, at most
+    ``max_concurrency`` at once across all running jobs. ``run`` yields
+    progress events as segments finish and releases the utterances in
+    recording order as soon as every earlier segment is done. An utterance
+    belongs to the segment its end falls in, so words heard twice in an
+    overlap are kept once.
+    """
+
+    def __init__(
+        self,
+        transcription_service: TranscriptionService,
+        max_concurrency: int = 8,
+        decode_processes: int = 2,
+        target_segment_seconds: float = 30,
+        max_segment_seconds: float = 55,
+        overlap_ms: int = 1000,
+        min_silence_ms: int = 300,
+        chunk_ms: int = 250,
+        max_attempts: int = 3,
+        ffmpeg: str = "ffmpeg",
+        temp_dir: Optional[str] = None,
+    ) -> None:
+        self.transcription_service = transcription_service
+        self.ffmpeg = shutil.which(ffmpeg) or ffmpeg
+        self.max_concurrency = max_concurrency
+        self.decode_processes = decode_processes
+        self.target_ms = int(target_segment_seconds * 1000)
+        self.max_ms = int(max_segment_seconds * 1000)
+        self.overlap_ms = overlap_ms
+        self.min_silence_ms = min_silence_ms
+        self.chunk_bytes = chunk_ms * BYTES_PER_MS
+        self.max_attempts = max_attempts
+        self.temp_dir = temp_dir
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.jobs = 0
+        self.active_jobs = 0
+        self.segments = 0
+        self.failed_segments = 0
+        self.audio_ms = 0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def save_upload(self, file: BinaryIO, filename: Optional[str] = None) -> str:
+        # ffmpeg 가 확장자로 format 을 짐작할 수 있도록 원래 이름의 확장자를 남긴다.
+        suffix = os.path.splitext(filename or "")[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, dir=self.temp_dir, delete=False) as target:
+            try:
+                await asyncio.to_thread(shutil.copyfileobj, file, target)
+            except BaseException:
+                os.remove(target.name)
+                raise
+
+        return target.name
+
+    @staticmethod
+    def discard(source_path: str) -> None:
+        """Removes the upload saved by ``save_upload`` and the PCM decoded from it, if they are still there."""
+        for path in (source_path, f"{source_path}.pcm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def run(self, source_path: str, speaker: str, started_at: int) -> AsyncIterator[dict]:
+        """Transcribes ``source_path`` and yields events; the file is removed when the job ends.
+
+        ``started_at`` is the unix time (ms) of the start of the recording and
+        is added to each offset for the utterance timestamp.
+        """
+        started = time.monotonic()
+        pcm_path = f"{source_path}.pcm"
+        tasks: List[asyncio.Task] = []
+        self.jobs += 1
+        self.active_jobs += 1
+
+        try:
+            try:
+                duration_ms, segments = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), prepare_recording, self.ffmpeg,
+                    source_path, pcm_path, self.target_ms, self.max_ms, self.overlap_ms, self.min_silence_ms,
+                )
+            except (OSError, ValueError, BrokenProcessPool) as e:
+                if isinstance(e, BrokenProcessPool):
+                    # worker 가 죽은 pool 은 다시 쓸 수 없으므로 다음 작업 때 새로 띄운다.
+                    self._executor = None
+                self.logger.error(f"Failed to prepare {source_path} : {e}")
+                yield {"type": "failed", "error": str(e) or type(e).__name__}
+                return
+
+            yield {
+                "type": "decoded",
+                "duration_ms": duration_ms,
+                "segments": len(segments),
+                "decode_seconds": round(time.monotonic() - started, 3),
+            }
+
+            tasks = [
+                asyncio.create_task(self._transcribe_segment(pcm_path, segment, segments[-1], speaker, started_at))
+                for segment in segments
+            ]
+            results: dict[int, List[BatchUtterance]] = {}
+            released, failed, audio_ms_done, count = 0, 0, 0, 0
+            for next_done in asyncio.as_completed(tasks):
+                segment, utterances, error = await next_done
+                results[segment.index] = utterances
+                audio_ms_done += segment.end_ms - segment.start_ms
+                if error is not None:
+                    failed += 1
+                    yield {"type": "segment_failed", "segment": segment.index, "error": error}
+
+                yield {
+                    "type": "progress",
+                    "segment": segment.index,
+                    "done": len(results),
+                    "segments": len(segments),
+                    "audio_ms_done": audio_ms_done,
+                    "duration_ms": duration_ms,
+                    "elapsed_seconds": round(time.monotonic() - started, 3),
+                }
+
+                # 앞 segment 가 모두 끝난 만큼만 순서대로 내보낸다.
+                while released in results:
+                    for utterance in results.pop(released):
+                        count += 1
+                        yield {"type": "utterance", **utterance.to_dict()}
+                    released += 1
+
+            elapsed = time.monotonic() - started
+            self.audio_ms += duration_ms
+            yield {
+                "type": "done",
+                "utterances": count,
+                "failed_segments": failed,
+                "duration_ms": duration_ms,
+                "elapsed_seconds": round(elapsed, 3),
+                "speed": round(duration_ms / 1000 / elapsed, 2) if elapsed > 0 else None,
+            }
+        finally:
+            # 요청한 쪽이 끊어서 generator 가 닫혀도 남은 STT session 을 정리한다.
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self.discard(source_path)
+            self.active_jobs -= 1
+
+    def stats(self) -> dict:
+        return {
+            "jobs": self.jobs,
+            "active_jobs": self.active_jobs,
+            "max_concurrency": self.max_concurrency,
+            "segments": self.segments,
+            "failed_segments": self.failed_segments,
+            "audio_minutes": round(self.audio_ms / 60000, 2),
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # event loop 와 grpc thread 가 있는 process 를 fork 하지 않도록 spawn 으로 띄운다.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.decode_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return self._executor
+
+    async def _transcribe_segment(
+        self, pcm_path: str, segment: BatchSegment, last: BatchSegment, speaker: str, started_at: int
+    ) -> tuple[BatchSegment, List[BatchUtterance], Optional[str]]:
+        error = None
+        async with self._semaphore:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    pcm = await asyncio.to_thread(self._read, pcm_path, segment)
+                    utterances = await self._recognize(pcm, segment, segment is last, speaker, started_at)
+                    self.segments += 1
+                    return segment, utterances, None
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    self.logger.warning(f"Segment {segment.index} failed ({attempt}/{self.max_attempts}) : {error}")
+                    if attempt < self.max_attempts:
+                        await asyncio.sleep(0.5 * attempt)
+
+        self.failed_segments += 1
+        return segment, [], error
+
+    async def _recognize(
+        self, pcm: bytes, segment: BatchSegment, is_last: bool, speaker: str, started_at: int
+    ) -> List[BatchUtterance]:
+        async def chunks():
+            for position in range(0, len(pcm), self.chunk_bytes):
+                yield pcm[position:position + self.chunk_bytes]
+
+        utterances = []
+        previous_end = segment.audio_start_ms
+        async for result in self.transcription_service.streaming_recognize(chunks()):
+            if not result.is_final:
+                continue
+
+            end_ms = segment.audio_start_ms + result.result_end_time
+            start_ms, previous_end = previous_end, end_ms
+            # overlap 에서 끝난 발언은 이웃 segment 가 맡는다.
+            if end_ms <= segment.start_ms or (end_ms > segment.end_ms and not is_last):
+                continue
+
+            text = result.transcript.strip()
+            if text:
+                utterances.append(
+                    BatchUtterance(
+                        start_ms=start_ms,
+                        end_ms=end_ms,
+                        utterance=Utterance(
+                            timestamp=TimeUtil.convert_unixtime_to_timestamp(started_at + start_ms),
+                            speaker=speaker,
+                            text=text,
+                        ),
+                    )
+                )
+
+        return utterances
+
+    @staticmethod
+    def _read(pcm_path: str, segment: BatchSegment) -> bytes:
+        with open(pcm_path, "rb") as f:
+            f.seek(segment.audio_start_ms * BYTES_PER_MS)
+            return f.read((segment.audio_end_ms - segment.audio_start_ms) * BYTES_PER_MS)
@@ -0,0 +1,100 @@
+import uuid
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, List
+
+
+Handler = Callable[[dict], None]
+
+
+class BrokerError(Exception):
+    """Raised when a broker cannot reach its backend.
+
+    Each backend translates its own connection errors to this type so
+    callers do not depend on which broker is configured.
+    """
+
+
+class MessageBroker(ABC):
+    """Publish/subscribe and shared state between the workers serving a meeting.
+
+    A message published on a channel is delivered to every handler
+    subscribed to that channel in any worker, including the publisher.
+    Handlers run on the event loop and must not block. ``set_state`` and
+    ``delete_state`` are fire-and-forget writes to a shared hash, so they can
+    be called from synchronous disconnect callbacks; ``get_state`` reads the
+    whole hash.
+    """
+
+    name: str = ""
+
+    def __init__(self) -> None:
+        # 발행한 worker 를 구분할 때 쓴다.
+        self.node_id = uuid.uuid4().hex
+        self._handlers: dict[str, List[Handler]] = defaultdict(list)
+
+        self.published = 0
+        self.delivered = 0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        first = len(self._handlers[channel]) == 0
+        self._handlers[channel].append(handler)
+        if first:
+            self._on_subscribe(channel)
+
+    def unsubscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers and channel in self._handlers:
+            del self._handlers[channel]
+            self._on_unsubscribe(channel)
+
+    @abstractmethod
+    async def publish(self, channel: str, message: dict) -> None:
+        ...
+
+    @abstractmethod
+    def set_state(self, key: str, field: str, value: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete_state(self, key: str, field: str) -> None:
+        ...
+
+    @abstractmethod
+    async def get_state(self, key: str) -> dict[str, str]:
+        ...
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "node_id": self.node_id,
+            "channels": len(self._handlers),
+            "published": self.published,
+            "delivered": self.delivered,
+        }
+
+    def _on_subscribe(self, channel: str) -> None:
+        pass
+
+    def _on_unsubscribe(self, channel: str) -> None:
+        pass
+
+    def _dispatch(self, channel: str, message: dict) -> None:
+        for handler in list(self._handlers.get(channel, ())):
+            try:
+                handler(message)
+                self.delivered += 1
+            except Exception as e:
+                self.logger.error(f"Broker handler for {channel} failed : {e}")
@@ -0,0 +1,28 @@
+from collections import defaultdict
+
+from .base import MessageBroker
+
+
+class InProcessBroker(MessageBroker):
+    """Broker for a single worker: messages are handed to the handlers directly."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._state: dict[str, dict[str, str]] = defaultdict(dict)
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self.published += 1
+        self._dispatch(channel, message)
+
+    def set_state(self, key: str, field: str, value: str) -> None:
+        self._state[key][field] = value
+
+    def delete_state(self, key: str, field: str) -> None:
+        self._state[key].pop(field, None)
+        if not self._state[key]:
+            del self._state[key]
+
+    async def get_state(self, key: str) -> dict[str, str]:
+        return dict(self._state.get(key, {}))
@@ -0,0 +1,106 @@
+import json
+import asyncio
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from .base import BrokerError, MessageBroker
+
+
+class RedisBroker(MessageBroker):
+    """Broker backed by Redis pub/sub and hashes, for workers on one or more hosts.
+
+    Subscriptions and state writes go through one queue so they reach Redis
+    in the order they were made. Unlike the Unix socket hub, Redis does not
+    know which worker set a field, so fields of a worker that crashed stay
+    until the participant connects and disconnects again.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "smart_meeting:") -> None:
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+
+        self._client = redis.from_url(url, decode_responses=True)
+        self._pubsub = self._client.pubsub()
+        self._commands: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+        self.failures = 0
+
+    async def start(self) -> None:
+        await self._client.ping()
+        await self._pubsub.connect()
+        self._tasks = [
+            asyncio.create_task(self._read(), name="redis-broker-read"),
+            asyncio.create_task(self._write(), name="redis-broker-write"),
+        ]
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self.published += 1
+        try:
+            await self._client.publish(self.prefix + channel, json.dumps(message, ensure_ascii=False))
+        except RedisError as e:
+            raise BrokerError(f"Redis publish failed : {e}") from e
+
+    def set_state(self, key: str, field: str, value: str) -> None:
+        self._commands.put_nowait(("hset", self.prefix + key, field, value))
+
+    def delete_state(self, key: str, field: str) -> None:
+        self._commands.put_nowait(("hdel", self.prefix + key, field))
+
+    async def get_state(self, key: str) -> dict[str, str]:
+        try:
+            return await self._client.hgetall(self.prefix + key)
+        except RedisError as e:
+            raise BrokerError(f"Redis hgetall failed : {e}") from e
+
+    def stats(self) -> dict:
+        return {**super().stats(), "queued_commands": self._commands.qsize(), "failures": self.failures}
+
+    def _on_subscribe(self, channel: str) -> None:
+        self._commands.put_nowait(("subscribe", self.prefix + channel))
+
+    def _on_unsubscribe(self, channel: str) -> None:
+        self._commands.put_nowait(("unsubscribe", self.prefix + channel))
+
+    async def _write(self) -> None:
+        while True:
+            command, *args = await self._commands.get()
+            try:
+                if command in ("subscribe", "unsubscribe"):
+                    await getattr(self._pubsub, command)(*args)
+                else:
+                    await getattr(self._client, command)(*args)
+            except Exception as e:
+                self.failures += 1
+                self.logger.error(f"Redis broker {command} failed : {e}")
+
+    async def _read(self) -> None:
+        while True:
+            if not self._pubsub.subscribed:
+                await asyncio.sleep(0.1)
+                continue
+
+            try:
+                message: Optional[dict] = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                self.failures += 1
+                self.logger.error(f"Redis broker read failed : {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is not None and message["type"] == "message":
+                self._dispatch(message["channel"][len(self.prefix):], json.loads(message["data"]))
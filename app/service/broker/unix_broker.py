@@ -0,0 +1,262 @@
+import os
+import json
+import fcntl
+import asyncio
+import itertools
+from collections import defaultdict
+from typing import Optional
+
+from .base import BrokerError, MessageBroker
+
+
+class _BrokerHub:
+    """Relay that forwards published messages to the connections subscribed to the channel.
+
+    It also keeps the shared state. Fields are owned by the connection that
+    set them and are dropped when that connection goes away, so a crashed
+    worker does not leave its participants behind.
+    """
+
+    def __init__(self, path: str, max_buffer: int) -> None:
+        self.path = path
+        self.max_buffer = max_buffer
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._subscribers: dict[str, set[asyncio.StreamWriter]] = defaultdict(set)
+        self._state: dict[str, dict[str, str]] = defaultdict(dict)
+        self._owners: dict[tuple[str, str], asyncio.StreamWriter] = {}
+        self._connections: set[asyncio.Task] = set()
+        self.dropped = 0
+
+    async def start(self) -> None:
+        # 이전 hub 가 죽으면서 남긴 socket file 은 lock 을 잡은 쪽이 지운다.
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=self.max_buffer)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # 연결마다 도는 _handle 이 loop 종료 때 cancel 되지 않도록 먼저 끝낸다.
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        channels: set[str] = set()
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                op = frame["op"]
+                if op == "pub":
+                    self._forward(frame["ch"], line)
+                elif op == "sub":
+                    channels.add(frame["ch"])
+                    self._subscribers[frame["ch"]].add(writer)
+                elif op == "unsub":
+                    channels.discard(frame["ch"])
+                    self._remove_subscriber(frame["ch"], writer)
+                elif op == "set":
+                    self._state[frame["key"]][frame["field"]] = frame["value"]
+                    self._owners[(frame["key"], frame["field"])] = writer
+                elif op == "del":
+                    self._delete_field(frame["key"], frame["field"])
+                elif op == "get":
+                    reply = {"op": "reply", "id": frame["id"], "value": self._state.get(frame["key"], {})}
+                    writer.write(json.dumps(reply).encode() + b"\n")
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            for channel in channels:
+                self._remove_subscriber(channel, writer)
+            for key, field in [owned for owned, owner in self._owners.items() if owner is writer]:
+                self._delete_field(key, field)
+            writer.close()
+
+    def _forward(self, channel: str, line: bytes) -> None:
+        for writer in list(self._subscribers.get(channel, ())):
+            # 읽지 못하는 worker 때문에 hub 의 memory 가 계속 늘지 않도록 넘치면 버린다.
+            if writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.dropped += 1
+                continue
+            writer.write(line)
+
+    def _remove_subscriber(self, channel: str, writer: asyncio.StreamWriter) -> None:
+        subscribers = self._subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(writer)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def _delete_field(self, key: str, field: str) -> None:
+        self._owners.pop((key, field), None)
+        state = self._state.get(key)
+        if state is not None:
+            state.pop(field, None)
+            if not state:
+                del self._state[key]
+
+
+class UnixSocketBroker(MessageBroker):
+    """Broker shared by the workers of one host over a Unix domain socket.
+
+    The worker that takes the lock file next to ``path`` runs the hub, and
+    every worker, including that one, connects to it as a client. If the hub
+    worker dies its lock is released, the others reconnect, one of them takes
+    over, and each worker subscribes again and restores the state it owns.
+    Messages published while disconnected are dropped and counted.
+    """
+
+    name = "unix"
+
+    def __init__(self, path: str, retry_interval: float = 0.2, max_buffer: int = 8 * 1024 * 1024) -> None:
+        super().__init__()
+        self.path = path
+        self.retry_interval = retry_interval
+        self.max_buffer = max_buffer
+
+        self._hub: Optional[_BrokerHub] = None
+        self._lock_fd: Optional[int] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._owned: dict[tuple[str, str], str] = {}
+        self._replies: dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count()
+
+        self.dropped = 0
+        self.reconnects = 0
+
+    async def start(self, timeout: float = 5.0) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="unix-broker")
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._hub is not None:
+            await self._hub.close()
+            self._hub = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def publish(self, channel: str, message: dict) -> None:
+        self.published += 1
+        if not self._send({"op": "pub", "ch": channel, "msg": message}):
+            self.dropped += 1
+
+    def set_state(self, key: str, field: str, value: str) -> None:
+        self._owned[(key, field)] = value
+        self._send({"op": "set", "key": key, "field": field, "value": value})
+
+    def delete_state(self, key: str, field: str) -> None:
+        self._owned.pop((key, field), None)
+        self._send({"op": "del", "key": key, "field": field})
+
+    async def get_state(self, key: str) -> dict[str, str]:
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = future
+        if not self._send({"op": "get", "key": key, "id": request_id}):
+            self._replies.pop(request_id, None)
+            raise BrokerError("Broker hub is not connected")
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "hub": self._hub is not None,
+            "connected": self._writer is not None,
+            "dropped": self.dropped,
+            "hub_dropped": self._hub.dropped if self._hub is not None else 0,
+            "reconnects": self.reconnects,
+        }
+
+    def _on_subscribe(self, channel: str) -> None:
+        self._send({"op": "sub", "ch": channel})
+
+    def _on_unsubscribe(self, channel: str) -> None:
+        self._send({"op": "unsub", "ch": channel})
+
+    def _send(self, frame: dict) -> bool:
+        if self._writer is None or self._writer.is_closing():
+            return False
+        self._writer.write(json.dumps(frame, ensure_ascii=False).encode() + b"\n")
+        return True
+
+    def _try_lock(self) -> bool:
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            if self._hub is None and self._try_lock():
+                self._hub = _BrokerHub(self.path, self.max_buffer)
+                await self._hub.start()
+                self.logger.info(f"Broker hub listening on {self.path}")
+
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=self.max_buffer)
+            except OSError:
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            self._writer = writer
+            # hub 가 바뀌었을 수도 있으니 구독과 이 worker 가 가진 state 를 다시 알린다.
+            for channel in self._handlers:
+                self._send({"op": "sub", "ch": channel})
+            for (key, field), value in self._owned.items():
+                self._send({"op": "set", "key": key, "field": field, "value": value})
+            self._connected.set()
+
+            try:
+                await self._read(reader)
+            finally:
+                self._writer = None
+                self._connected.clear()
+                writer.close()
+                for future in self._replies.values():
+                    if not future.done():
+                        future.set_exception(BrokerError("Broker hub connection lost"))
+                self._replies.clear()
+
+            self.reconnects += 1
+            self.logger.warning(f"Broker hub connection lost, reconnecting to {self.path}")
+            await asyncio.sleep(self.retry_interval)
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                if frame["op"] == "pub":
+                    self._dispatch(frame["ch"], frame["msg"])
+                elif frame["op"] == "reply":
+                    future = self._replies.pop(frame["id"], None)
+                    if future is not None and not future.done():
+                        future.set_result(frame["value"])
+        except (ConnectionError, ValueError) as e:
+            self.logger.error(f"Broker hub stream failed : {e}")
@@ -1,55 +1,115 @@
 import json
-from typing import List
+from typing import List, Optional
 
 from fastapi import WebSocket
 
+from .fanout_service import FanoutManager
+from .broker.base import BrokerError, MessageBroker
+from .broker.memory_broker import InProcessBroker
 from ..model.utterance import Utterance
 
 
 class ChatServiceManager:
-    def __init__(self):
+    """Chat connections of one meeting in this worker.
+
+    Broadcasts are published on ``channel`` and every worker subscribed to it
+    fans the message out to its own connections, so participants of the same
+    meeting may be connected to different workers. Mic status is kept in the
+    broker's shared state for the same reason.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        send_timeout: float = 5.0,
+        stall_timeout: float = 10.0,
+        broker: Optional[MessageBroker] = None,
+        channel: str = "chat",
+    ):
+        self.broker = broker if broker is not None else InProcessBroker()
+        self.channel = channel
+        self.mic_key = f"{channel}:mic"
         self.active_connections: dict[int, WebSocket] = {}
         self.mic_status: dict[int, bool] = {}
         self.qa_list: List[Utterance] = []
+        self.fanout = FanoutManager(
+            on_evict=self.disconnect,
+            max_queue_size=max_queue_size,
+            send_timeout=send_timeout,
+            stall_timeout=stall_timeout,
+        )
+        self.broker.subscribe(self.channel, self._deliver)
 
     async def connect(self, websocket: WebSocket, client_id: int):
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.mic_status[client_id] = True
+        self.fanout.subscribe(client_id, websocket)
+        self.broker.set_state(self.mic_key, str(client_id), "on")
+
+        try:
+            mic_status = await self.broker.get_state(self.mic_key)
+        except BrokerError:
+            # broker 에 닿지 못하면 이 worker 에 붙은 참석자만이라도 보낸다.
+            mic_status = {str(x): "on" if status else "off" for x, status in self.mic_status.items()}
 
-        await self.send_personal_message(self._build_mic_status(), client_id)
+        await self.send_personal_message(self._build_mic_status(mic_status), client_id)
         await self.send_personal_message(self._build_qa_content(), client_id)
 
     def disconnect(self, websocket: WebSocket, client_id: int):
-        if client_id in self.active_connections:
-            self.active_connections.pop(client_id)
+        if self.active_connections.get(client_id) is not websocket:
+            return
+
+        self.active_connections.pop(client_id)
+        self.fanout.unsubscribe(client_id)
 
         if client_id in self.mic_status:
             self.mic_status.pop(client_id)
+            self.broker.delete_state(self.mic_key, str(client_id))
 
     async def send_personal_message(self, message: str, client_id: int):
-        await self.active_connections[client_id].send_text(message)
+        self.fanout.send(client_id, message)
+
+    async def broadcast(self, message: str, interim_key: Optional[str] = None):
+        await self.broker.publish(self.channel, {"payload": message, "interim_key": interim_key})
 
-    async def broadcast(self, message: str):
-        for client_id in self.active_connections:
-            await self.active_connections[client_id].send_text(message)
+    def _deliver(self, message: dict) -> None:
+        self.fanout.broadcast(message["payload"], message["interim_key"])
 
-    def _build_mic_status(self) -> str:
+    async def broadcast_json(self, message: dict):
+        # interim transcript 는 화자별로 최신 것만 남기고, json 은 한번만 직렬화한다.
+        interim_key = None
+        if message.get("type") == "q&a" and not message.get("is_done", True):
+            interim_key = f"q&a:{message.get('id')}"
+        elif message.get("type") == "summary_progress" and message.get("status") == "streaming":
+            interim_key = "summary_progress"
+
+        await self.broadcast(json.dumps(message), interim_key)
+
+    def queue_stats(self) -> dict[int, dict]:
+        return self.fanout.stats()
+
+    def _build_mic_status(self, mic_status: dict[str, str]) -> str:
         all_attendee_mic_status = [
-            {"id": client_id, "type": "mic", "status": "on" if self.mic_status[client_id] else "off"} 
-            for client_id in self.mic_status
+            {"id": int(client_id), "type": "mic", "status": status} 
+            for client_id, status in mic_status.items()
         ]
 
         return json.dumps({"type": "micList", "message": all_attendee_mic_status})
     
     def _build_qa_content(self) -> str:
         qa_content = list(map(
-            lambda x: {"id": int(x.speaker), "timestamp": x.timestamp, "message": x.text}, self.qa_list))
+            lambda x: {"id": int(x.speaker) if x.speaker.isdigit() else x.speaker, "timestamp": x.timestamp, "message": x.text}, self.qa_list))
 
         return json.dumps({"type": "chatList", "message": qa_content})
     
+    async def drain(self) -> None:
+        # 회의를 닫기 전에 마지막 상태 알림까지 참석자에게 보낸다.
+        await self.fanout.drain(self.fanout.send_timeout)
+
     def end_meeting(self) -> None:
-        for client_id in self.active_connections:
-            self.disconnect(self.active_connections[client_id], client_id)
+        for client_id, websocket in list(self.active_connections.items()):
+            self.disconnect(websocket, client_id)
         
+        self.broker.unsubscribe(self.channel, self._deliver)
         self.qa_list.clear()
@@ -0,0 +1,254 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Optional
+
+from fastapi import WebSocket
+
+from ..util.metrics import REGISTRY, FAST_BUCKETS
+
+FANOUT_BROADCAST_SECONDS = REGISTRY.histogram(
+    "fanout_broadcast_seconds", "Time to queue one broadcast for every local subscriber.", buckets=FAST_BUCKETS
+)
+FANOUT_FRAMES = REGISTRY.counter("fanout_frames_total", "Frames handled by the fan-out queues.", ["outcome"])
+FRAMES_SENT = FANOUT_FRAMES.labels("sent")
+FRAMES_DROPPED = FANOUT_FRAMES.labels("dropped")
+FRAMES_COALESCED = FANOUT_FRAMES.labels("coalesced")
+
+
+class FanoutSubscriber:
+    """A websocket with its own bounded outbound queue and writer task.
+
+    Messages sharing an ``interim_key`` replace each other while they are
+    still queued, so a slow client only ever receives the latest interim
+    text. Interim messages are dropped when the queue is full; other
+    messages push out the oldest queued entry instead.
+    """
+
+    def __init__(
+        self,
+        client_id: int,
+        websocket: WebSocket,
+        on_evict: Callable[["FanoutSubscriber", str], None],
+        max_queue_size: int,
+        send_timeout: float,
+        stall_timeout: float,
+    ):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.send_timeout = send_timeout
+        self.stall_timeout = stall_timeout
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.stalled_since: Optional[float] = None
+        self.closed = False
+
+        self._on_evict = on_evict
+        self._queue: deque[list] = deque()
+        self._ready = asyncio.Event()
+        # queue 가 비었고 보내는 중인 것도 없을 때 set 된다.
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._task = asyncio.create_task(self._write_loop(), name=f"fanout-{client_id}")
+
+        self.logger = logging.getLogger("uvicorn")
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, payload: str, interim_key: Optional[str] = None) -> bool:
+        if self.closed:
+            return False
+
+        if interim_key is not None:
+            for entry in self._queue:
+                if entry[1] == interim_key:
+                    entry[0] = payload
+                    self.coalesced += 1
+                    FRAMES_COALESCED.inc()
+                    return True
+
+        if len(self._queue) >= self.max_queue_size:
+            self._mark_stalled()
+            if self.closed:
+                return False
+
+            if interim_key is not None:
+                self.dropped += 1
+                FRAMES_DROPPED.inc()
+                return False
+
+            if not self._drop_oldest_interim():
+                self._queue.popleft()
+                self.dropped += 1
+                FRAMES_DROPPED.inc()
+
+        self._queue.append([payload, interim_key])
+        self._ready.set()
+        self._drained.clear()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        self._queue.clear()
+        self._ready.set()
+        self._drained.set()
+        if not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    async def drain(self) -> None:
+        await self._drained.wait()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "stalled_seconds": 0.0 if self.stalled_since is None else round(time.monotonic() - self.stalled_since, 3),
+        }
+
+    def _drop_oldest_interim(self) -> bool:
+        for entry in self._queue:
+            if entry[1] is not None:
+                self._queue.remove(entry)
+                self.dropped += 1
+                FRAMES_DROPPED.inc()
+                return True
+
+        return False
+
+    def _mark_stalled(self) -> None:
+        now = time.monotonic()
+        if self.stalled_since is None:
+            self.stalled_since = now
+        elif now - self.stalled_since > self.stall_timeout:
+            self._on_evict(self, f"queue full for {now - self.stalled_since:.1f}s")
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                while not self._queue:
+                    # python 3.11 의 wait_for 는 send 가 끝나는 순간 들어온 cancel 을 삼킬 수 있어서 closed 도 본다.
+                    if self.closed:
+                        return
+                    self._drained.set()
+                    self._ready.clear()
+                    await self._ready.wait()
+
+                payload, _ = self._queue.popleft()
+                await asyncio.wait_for(self.websocket.send_text(payload), self.send_timeout)
+                self.sent += 1
+                FRAMES_SENT.inc()
+
+                if len(self._queue) < self.max_queue_size:
+                    self.stalled_since = None
+
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._on_evict(self, f"send took longer than {self.send_timeout}s")
+        except Exception as e:
+            self._on_evict(self, f"send failed : {e}")
+
+
+class FanoutManager:
+    """Delivers messages to websocket subscribers without awaiting any of them."""
+
+    def __init__(
+        self,
+        on_evict: Optional[Callable[[WebSocket, int], None]] = None,
+        max_queue_size: int = 256,
+        send_timeout: float = 5.0,
+        stall_timeout: float = 10.0,
+    ):
+        self.subscribers: dict[int, FanoutSubscriber] = {}
+        self.max_queue_size = max_queue_size
+        self.send_timeout = send_timeout
+        self.stall_timeout = stall_timeout
+        self.evicted = 0
+
+        self._on_evict = on_evict
+        self._closing: set[asyncio.Task] = set()
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    def subscribe(self, client_id: int, websocket: WebSocket) -> FanoutSubscriber:
+        self.unsubscribe(client_id)
+
+        subscriber = FanoutSubscriber(
+            client_id,
+            websocket,
+            self._evict,
+            self.max_queue_size,
+            self.send_timeout,
+            self.stall_timeout,
+        )
+        self.subscribers[client_id] = subscriber
+
+        return subscriber
+
+    def unsubscribe(self, client_id: int) -> None:
+        subscriber = self.subscribers.pop(client_id, None)
+        if subscriber is not None:
+            subscriber.close()
+
+    def send(self, client_id: int, payload: str) -> bool:
+        if client_id not in self.subscribers:
+            return False
+
+        return self.subscribers[client_id].enqueue(payload)
+
+    def broadcast(self, payload: str, interim_key: Optional[str] = None) -> int:
+        started = time.perf_counter()
+        delivered = 0
+        for subscriber in list(self.subscribers.values()):
+            if subscriber.enqueue(payload, interim_key):
+                delivered += 1
+
+        FANOUT_BROADCAST_SECONDS.observe(time.perf_counter() - started)
+        return delivered
+
+    async def drain(self, timeout: float) -> None:
+        # 이미 queue 에 넣은 message 를 다 보낼 때까지 기다린다. 늦는 client 는 timeout 뒤에 포기한다.
+        subscribers = list(self.subscribers.values())
+        if not subscribers:
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(subscriber.drain() for subscriber in subscribers)), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self) -> dict[int, dict]:
+        return {client_id: subscriber.stats() for client_id, subscriber in list(self.subscribers.items())}
+
+    def _evict(self, subscriber: FanoutSubscriber, reason: str) -> None:
+        if subscriber.closed:
+            return
+
+        self.logger.warning(f"#{subscriber.client_id} evicted from fan-out : {reason}")
+        subscriber.close()
+        self.evicted += 1
+
+        if self.subscribers.get(subscriber.client_id) is subscriber:
+            self.subscribers.pop(subscriber.client_id)
+            if self._on_evict is not None:
+                self._on_evict(subscriber.websocket, subscriber.client_id)
+
+        task = asyncio.create_task(self._close_websocket(subscriber.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_websocket(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=1008), self.send_timeout)
+        except Exception:
+            pass
@@ -1,39 +1,243 @@
 import os
 import json
+import time
+import asyncio
 from logging import Logger
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from .prompt_generator import PromptGenerator
+from .summary_cache import CacheEntry, SummaryCache
 from ...model.utterance import Utterance
+from ...util.metrics import REGISTRY
+
+OPENAI_REQUEST_SECONDS = REGISTRY.histogram(
+    "openai_request_seconds", "OpenAI chat completion latency, without the concurrency wait.", ["mode"]
+)
+OPENAI_REQUEST_ERRORS = REGISTRY.counter("openai_request_errors_total", "OpenAI chat completions that raised.", ["mode"])
+OPENAI_TOKENS = REGISTRY.counter(
+    "openai_tokens_total", "Tokens used by OpenAI chat completions; streamed calls are estimated.", ["mode"]
+)
 
 class GptServiceManager:
-    
-    def __init__(self, logger: Logger) -> None:
+
+    def __init__(
+        self,
+        logger: Logger,
+        client: Optional[AsyncOpenAI] = None,
+        model: str = "gpt-4o",
+        chunk_token_budget: int = 24000,
+        max_concurrency: int = 8,
+        cache: Optional[SummaryCache] = None,
+    ) -> None:
         self.logger = logger
-        self._client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-        self._model = "gpt-4o"
-
-    def _complete(self, prompt: str) -> str:
-        response = self._client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                    ],
-                }
-            ],
-        )
+        self._client = client or AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self._model = model
+        self.chunk_token_budget = chunk_token_budget
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+
+    @staticmethod
+    def _build_messages(prompt: str) -> List[dict]:
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                ],
+            }
+        ]
+
+    def _used_tokens(self, prompt: str, output: str, usage=None) -> int:
+        if usage is not None:
+            return usage.total_tokens
+
+        return self.estimate_tokens(prompt) + self.estimate_tokens(output)
+
+    async def _request(self, prompt: str) -> Optional[CacheEntry]:
+        started = time.perf_counter()
+        async with self._semaphore:
+            requested = time.perf_counter()
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self._model,
+                    messages=self._build_messages(prompt),
+                )
+            except Exception:
+                OPENAI_REQUEST_ERRORS.labels("complete").inc()
+                raise
+            finally:
+                OPENAI_REQUEST_SECONDS.labels("complete").observe(time.perf_counter() - requested)
 
         if len(response.choices) == 0:
+            return None
+
+        content = response.choices[0].message.content
+        tokens = self._used_tokens(prompt, content, getattr(response, "usage", None))
+        OPENAI_TOKENS.labels("complete").inc(tokens)
+
+        return CacheEntry(
+            value=content,
+            tokens=tokens,
+            seconds=time.perf_counter() - started,
+            created_at=time.time(),
+        )
+
+    async def _complete(self, prompt: str) -> str:
+        if self.cache is not None:
+            value = await self.cache.get_or_compute(self.cache.make_key(self._model, prompt), lambda: self._request(prompt))
+        else:
+            entry = await self._request(prompt)
+            value = None if entry is None else entry.value
+
+        if value is None:
             return "Fail to summarize"
-        
-        return response.choices[0].message.content
 
-    def summarize(self, utterances: List[Utterance]) -> str:
-        dialogue: List[dict] = list(map(lambda x: x.model_dump(), utterances))    
-        summarize_prompt = PromptGenerator.get_summarize_prompt(json.dumps(dialogue))
-        return self._complete(summarize_prompt)
+        return value
+
+    async def _complete_stream(self, prompt: str) -> AsyncIterator[str]:
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(self._model, prompt)
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+            self.cache.record_miss()
+
+        started = time.perf_counter()
+        tokens: List[str] = []
+        async with self._semaphore:
+            requested = time.perf_counter()
+            try:
+                stream = await self._client.chat.completions.create(
+                    model=self._model,
+                    messages=self._build_messages(prompt),
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if len(chunk.choices) == 0 or not chunk.choices[0].delta.content:
+                        continue
+
+                    tokens.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            except Exception:
+                OPENAI_REQUEST_ERRORS.labels("stream").inc()
+                raise
+            finally:
+                # 받는 쪽이 읽는 시간도 들어가므로 마지막 token 까지의 시간이다.
+                OPENAI_REQUEST_SECONDS.labels("stream").observe(time.perf_counter() - requested)
+
+        content = "".join(tokens)
+        used_tokens = self._used_tokens(prompt, content)
+        OPENAI_TOKENS.labels("stream").inc(used_tokens)
+
+        if key is not None and tokens:
+            await self.cache.put(key, CacheEntry(
+                value=content,
+                tokens=used_tokens,
+                seconds=time.perf_counter() - started,
+                created_at=time.time(),
+            ))
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # 한글은 대략 글자당 1 token, 영문은 4글자당 1 token 이라 utf-8 byte 수 / 3 으로 넉넉하게 잡는다.
+        return len(text.encode("utf-8")) // 3 + 1
+
+    def _split_windows(self, items: List[str]) -> List[List[str]]:
+        windows: List[List[str]] = [[]]
+        tokens = 0
+
+        for item in items:
+            item_tokens = self.estimate_tokens(item)
+            if windows[-1] and tokens + item_tokens > self.chunk_token_budget:
+                windows.append([])
+                tokens = 0
+
+            windows[-1].append(item)
+            tokens += item_tokens
+
+        return windows
+
+    async def _summarize_window(self, window: List[str], index: int) -> str:
+        prompt = PromptGenerator.get_chunk_summarize_prompt(f"[{', '.join(window)}]", index)
+        return await self._complete(prompt)
+
+    @staticmethod
+    def _dump_utterances(utterances: List[Utterance]) -> List[str]:
+        # 공백만 다른 발언은 같은 prompt 가 되도록 정규화해서 cache key 가 흔들리지 않게 한다.
+        return [
+            json.dumps(
+                {**x.model_dump(), "speaker": x.speaker.strip(), "text": " ".join(x.text.split())},
+                ensure_ascii=False,
+            )
+            for x in utterances
+        ]
+
+    async def summarize_partials(self, utterances: List[Utterance], start_index: int = 1) -> List[str]:
+        windows = self._split_windows(self._dump_utterances(utterances))
+
+        return list(await asyncio.gather(*(
+            self._summarize_window(window, start_index + i) for i, window in enumerate(windows)
+        )))
+
+    async def _merge_until_fits(self, summaries: List[str]) -> List[str]:
+        # 구간 요약을 합친 것도 budget 을 넘으면 budget 단위로 묶어서 한 단계 더 합친다.
+        while len(self._split_windows(summaries)) > 1:
+            groups = self._split_windows(summaries)
+            if len(groups) == len(summaries):
+                # 요약 하나하나가 budget 보다 크면 둘씩이라도 묶어야 단계마다 개수가 줄어든다.
+                groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            self.logger.info(f"Merging {len(summaries)} partial summaries into {len(groups)}")
+            summaries = await asyncio.gather(*(
+                self._complete(PromptGenerator.get_merge_summary_prompt(self._join_summaries(group)))
+                for group in groups
+            ))
+
+        return summaries
+
+    async def reduce_summaries(self, summaries: List[str]) -> str:
+        summaries = await self._merge_until_fits(summaries)
+
+        return await self._complete(PromptGenerator.get_reduce_prompt(self._join_summaries(summaries)))
+
+    async def reduce_summaries_stream(self, summaries: List[str]) -> AsyncIterator[str]:
+        # 중간 병합은 한번에 받고, 사용자가 읽는 마지막 요약만 token 단위로 흘려보낸다.
+        summaries = await self._merge_until_fits(summaries)
+
+        async for token in self._complete_stream(PromptGenerator.get_reduce_prompt(self._join_summaries(summaries))):
+            yield token
+
+    @staticmethod
+    def _join_summaries(summaries: List[str]) -> str:
+        return "\n".join(f"-구간-\n{summary}" for summary in summaries)
+
+    async def summarize(self, utterances: List[Utterance]) -> str:
+        items: List[str] = self._dump_utterances(utterances)
+        windows = self._split_windows(items)
+
+        if len(windows) <= 1:
+            summarize_prompt = PromptGenerator.get_summarize_prompt(f"[{', '.join(items)}]")
+            return await self._complete(summarize_prompt)
+
+        self.logger.info(f"Summarizing {len(items)} utterances in {len(windows)} windows")
+        partial_summaries = await asyncio.gather(*(
+            self._summarize_window(window, i + 1) for i, window in enumerate(windows)
+        ))
+
+        return await self.reduce_summaries(list(partial_summaries))
+
+    async def summarize_stream(self, utterances: List[Utterance]) -> AsyncIterator[str]:
+        items: List[str] = self._dump_utterances(utterances)
+        windows = self._split_windows(items)
+
+        if len(windows) <= 1:
+            async for token in self._complete_stream(PromptGenerator.get_summarize_prompt(f"[{', '.join(items)}]")):
+                yield token
+            return
+
+        partial_summaries = await self.summarize_partials(utterances)
+        async for token in self.reduce_summaries_stream(partial_summaries):
+            yield token
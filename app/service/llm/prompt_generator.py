@@ -18,3 +18,41 @@ class PromptGenerator:
         -json-
         {text}
         """
+
+    @staticmethod
+    def get_chunk_summarize_prompt(text: str, index: int) -> str:
+        return f"""
+        너는 긴 회의록의 일부를 요약해야해. 이 부분은 회의의 {index}번째 구간이야.
+        회의에서 나온 발화는 하단의 json의 list로 주어지고, 발화가 이루어진 순서대로 정렬되어 있어.
+        json 안의 key값들은 timestamp, speaker, text가 들어있어.
+        회의록 json의 시작은 -json-으로 시작하고, 그 하단의 내용을 참조하면 돼.
+
+        이 구간의 요약은 나중에 다른 구간의 요약과 합쳐질 거야.
+        발언한 참석자 목록, 논의된 안건, 결정된 사항과 후속 조치를 빠짐없이 발화 순서대로 간결하게 정리해줘.
+        비속어와 같은 안좋은 말은 절대 적어서는 안되고, 되도록 정중하고 나이스한 표현으로 작성해줘.
+
+        -json-
+        {text}
+        """
+
+    @staticmethod
+    def get_merge_summary_prompt(summaries: str) -> str:
+        return f"""
+        아래는 한 회의를 시간 순서대로 나눈 구간별 요약이야. 각 구간은 -구간- 으로 구분되어 있어.
+        구간별 요약을 하나로 합쳐서, 발언한 참석자 목록, 논의된 안건, 결정된 사항과 후속 조치를
+        빠짐없이 시간 순서대로 간결하게 정리해줘.
+
+        {summaries}
+        """
+
+    @staticmethod
+    def get_reduce_prompt(summaries: str) -> str:
+        return f"""
+        너는 회의록을 요약해야해. 회의가 길어서 시간 순서대로 나눈 구간별 요약이 주어질거야.
+        각 구간은 -구간- 으로 구분되어 있고, 구간의 순서가 곧 회의 진행 순서야.
+
+        제목, 참석자, 회의 요약, 주요 논의 사항으로 구분해서 작성해줘. 아래 구간별 요약을 참고해서 하나의 회의록으로 요약해줘.
+        비속어와 같은 안좋은 말은 절대 적어서는 안되고, 되도록 정중하고 나이스한 표현으로 작성해줘.
+
+        {summaries}
+        """
@@ -0,0 +1,170 @@
+import json
+import time
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from .gpt_service import GptServiceManager
+from ...provider.database_manager import DatabaseManager
+from ...model.utterance import Utterance
+from ...util.time_util import TimeUtil
+
+
+UtteranceLoader = Callable[[], Awaitable[List[Utterance]]]
+
+
+class RollingSummaryService:
+    """Keeps a running summary of the meeting while it is in progress.
+
+    One instance follows one meeting. Every ``interval`` seconds the finalized
+    utterances that arrived since the last pass are summarized once
+    ``block_size`` of them have piled up, and the block summaries are merged
+    into the live minutes. The state is stored per meeting in the
+    ``summary_state`` table so a restart does not lose the blocks already
+    paid for, and ``summarize()`` only has to fold in the last delta.
+    """
+
+    def __init__(
+        self,
+        gpt_service: GptServiceManager,
+        db_manager: DatabaseManager,
+        load_utterances: UtteranceLoader,
+        meeting_id: int,
+        block_size: int = 20,
+        interval: float = 30.0,
+    ) -> None:
+        self.gpt_service = gpt_service
+        self.db_manager = db_manager
+        self._load_utterances = load_utterances
+        self.meeting_id = meeting_id
+        self.block_size = block_size
+        self.interval = interval
+
+        self.partial_summaries: List[str] = []
+        self.summarized_count = 0
+        self.summary = ""
+        self.updated_at: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    async def load(self) -> None:
+        rows = await self.db_manager.select_summary_state_table(self.meeting_id)
+        if len(rows) == 0:
+            return
+
+        state = rows[0]
+        self.partial_summaries = json.loads(state["partial_summaries"] or "[]")
+        self.summary = state["summary"] or ""
+        self.updated_at = state["updated_at"]
+        # qa_list 는 DB 에서 복구되지만 기록되기 전에 죽었다면 저장된 개수보다 짧을 수 있다.
+        # 저장된 구간 요약은 유지하고 지금 memory 에 있는 발언 수를 넘지 않게 센다.
+        utterances = await self._load_utterances()
+        self.summarized_count = min(state["summarized_count"] or 0, len(utterances))
+        self.logger.info(
+            f"#{self.meeting_id} Rolling summary restored : {len(self.partial_summaries)} blocks, {self.summarized_count} utterances"
+        )
+
+    async def reset(self, save: bool = True) -> None:
+        # 발언이 통째로 바뀌면 이전 발언으로 만든 구간 요약과 개수는 맞지 않으므로 처음부터 다시 요약한다.
+        async with self._lock:
+            self.partial_summaries = []
+            self.summarized_count = 0
+            self.summary = ""
+            self.updated_at = TimeUtil.convert_unixtime_to_timestamp(int(time.time()))
+            if save:
+                await self._save()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"rolling-summary-{self.meeting_id}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.update()
+            except Exception as e:
+                self.logger.error(f"#{self.meeting_id} Rolling summary update failed : {e}")
+
+    async def update(self, force: bool = False) -> bool:
+        """Summarizes the pending utterances if there are enough of them (or any, with ``force``)."""
+        async with self._lock:
+            utterances = await self._load_utterances()
+            pending = utterances[self.summarized_count:]
+            if len(pending) == 0 or (not force and len(pending) < self.block_size):
+                return False
+
+            partials = await self.gpt_service.summarize_partials(pending, start_index=len(self.partial_summaries) + 1)
+            summary = await self.gpt_service.reduce_summaries(self.partial_summaries + partials)
+            await self._apply(utterances, partials, summary)
+
+            return True
+
+    async def summarize(self) -> str:
+        await self.update(force=True)
+
+        return self.summary
+
+    async def summarize_stream(self) -> AsyncIterator[str]:
+        """Like ``summarize()`` but yields the merged summary token by token."""
+        async with self._lock:
+            utterances = await self._load_utterances()
+            pending = utterances[self.summarized_count:]
+            if len(pending) == 0:
+                if self.summary:
+                    yield self.summary
+                return
+
+            partials = await self.gpt_service.summarize_partials(pending, start_index=len(self.partial_summaries) + 1)
+            tokens: List[str] = []
+            async for token in self.gpt_service.reduce_summaries_stream(self.partial_summaries + partials):
+                tokens.append(token)
+                yield token
+
+            await self._apply(utterances, partials, "".join(tokens))
+
+    async def _apply(self, utterances: List[Utterance], partials: List[str], summary: str) -> None:
+        pending = len(utterances) - self.summarized_count
+        self.partial_summaries.extend(partials)
+        self.summarized_count = len(utterances)
+        self.summary = summary
+        self.updated_at = TimeUtil.convert_unixtime_to_timestamp(int(time.time()))
+        await self._save()
+
+        self.logger.info(f"#{self.meeting_id} Rolling summary updated : {pending} new utterances, {len(self.partial_summaries)} blocks")
+
+    async def status(self) -> dict:
+        utterances = await self._load_utterances()
+
+        return {
+            "summary": self.summary,
+            "updated_at": self.updated_at,
+            "blocks": len(self.partial_summaries),
+            "summarized_utterances": self.summarized_count,
+            "pending_utterances": max(0, len(utterances) - self.summarized_count),
+        }
+
+    async def _save(self) -> None:
+        await self.db_manager.upsert_summary_state_table(
+            {
+                "meeting_id": self.meeting_id,
+                "summarized_count": self.summarized_count,
+                "partial_summaries": json.dumps(self.partial_summaries, ensure_ascii=False),
+                "summary": self.summary,
+                "updated_at": self.updated_at,
+            }
+        )
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Optional
+
+
+@dataclass
+class CacheEntry:
+    value: str
+    tokens: int
+    seconds: float
+    created_at: float
+
+
+Compute = Callable[[], Awaitable[Optional[CacheEntry]]]
+
+
+class SummaryCache:
+    """Content-addressed cache for LLM completions.
+
+    Entries are keyed on a hash of everything that determines the output
+    (model and the rendered prompt, i.e. template plus normalized
+    utterances), kept in an in-memory LRU with a TTL and optionally mirrored
+    to ``directory`` so they survive restarts. Concurrent requests for the
+    same key share one upstream call.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 7 * 24 * 3600, directory: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.saved_seconds = 0.0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.created_at > self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"Broken summary cache file {key} : {e}")
+            return None
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record_hit(self, entry: CacheEntry) -> None:
+        self.saved_tokens += entry.tokens
+        self.saved_seconds += entry.seconds
+
+    def record_miss(self) -> None:
+        """Counts a lookup whose value the caller is going to compute itself."""
+        self.misses += 1
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None and not self._expired(entry):
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            self._record_hit(entry)
+            return entry.value
+        self._entries.pop(key, None)
+
+        if self.directory is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None and not self._expired(entry):
+                self._remember(key, entry)
+                self.disk_hits += 1
+                self._record_hit(entry)
+                return entry.value
+
+        return None
+
+    async def put(self, key: str, entry: CacheEntry) -> None:
+        self._remember(key, entry)
+        if self.directory is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, entry)
+            except OSError as e:
+                self.logger.warning(f"Fail to write summary cache file {key} : {e}")
+
+    async def get_or_compute(self, key: str, compute: Compute) -> Optional[str]:
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        if key in self._inflight:
+            self.coalesced += 1
+            value = await asyncio.shield(self._inflight[key])
+            if key in self._entries:
+                self._record_hit(self._entries[key])
+            return value
+
+        self.record_miss()
+        future = asyncio.get_running_loop().create_future()
+        # 기다리는 요청이 없을 때 실패해도 "exception was never retrieved" 가 찍히지 않게 한다.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            entry = await compute()
+            if entry is not None:
+                await self.put(key, entry)
+            future.set_result(entry.value if entry is not None else None)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        return future.result()
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits + self.coalesced
+        requests = hits + self.misses
+
+        return {
+            "entries": len(self._entries),
+            "requests": requests,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_ratio": hits / requests if requests else 0.0,
+            "saved_tokens": self.saved_tokens,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
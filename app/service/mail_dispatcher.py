@@ -0,0 +1,305 @@
+import time
+import smtplib
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .mail_service import MailServiceManager
+from ..provider.database_manager import DatabaseManager
+from ..util.time_util import TimeUtil
+from ..util.metrics import REGISTRY
+
+SMTP_SEND_SECONDS = REGISTRY.histogram(
+    "smtp_send_seconds", "One SMTP transaction, including a reconnect when the pooled connection was dropped."
+)
+SMTP_SEND_ERRORS = REGISTRY.counter("smtp_send_errors_total", "SMTP transactions that raised.")
+
+
+@dataclass
+class OutboxItem:
+    id: int
+    job_id: int
+    address: str
+    attempts: int
+
+
+class MailDispatcher:
+    """Delivers queued mail in the background over a small SMTP connection pool.
+
+    Every recipient of a job is a row in ``mail_outbox``, so pending mail
+    survives a restart. ``pool_size`` workers each own one SMTP connection,
+    open it lazily and reopen it when the server dropped it. A failed
+    recipient is retried with exponential backoff until ``max_attempts``;
+    5xx replies are not retried.
+
+    The minutes of a job are encoded once and the same bytes go to every
+    recipient until none of its recipients is pending any more. With ``recipients_per_transaction`` above 1, up to that many
+    recipients share one SMTP transaction with the To header hidden.
+    """
+
+    def __init__(
+        self,
+        mail_service: MailServiceManager,
+        db_manager: DatabaseManager,
+        pool_size: int = 2,
+        max_attempts: int = 5,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        recipients_per_transaction: int = 1,
+    ) -> None:
+        self.mail_service = mail_service
+        self.db_manager = db_manager
+        self.pool_size = pool_size
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.recipients_per_transaction = recipients_per_transaction
+
+        self._queue: asyncio.Queue[List[OutboxItem]] = asyncio.Queue()
+        self._connections: List[Optional[smtplib.SMTP]] = [None] * pool_size
+        self._workers: List[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+        self._payloads: dict[int, bytes] = {}
+        # job 마다 아직 sent 나 failed 가 되지 않은 outbox row 의 id. 비면 payload 를 버린다.
+        self._unfinished: dict[int, set[int]] = defaultdict(set)
+
+        self.sent = 0
+        self.transactions = 0
+        self.failed = 0
+        self.retried = 0
+        self.reconnects = 0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    async def start(self) -> None:
+        rows = await self.db_manager.select_pending_mail_outbox_table()
+        jobs: dict[int, List[dict]] = defaultdict(list)
+        for row in rows:
+            jobs[row["job_id"]].append(row)
+        for job_rows in jobs.values():
+            self._enqueue(job_rows)
+        if rows:
+            self.logger.info(f"Restored {len(rows)} pending mails")
+
+        self._workers = [
+            asyncio.create_task(self._work(slot), name=f"mail-dispatcher-{slot}") for slot in range(self.pool_size)
+        ]
+
+    async def stop(self) -> None:
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for slot in range(self.pool_size):
+            await asyncio.to_thread(self._close, slot)
+
+    async def submit(self, content: str, addresses: List[str]) -> int:
+        now = TimeUtil.convert_unixtime_to_timestamp(int(time.time()))
+        job_id = await self.db_manager.insert_mail_job_table(
+            {"subject": "회의록", "content": content, "created_at": now}, addresses
+        )
+        if addresses:
+            self._payloads[job_id] = await asyncio.to_thread(self.mail_service.render_minutes, content)
+
+        self._enqueue(await self.db_manager.select_mail_outbox_table_with_job_id(job_id))
+        self.logger.info(f"Mail job {job_id} queued for {len(addresses)} recipients")
+
+        return job_id
+
+    def _enqueue(self, rows: List[dict]) -> None:
+        items = [OutboxItem(row["id"], row["job_id"], row["address"], row["attempts"]) for row in rows]
+        for item in items:
+            self._unfinished[item.job_id].add(item.id)
+        for i in range(0, len(items), self.recipients_per_transaction):
+            self._queue.put_nowait(items[i:i + self.recipients_per_transaction])
+
+    async def job_status(self, job_id: int) -> Optional[dict]:
+        jobs = await self.db_manager.select_mail_job_table_with_id(job_id)
+        if len(jobs) == 0:
+            return None
+
+        rows = await self.db_manager.select_mail_outbox_table_with_job_id(job_id)
+        counts = Counter(row["status"] for row in rows)
+        if counts["pending"]:
+            status = "in_progress"
+        elif counts["failed"] == 0:
+            status = "done"
+        else:
+            status = "failed" if counts["sent"] == 0 else "partially_failed"
+
+        return {
+            "job_id": job_id,
+            "status": status,
+            "created_at": jobs[0]["created_at"],
+            "total": len(rows),
+            "sent": counts["sent"],
+            "pending": counts["pending"],
+            "failed": counts["failed"],
+            "recipients": [
+                {
+                    "address": row["address"],
+                    "status": row["status"],
+                    "attempts": row["attempts"],
+                    "last_error": row["last_error"],
+                }
+                for row in rows
+            ],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "connected": sum(smtp is not None for smtp in self._connections),
+            "queued": self._queue.qsize(),
+            "cached_payloads": len(self._payloads),
+            "waiting_retry": len(self._retries),
+            "sent": self.sent,
+            "transactions": self.transactions,
+            "failed": self.failed,
+            "retried": self.retried,
+            "reconnects": self.reconnects,
+        }
+
+    async def _work(self, slot: int) -> None:
+        while True:
+            batch = await self._queue.get()
+            try:
+                await self._deliver(slot, batch)
+            except Exception as e:
+                # DB 오류 등으로 상태를 못 남긴 경우라 row 는 pending 으로 남고 재시작 때 다시 보낸다.
+                self.logger.error(f"Mail dispatcher failed to handle {[item.address for item in batch]} : {e}")
+                for item in batch:
+                    self._finish(item)
+
+    def _finish(self, item: OutboxItem) -> None:
+        unfinished = self._unfinished.get(item.job_id)
+        if unfinished is None:
+            return
+
+        unfinished.discard(item.id)
+        if not unfinished:
+            del self._unfinished[item.job_id]
+            self._payloads.pop(item.job_id, None)
+
+    async def _payload(self, job_id: int) -> bytes:
+        if job_id not in self._payloads:
+            content = (await self.db_manager.select_mail_job_table_with_id(job_id))[0]["content"]
+            self._payloads[job_id] = await asyncio.to_thread(self.mail_service.render_minutes, content)
+
+        return self._payloads[job_id]
+
+    async def _deliver(self, slot: int, batch: List[OutboxItem]) -> None:
+        payload = await self._payload(batch[0].job_id)
+
+        started = time.perf_counter()
+        try:
+            refused = await asyncio.to_thread(self._send, slot, [item.address for item in batch], payload)
+        except Exception as e:
+            SMTP_SEND_ERRORS.inc()
+            for item in batch:
+                await self._fail(item, e)
+            return
+        finally:
+            SMTP_SEND_SECONDS.observe(time.perf_counter() - started)
+
+        for item in batch:
+            if item.address in refused:
+                await self._fail(item, smtplib.SMTPRecipientsRefused({item.address: refused[item.address]}))
+                continue
+
+            item.attempts += 1
+            self.sent += 1
+            await self._update(item, "sent", None)
+            self._finish(item)
+
+    async def _fail(self, item: OutboxItem, e: Exception) -> None:
+        item.attempts += 1
+        if self._is_permanent(e) or item.attempts >= self.max_attempts:
+            self.failed += 1
+            self.logger.error(f"{item.address} -> Mail send was failed. Error is {e}")
+            await self._update(item, "failed", str(e))
+            self._finish(item)
+            return
+
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (item.attempts - 1))
+        self.retried += 1
+        self.logger.warning(f"{item.address} -> Mail send will be retried in {delay:.0f}s. Error is {e}")
+        await self._update(item, "pending", str(e))
+        self._retry_later(item, delay)
+
+    def _retry_later(self, item: OutboxItem, delay: float) -> None:
+        def retry():
+            self._retries.discard(handle)
+            self._queue.put_nowait([item])
+
+        handle = asyncio.get_running_loop().call_later(delay, retry)
+        self._retries.add(handle)
+
+    async def _update(self, item: OutboxItem, status: str, last_error: Optional[str]) -> None:
+        await self.db_manager.update_mail_outbox_table(
+            {
+                "id": item.id,
+                "status": status,
+                "attempts": item.attempts,
+                "last_error": last_error,
+                "updated_at": TimeUtil.convert_unixtime_to_timestamp(int(time.time())),
+            }
+        )
+
+    def _send(self, slot: int, addresses: List[str], payload: bytes) -> dict:
+        # worker thread 에서 실행된다. slot 의 연결은 그 worker 만 쓴다.
+        self.transactions += 1
+        smtp = self._connections[slot]
+        if smtp is not None:
+            try:
+                return self.mail_service.send_rendered(smtp, addresses, payload)
+            except Exception as e:
+                if not self._is_connection_error(e):
+                    raise
+                # 오래 쉬던 연결은 서버가 끊었을 수 있으니 새 연결로 한 번 더 보낸다.
+                self._close(slot)
+
+        self._connections[slot] = self.mail_service.connect()
+        self.reconnects += 1
+        try:
+            return self.mail_service.send_rendered(self._connections[slot], addresses, payload)
+        except Exception as e:
+            if self._is_connection_error(e):
+                self._close(slot)
+            raise
+
+    def _close(self, slot: int) -> None:
+        smtp, self._connections[slot] = self._connections[slot], None
+        if smtp is None:
+            return
+
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    @staticmethod
+    def _is_connection_error(e: Exception) -> bool:
+        # SMTPException 도 OSError 를 상속하므로 socket 오류와 구분해야 한다.
+        return isinstance(e, smtplib.SMTPServerDisconnected) or (
+            isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+        )
+
+    @staticmethod
+    def _is_permanent(e: Exception) -> bool:
+        if isinstance(e, smtplib.SMTPRecipientsRefused):
+            return all(code >= 500 for code, _ in e.recipients.values())
+        if isinstance(e, smtplib.SMTPAuthenticationError):
+            return False
+        if isinstance(e, smtplib.SMTPResponseException):
+            return e.smtp_code >= 500
+
+        return False
@@ -1,8 +1,9 @@
 import smtplib
-import re
+import html
 import logging
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email import policy
+from email.message import EmailMessage
+from typing import Dict, List
 
 
 class MailServiceManager:
@@ -11,34 +12,73 @@ class MailServiceManager:
         self, 
         account: str, 
         app_number: str,
+        host: str = "smtp.gmail.com",
+        port: int = 465,
+        use_ssl: bool = True,
+        timeout: float = 30.0,
     ):
         self._account = account
+        self._app_number = app_number
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.timeout = timeout
         self.logger = logging.getLogger("uvicorn")
         self.logger.setLevel(logging.INFO)
-        
-        self.smtp = smtplib.SMTP_SSL("smtp.gmail.com", 465)
-        self.smtp.login(account, app_number)
-
-    def login(self, account, app_number):
-        self.smtp.login(account, app_number)
-
-    def send_email(self, msg: MIMEMultipart):
-        reg = "^[a-zA-Z0-9.+_-]+@[a-zA-Z0-9]+\.[a-zA-Z]{2,3}$"
-        address: str = msg.get("To")
-
-        try:
-            self.smtp.sendmail(self._account, address, msg.as_string())
-            self.logger.info(f"{address} -> Mail send is successful.")
-        except Exception as e:
-            self.logger.error(f"{address} -> Mail send was failed. Error is {e}")
-    
-    def build_email(self, address: str, content: str):
-        msg = MIMEMultipart()
+
+    def connect(self) -> smtplib.SMTP:
+        # 연결은 dispatcher 의 worker 가 필요할 때 열고, 끊기면 다시 연다.
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+
+        if self._app_number:
+            smtp.login(self._account, self._app_number)
+
+        return smtp
+
+    def render_minutes(self, content: str) -> bytes:
+        """Encodes the minutes once as plain text plus HTML, without a To header.
+
+        The result is reused for every recipient; ``send_rendered`` prepends
+        the To header per transaction.
+        """
+        msg = EmailMessage(policy=policy.SMTP)
         msg["Subject"] = "회의록"
         msg["From"] = self._account
-        msg["To"] = address
-        
-        content_part = MIMEText(content, "plain")
-        msg.attach(content_part)
+        msg.set_content(content, cte="base64")
+        msg.add_alternative(self._to_html(content), subtype="html")
+
+        return msg.as_bytes()
+
+    def send_rendered(self, smtp: smtplib.SMTP, addresses: List[str], rendered: bytes) -> Dict[str, tuple]:
+        # 여러 명에게 한 transaction 으로 보낼 때는 서로의 주소가 보이지 않게 To 를 비워 둔다.
+        to = addresses[0] if len(addresses) == 1 else "undisclosed-recipients:;"
+        refused = smtp.sendmail(self._account, addresses, b"To: " + to.encode("utf-8") + b"\r\n" + rendered)
+        self.logger.info(f"{len(addresses) - len(refused)} recipients -> Mail send is successful.")
+
+        return refused
+
+    @staticmethod
+    def _to_html(content: str) -> str:
+        # 요약은 "- " 로 시작하는 항목과 "제목:" 같은 머리줄로 되어 있어서 목록과 문단만 구분한다.
+        blocks: List[str] = []
+        items: List[str] = []
+
+        for line in content.splitlines():
+            stripped = line.strip()
+            if stripped.startswith(("- ", "* ", "• ")):
+                items.append(f"<li>{html.escape(stripped[2:])}</li>")
+                continue
+
+            if items:
+                blocks.append(f"<ul>{''.join(items)}</ul>")
+                items = []
+            if stripped:
+                blocks.append(f"<p>{html.escape(stripped)}</p>")
+
+        if items:
+            blocks.append(f"<ul>{''.join(items)}</ul>")
 
-        return msg
+        return f"<html><body>{''.join(blocks)}</body></html>"
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+from .chat_service import ChatServiceManager
+from .audio_stream_service import AudioStreamServiceManager
+from .transcript_writer import TranscriptWriter
+from .broker.base import MessageBroker
+from .llm.rolling_summary_service import RollingSummaryService
+from ..model.utterance import Utterance
+
+
+@dataclass
+class MeetingRoom:
+    meeting_id: int
+    chat: ChatServiceManager
+    audio: AudioStreamServiceManager
+    rolling_summary: RollingSummaryService
+    transcript_writer: TranscriptWriter
+    broker: MessageBroker
+    # 마지막으로 받은 (화자, 멈춤 여부). 같은 상태를 interim 마다 다시 보내지 않는다.
+    _pause_state: Optional[tuple[int, bool]] = field(default=None, repr=False)
+    _reloading: set[asyncio.Task] = field(default_factory=set, repr=False)
+
+    @property
+    def utterance_channel(self) -> str:
+        return f"meeting:{self.meeting_id}:utterance"
+
+    @property
+    def audio_channel(self) -> str:
+        return f"meeting:{self.meeting_id}:audio"
+
+    async def load(self) -> None:
+        # 발언 수를 보고 요약 상태를 맞추므로 발언을 먼저 복구한다.
+        self.chat.qa_list[:] = await self.transcript_writer.load(self.meeting_id)
+        await self.rolling_summary.load()
+
+    def start(self) -> None:
+        self.broker.subscribe(self.utterance_channel, self._on_utterance)
+        self.broker.subscribe(self.audio_channel, self._on_pause)
+        self.rolling_summary.start()
+
+    async def stop(self) -> None:
+        self.broker.unsubscribe(self.utterance_channel, self._on_utterance)
+        self.broker.unsubscribe(self.audio_channel, self._on_pause)
+        await self.rolling_summary.stop()
+        await self.chat.drain()
+        self.chat.end_meeting()
+
+    async def add_utterance(self, utterance: Utterance) -> None:
+        self.chat.qa_list.append(utterance)
+        self.transcript_writer.append(self.meeting_id, utterance)
+        # 저장은 발언을 받은 worker 만 하고, 다른 worker 는 qa_list 에만 붙인다.
+        await self.broker.publish(
+            self.utterance_channel, {"origin": self.broker.node_id, "utterance": utterance.model_dump()}
+        )
+
+    async def replace_utterances(self) -> None:
+        # qa table 을 통째로 바꾼 뒤에 부른다. 다른 worker 의 room 도 DB 에서 다시 읽게 한다.
+        await self._reload_utterances()
+        await self.rolling_summary.reset()
+        await self.broker.publish(self.utterance_channel, {"origin": self.broker.node_id, "reload": True})
+
+    async def pause_listeners(self, speaker: int, paused: bool) -> None:
+        if self._pause_state == (speaker, paused):
+            return
+
+        await self.broker.publish(self.audio_channel, {"speaker": speaker, "paused": paused})
+
+    async def _reload_utterances(self) -> None:
+        self.chat.qa_list[:] = await self.transcript_writer.load(self.meeting_id)
+
+    async def _on_replaced(self) -> None:
+        await self._reload_utterances()
+        await self.rolling_summary.reset(save=False)
+
+    def _on_utterance(self, message: dict) -> None:
+        if message["origin"] == self.broker.node_id:
+            return
+
+        if message.get("reload"):
+            # 요약 상태는 보낸 worker 가 이미 초기화해서 저장했으므로 memory 만 맞춘다.
+            task = asyncio.create_task(self._on_replaced(), name=f"meeting-reload-{self.meeting_id}")
+            self._reloading.add(task)
+            task.add_done_callback(self._reloading.discard)
+        else:
+            self.chat.qa_list.append(Utterance(**message["utterance"]))
+
+    def _on_pause(self, message: dict) -> None:
+        # 다른 worker 에서 말하는 중이어도 이 worker 의 마이크들을 멈춘다.
+        self._pause_state = (message["speaker"], message["paused"])
+        for attendee_id, stream in list(self.audio.stream_status.items()):
+            if attendee_id != message["speaker"]:
+                stream.paused = message["paused"]
+
+
+class MeetingRoomManager:
+    """Keeps the chat, audio and rolling summary state of every open meeting.
+
+    Rooms are created on first use with ``create_room`` and restore their
+    transcript and rolling summary from the database, so meetings can be served side by
+    side without sharing connections or transcripts. Only meetings for which
+    ``meeting_exists`` is true get a room, and ``finish`` closes the room of
+    an ended meeting in every worker.
+    """
+
+    def __init__(
+        self,
+        create_room: Callable[[int], MeetingRoom],
+        meeting_exists: Callable[[int], Awaitable[bool]],
+        broker: MessageBroker,
+        channel: str = "meeting_rooms",
+    ) -> None:
+        self._create_room = create_room
+        self._meeting_exists = meeting_exists
+        self.broker = broker
+        self.channel = channel
+        self.rooms: dict[int, MeetingRoom] = {}
+        self._lock = asyncio.Lock()
+        self._closing: set[asyncio.Task] = set()
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    def start(self) -> None:
+        self.broker.subscribe(self.channel, self._on_finish)
+
+    async def get(self, meeting_id: int) -> Optional[MeetingRoom]:
+        if meeting_id in self.rooms:
+            return self.rooms[meeting_id]
+
+        async with self._lock:
+            if meeting_id not in self.rooms:
+                # 없는 회의 id 로 room 을 만들면 닫을 일이 없어서 계속 쌓인다.
+                if not await self._meeting_exists(meeting_id):
+                    return None
+
+                room = self._create_room(meeting_id)
+                await room.load()
+                room.start()
+                self.rooms[meeting_id] = room
+                self.logger.info(f"Meeting room #{meeting_id} opened ({len(self.rooms)} rooms)")
+
+        return self.rooms[meeting_id]
+
+    async def close(self, meeting_id: int) -> None:
+        room = self.rooms.pop(meeting_id, None)
+        if room is None:
+            return
+
+        await room.stop()
+        self.logger.info(f"Meeting room #{meeting_id} closed ({len(self.rooms)} rooms)")
+
+    async def finish(self, meeting_id: int) -> None:
+        # 참석자들이 다른 worker 에 붙어 있을 수 있으므로 모든 worker 가 자기 room 을 닫게 한다.
+        # 같은 broker 로 먼저 보낸 종료 알림이 전달된 뒤에 받으므로 알림을 잃지 않는다.
+        await self.broker.publish(self.channel, {"meeting_id": meeting_id})
+
+    async def close_all(self) -> None:
+        self.broker.unsubscribe(self.channel, self._on_finish)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+        for meeting_id in list(self.rooms):
+            await self.close(meeting_id)
+
+    def _on_finish(self, message: dict) -> None:
+        meeting_id = message["meeting_id"]
+        if meeting_id not in self.rooms:
+            return
+
+        task = asyncio.create_task(self.close(meeting_id), name=f"meeting-room-close-{meeting_id}")
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "meeting_id": meeting_id,
+                "chat_connections": len(room.chat.active_connections),
+                "audio_connections": len(room.audio.active_connections),
+                "utterances": len(room.chat.qa_list),
+            }
+            for meeting_id, room in list(self.rooms.items())
+        ]
@@ -0,0 +1,91 @@
+import re
+import asyncio
+import logging
+from typing import BinaryIO, Iterator, List, Optional
+
+from boto3.s3.transfer import TransferConfig
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+
+MB = 1024 * 1024
+
+
+class StorageServiceManager:
+    """Streams files to and from object storage with bounded memory.
+
+    Uploads go through boto3's managed transfer (multipart above
+    ``multipart_threshold``) in a worker thread. Downloads are read from
+    S3 in ``chunk_size`` pieces, so at most a few chunks per request are
+    held in memory whatever the file size.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        chunk_size: int = 1 * MB,
+        multipart_threshold: int = 8 * MB,
+        multipart_chunksize: int = 8 * MB,
+        max_concurrency: int = 4,
+        max_parallel_uploads: int = 4,
+    ) -> None:
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.chunk_size = chunk_size
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+        self._upload_semaphore = asyncio.Semaphore(max_parallel_uploads)
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    async def upload(self, file: BinaryIO, key: str) -> None:
+        async with self._upload_semaphore:
+            await run_in_threadpool(
+                self.s3_client.upload_fileobj, file, self.bucket, key, Config=self.transfer_config
+            )
+        self.logger.info(f"{key} uploaded to {self.bucket}")
+
+    async def upload_files(self, files: List[UploadFile]) -> List[str]:
+        await asyncio.gather(*(self.upload(file.file, file.filename) for file in files))
+
+        return [file.filename for file in files]
+
+    async def get_size(self, key: str) -> int:
+        response = await run_in_threadpool(self.s3_client.head_object, Bucket=self.bucket, Key=key)
+
+        return response["ContentLength"]
+
+    async def open_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        response = await run_in_threadpool(
+            self.s3_client.get_object, Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+
+        # StreamingResponse 가 sync iterator 를 threadpool 에서 돌리므로 event loop 를 막지 않는다.
+        return response["Body"].iter_chunks(self.chunk_size)
+
+    @staticmethod
+    def parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+        """Parses a single ``bytes=`` range into inclusive offsets, or None for the whole file."""
+        if range_header is None:
+            return None
+
+        match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+        if match is None or match.group(1) == match.group(2) == "":
+            raise HTTPException(status_code=416, detail="Invalid range", headers={"Content-Range": f"bytes */{size}"})
+
+        if match.group(1) == "":
+            start, end = max(0, size - int(match.group(2))), size - 1
+        else:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+
+        if start >= size or start > end:
+            raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+
+        return start, end
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+
+@dataclass
+class SttResult:
+    transcript: str
+    is_final: bool
+    # STT session 시작부터 이 결과가 끝나는 지점까지의 audio 길이 (ms)
+    result_end_time: int
+
+
+class SttBackend(ABC):
+    """Streaming speech-to-text engine used by TranscriptionService.
+
+    ``streaming_recognize`` consumes LINEAR16 audio chunks for one session
+    and yields interim and final results. Closing the returned generator
+    must end the session and stop reading from ``audio``.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def streaming_recognize(self, audio: AsyncIterator[bytes]) -> AsyncIterator[SttResult]:
+        ...
+
+    async def close(self) -> None:
+        pass
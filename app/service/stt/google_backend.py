@@ -0,0 +1,63 @@
+from typing import AsyncIterator, Optional
+
+from google.cloud import speech
+
+from .base import SttBackend, SttResult
+
+
+class GoogleSttBackend(SttBackend):
+    name = "google"
+
+    def __init__(
+        self,
+        language_code: str = "ko-KR",
+        sample_rate: int = 16000,
+        model: Optional[str] = "latest_long",
+        interim_results: bool = True,
+    ) -> None:
+        self.config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code=language_code,
+            model=model,
+        )
+        self.streaming_config = speech.StreamingRecognitionConfig(
+            config=self.config, interim_results=interim_results
+        )
+        self._client: Optional[speech.SpeechAsyncClient] = None
+
+    @property
+    def client(self) -> speech.SpeechAsyncClient:
+        # grpc aio channel 은 사용할 event loop 위에서 만들어야 해서 처음 쓸 때 만든다.
+        if self._client is None:
+            self._client = speech.SpeechAsyncClient()
+
+        return self._client
+
+    async def _requests(self, audio: AsyncIterator[bytes]):
+        yield speech.StreamingRecognizeRequest(streaming_config=self.streaming_config)
+
+        async for content in audio:
+            yield speech.StreamingRecognizeRequest(audio_content=content)
+
+    async def streaming_recognize(self, audio: AsyncIterator[bytes]) -> AsyncIterator[SttResult]:
+        responses = await self.client.streaming_recognize(requests=self._requests(audio))
+
+        try:
+            async for response in responses:
+                if not response.results:
+                    continue
+
+                result = response.results[0]
+                if not result.alternatives:
+                    continue
+
+                end_time = result.result_end_time
+                yield SttResult(
+                    transcript=result.alternatives[0].transcript,
+                    is_final=result.is_final,
+                    result_end_time=int(end_time.seconds * 1000 + end_time.microseconds / 1000),
+                )
+        finally:
+            # request generator 가 다음 session 의 audio 를 가져가지 않도록 call 을 끊는다.
+            responses.cancel()
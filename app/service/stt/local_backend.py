@@ -0,0 +1,96 @@
+import time
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from .base import SttBackend, SttResult
+
+
+DEFAULT_SCRIPT = [
+    "안녕하세요 오늘 회의를 시작하겠습니다",
+    "먼저 지난 회의 안건부터 확인하겠습니다",
+    "다음 분기 예산 계획에 대해 논의하겠습니다",
+    "일정 관련해서 질문 있으신 분 계신가요",
+    "오늘 회의는 여기서 마치겠습니다",
+]
+
+
+class LocalSttBackend(SttBackend):
+    """Deterministic offline STT that replays a scripted transcript.
+
+    Every ``ms_per_word`` of received audio reveals the next word of the
+    current sentence as an interim result, and the last word of a sentence
+    is reported as final. Each result is delivered ``latency_ms`` after the
+    audio that produced it was consumed, so the whole websocket -> STT ->
+    broadcast path can be load tested without the cloud.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        script: Optional[List[str]] = None,
+        ms_per_word: int = 300,
+        latency_ms: int = 150,
+        sample_rate: int = 16000,
+        interim_results: bool = True,
+    ) -> None:
+        self.script = script or DEFAULT_SCRIPT
+        self.ms_per_word = ms_per_word
+        self.latency_ms = latency_ms
+        self.bytes_per_ms = sample_rate * 2 // 1000
+        self.interim_results = interim_results
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "LocalSttBackend":
+        with open(path, encoding="utf-8") as f:
+            script = [line.strip() for line in f if line.strip()]
+
+        return cls(script=script, **kwargs)
+
+    def _script_results(self):
+        audio_ms = 0
+        while True:
+            for sentence in self.script:
+                words = sentence.split()
+                for i in range(1, len(words) + 1):
+                    audio_ms += self.ms_per_word
+                    is_final = i == len(words)
+                    if is_final or self.interim_results:
+                        yield audio_ms, SttResult(" ".join(words[:i]), is_final, audio_ms)
+
+    async def _consume(self, audio: AsyncIterator[bytes], pending: asyncio.Queue) -> None:
+        script = self._script_results()
+        next_ms, next_result = next(script)
+        received_ms = 0
+
+        try:
+            async for chunk in audio:
+                received_ms += len(chunk) / self.bytes_per_ms
+                due = time.monotonic() + self.latency_ms / 1000
+
+                while received_ms >= next_ms:
+                    await pending.put((due, next_result))
+                    next_ms, next_result = next(script)
+        finally:
+            await pending.put(None)
+
+    async def streaming_recognize(self, audio: AsyncIterator[bytes]) -> AsyncIterator[SttResult]:
+        pending: asyncio.Queue = asyncio.Queue()
+        consumer = asyncio.create_task(self._consume(audio, pending))
+
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+
+                due, result = item
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                yield result
+
+            await consumer
+        finally:
+            consumer.cancel()
@@ -1,57 +1,45 @@
 import re
 import logging
-from typing import List
+from typing import AsyncIterator, List
 
-from google.cloud import speech
+from .stt.base import SttBackend, SttResult
+from ..util.metrics import REGISTRY
 
+STT_SESSIONS = REGISTRY.counter("stt_sessions_total", "Streaming STT sessions opened, including restarts.")
+STT_RESULTS = REGISTRY.counter("stt_results_total", "Streaming STT results received.", ["kind"])
 
-class TranscriptionService:
 
-    def __init__(self, logger: logging) -> None:
-        self.client = speech.SpeechClient()
-        self.config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,
-            language_code="ko-KR",
-        )
-        self.streaming_config = speech.StreamingRecognitionConfig(
-            config=self.config, interim_results=True
-        )
+class TranscriptionService:
 
+    def __init__(self, backend: SttBackend, logger: logging) -> None:
+        self.backend = backend
         self.logger = logger
-    
-    def transcribe(self, bytes_arr: bytes) -> List[str]:        
-        self.logger.info(f"length of bytes : {len(bytes_arr)}")
-        contents = [bytes_arr]        
-        requests = (
-            speech.StreamingRecognizeRequest(audio_content=content) for content in contents
-        )
 
-        responses = self.client.streaming_recognize(self.streaming_config, requests)
-        return self._listen_print_loop(responses)
+    def streaming_recognize(self, audio: AsyncIterator[bytes]) -> AsyncIterator[SttResult]:
+        return self.backend.streaming_recognize(audio)
 
-    def _listen_print_loop(self, responses: object) -> List[str]:
-        transcript = ""
-        self.logger.info(f"transcription response : {responses}")
+    async def close(self) -> None:
+        await self.backend.close()
 
-        response_list = list(responses)
-        self.logger.info(f"transcription response length : {len(response_list)}")
+    async def transcribe(self, bytes_arr: bytes) -> List[str]:
+        self.logger.info(f"length of bytes : {len(bytes_arr)}")
 
-        transcriptions = []        
+        async def contents():
+            yield bytes_arr
 
-        for response in response_list:
-            if not response.results:
-                continue
+        return await self._listen_print_loop(self.streaming_recognize(contents()))
 
-            result = response.results[0]
-            transcript = result.alternatives[0].transcript
+    async def _listen_print_loop(self, results: AsyncIterator[SttResult]) -> List[str]:
+        transcriptions = []
 
+        async for result in results:
             if result.is_final:
-                self.logger.info(f"final text : {transcript}")
-                transcriptions.append(f"final text : {transcript}")
-                
+                self.logger.info(f"final text : {result.transcript}")
+                transcriptions.append(f"final text : {result.transcript}")
+
             else:
-                self.logger.info(f"transient text : {transcript}")
-                transcriptions.append(f"transient text : {transcript}")
+                self.logger.info(f"transient text : {result.transcript}")
+                transcriptions.append(f"transient text : {result.transcript}")
 
+        self.logger.info(f"transcription response length : {len(transcriptions)}")
         return transcriptions
@@ -0,0 +1,65 @@
+import time
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+
+class InterimCoalescer:
+    """Rate limits one speaker's interim transcripts.
+
+    At most ``max_interim_per_second`` interim messages are sent; anything
+    arriving faster is held and replaced by newer text, and the latest one
+    is sent once the interval has passed. Final messages are sent at once
+    and discard any pending interim. A rate of 0 disables coalescing.
+    """
+
+    def __init__(self, send: Callable[[dict], Awaitable[None]], max_interim_per_second: float = 5.0):
+        self._send = send
+        self._min_interval = 1.0 / max_interim_per_second if max_interim_per_second > 0 else 0.0
+        self._last_sent = 0.0
+        self._pending: Optional[dict] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.received = 0
+        self.sent = 0
+
+    def __enter__(self) -> "InterimCoalescer":
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.cancel()
+
+    async def push(self, message: dict) -> None:
+        self.received += 1
+
+        if message["is_done"]:
+            self.cancel()
+            await self._emit(message)
+            return
+
+        elapsed = time.monotonic() - self._last_sent
+        if self._flush_task is None and elapsed >= self._min_interval:
+            await self._emit(message)
+            return
+
+        self._pending = message
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later(self._min_interval - elapsed))
+
+    def cancel(self) -> None:
+        self._pending = None
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        message, self._pending = self._pending, None
+        self._flush_task = None
+        if message is not None:
+            await self._emit(message)
+
+    async def _emit(self, message: dict) -> None:
+        self._last_sent = time.monotonic()
+        self.sent += 1
+        await self._send(message)
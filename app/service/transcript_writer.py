@@ -0,0 +1,160 @@
+import time
+import uuid
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..model.utterance import Utterance
+from ..provider.database_manager import DatabaseManager
+
+
+@dataclass
+class PendingUtterance:
+    key: str
+    meeting_id: int
+    utterance: Utterance
+    queued_at: float
+
+
+class TranscriptWriter:
+    """Write-behind log for finalized utterances.
+
+    ``append`` only queues the utterance, so the STT and chat loops never
+    wait for the database. A background task writes the queue in batches
+    once ``batch_size`` utterances are waiting or ``flush_interval`` seconds
+    have passed. Every utterance carries a unique key and rows are inserted
+    with ``ON DUPLICATE KEY UPDATE``, so a batch retried after a lost commit
+    acknowledgement is not stored twice.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+
+        self._pending: deque[PendingUtterance] = deque()
+        self._inflight: List[PendingUtterance] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.max_lag = 0.0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    def start(self) -> None:
+        self._stopping = False
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="transcript-writer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for attempt in range(1, 4):
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                self.logger.warning(f"Final transcript write failed ({attempt}/3) : {e}")
+                await asyncio.sleep(0.5 * attempt)
+
+        self.logger.error(f"{len(self._pending)} utterances were not written")
+
+    def append(self, meeting_id: int, utterance: Utterance) -> None:
+        self._pending.append(PendingUtterance(uuid.uuid4().hex, meeting_id, utterance, time.monotonic()))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._pending:
+                self._inflight = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    await self.db_manager.upsert_qa_table_bulk(
+                        [
+                            {
+                                "utterance_key": item.key,
+                                "meeting_id": item.meeting_id,
+                                "speaker": item.utterance.speaker,
+                                "timestamp": item.utterance.timestamp,
+                                "message": item.utterance.text,
+                            }
+                            for item in self._inflight
+                        ]
+                    )
+                except BaseException:
+                    # stop() 의 cancel 도 포함해서, 순서를 지키도록 앞에 되돌려 두고 다음 flush 때 같은 key 로 다시 쓴다.
+                    self._pending.extendleft(reversed(self._inflight))
+                    raise
+                finally:
+                    batch, self._inflight = self._inflight, []
+
+                now = time.monotonic()
+                self.max_lag = max(self.max_lag, now - batch[0].queued_at)
+                self.written += len(batch)
+                self.batches += 1
+
+    async def load(self, meeting_id: int) -> List[Utterance]:
+        rows = await self.db_manager.select_qa_table_with_meeting_id(meeting_id)
+        written = {row["utterance_key"] for row in rows}
+        # 아직 쓰고 있거나 기다리는 발언도 포함해야 memory 와 DB 가 어긋나지 않는다.
+        unwritten = [
+            item.utterance for item in [*self._inflight, *self._pending]
+            if item.meeting_id == meeting_id and item.key not in written
+        ]
+
+        return [
+            Utterance(timestamp=row["timestamp"], speaker=row["speaker"], text=row["message"]) for row in rows
+        ] + unwritten
+
+    def stats(self) -> dict:
+        oldest = self._inflight[0] if self._inflight else (self._pending[0] if self._pending else None)
+
+        return {
+            "pending": len(self._pending) + len(self._inflight),
+            "oldest_pending_seconds": 0.0 if oldest is None else round(time.monotonic() - oldest.queued_at, 3),
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "max_lag_seconds": round(self.max_lag, 3),
+        }
+
+    async def _run(self) -> None:
+        backoff = self.flush_interval
+        # python 3.11 의 wait_for 는 wakeup 과 동시에 들어온 cancel 을 삼킬 수 있어서 _stopping 도 본다.
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+                backoff = self.flush_interval
+            except Exception as e:
+                self.failures += 1
+                self.logger.error(f"Transcript write failed, retrying in {backoff:.1f}s : {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(self.max_backoff, backoff * 2)
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable
+
+from ..provider.audio_manager import ResumableMicrophoneSocketStream
+
+
+# 회의별로 발언자를 구분할 수 있도록 key 는 (meeting_id, client_id) 같은 값이어도 된다.
+StreamKey = Hashable
+TranscribeFunc = Callable[[ResumableMicrophoneSocketStream, StreamKey], Awaitable[None]]
+
+
+class TranscriptionScheduler:
+    """Runs every speaker's STT session as a task on the server's event loop.
+
+    At most ``max_concurrent_streams`` sessions talk to the STT backend at
+    once; speakers over the limit wait for a slot while their audio is kept
+    in the stream's bounded buffer.
+    """
+
+    def __init__(self, transcribe: TranscribeFunc, max_concurrent_streams: int = 200):
+        self._transcribe = transcribe
+        self.max_concurrent_streams = max_concurrent_streams
+        self._semaphore = asyncio.Semaphore(max_concurrent_streams)
+        self.tasks: dict[StreamKey, asyncio.Task] = {}
+        self.running: set[StreamKey] = set()
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    def start(self, key: StreamKey, stream: ResumableMicrophoneSocketStream) -> asyncio.Task:
+        if key in self.tasks and not self.tasks[key].done():
+            return self.tasks[key]
+
+        task = asyncio.create_task(self._run(key, stream), name=f"transcribe-{key}")
+        self.tasks[key] = task
+        task.add_done_callback(lambda t: self._on_done(key, t))
+
+        return task
+
+    async def stop(self, key: StreamKey) -> None:
+        task = self.tasks.pop(key, None)
+        if task is None or task.done():
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def shutdown(self) -> None:
+        await asyncio.gather(*(self.stop(key) for key in list(self.tasks)))
+
+    def status(self) -> dict[str, int]:
+        return {
+            "max_concurrent_streams": self.max_concurrent_streams,
+            "running": len(self.running),
+            "waiting": len(self.tasks) - len(self.running),
+        }
+
+    async def _run(self, key: StreamKey, stream: ResumableMicrophoneSocketStream) -> None:
+        async with self._semaphore:
+            self.running.add(key)
+            try:
+                await self._transcribe(stream, key)
+            finally:
+                self.running.discard(key)
+
+    def _on_done(self, key: StreamKey, task: asyncio.Task) -> None:
+        if self.tasks.get(key) is task:
+            self.tasks.pop(key)
+
+        if task.cancelled():
+            self.logger.info(f"#{key} transcription task cancelled")
+        elif task.exception() is not None:
+            self.logger.error(f"#{key} transcription task failed : {task.exception()}")
@@ -0,0 +1,196 @@
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+
+STAGES = ("queue_wait_ms", "stt_ms", "fanout_ms", "total_ms")
+
+
+@dataclass
+class UtteranceTrace:
+    trace_id: str
+    meeting_id: int
+    client_id: int
+    kind: str
+    # 모두 unix time (ms). 받은 시각과 STT 로 넘긴 시각은 결과 끝 지점의 audio chunk 기준이다.
+    audio_received_at: Optional[int]
+    stt_sent_at: Optional[int]
+    stt_result_at: int
+    broadcast_at: Optional[int] = None
+
+    def spans(self) -> dict[str, Optional[int]]:
+        def span(start: Optional[int], end: Optional[int]) -> Optional[int]:
+            return None if start is None or end is None else end - start
+
+        return {
+            "queue_wait_ms": span(self.audio_received_at, self.stt_sent_at),
+            "stt_ms": span(self.stt_sent_at, self.stt_result_at),
+            "fanout_ms": span(self.stt_result_at, self.broadcast_at),
+            "total_ms": span(self.audio_received_at, self.broadcast_at),
+        }
+
+
+class UtteranceTracer:
+    """Samples STT results and times them from audio arrival to broadcast.
+
+    A sampled result gets a trace when it leaves the STT session. The trace
+    records when the audio at the end of the result reached the websocket
+    and when it left the stream queue for STT. It is finished when the
+    coalescer broadcasts the message, which gives three spans: queue wait,
+    STT turnaround and fan-out. Interim results that the coalescer replaced
+    are never broadcast; they leave ``max_pending`` oldest first and are
+    counted as abandoned. Finished traces are kept per meeting for
+    ``report`` and appended to ``export_path`` as JSON lines by a background
+    task.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.1,
+        export_path: Optional[str] = None,
+        max_traces_per_meeting: int = 4096,
+        max_pending: int = 1024,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.export_path = export_path
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+
+        self._pending: OrderedDict[str, UtteranceTrace] = OrderedDict()
+        self._finished: dict[int, deque[UtteranceTrace]] = defaultdict(lambda: deque(maxlen=max_traces_per_meeting))
+        self._lines: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self._random = random.Random()
+
+        self.sampled = 0
+        self.finished = 0
+        self.abandoned = 0
+
+        self.logger = logging.getLogger("uvicorn")
+        self.logger.setLevel(logging.INFO)
+
+    def start(self) -> None:
+        if self.export_path is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="utterance-tracer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+    def begin(self, meeting_id: int, client_id: int, message: dict, stream) -> Optional[UtteranceTrace]:
+        if self.sample_rate <= 0 or self._random.random() >= self.sample_rate:
+            return None
+
+        arrival = stream.arrival(stream.result_end_time)
+        trace = UtteranceTrace(
+            trace_id=uuid.uuid4().hex[:16],
+            meeting_id=meeting_id,
+            client_id=client_id,
+            kind="final" if message["is_done"] else "interim",
+            audio_received_at=None if arrival is None else arrival[0],
+            stt_sent_at=None if arrival is None else arrival[1],
+            stt_result_at=int(time.time() * 1000),
+        )
+
+        self._pending[trace.trace_id] = trace
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.abandoned += 1
+        self.sampled += 1
+
+        # 받는 쪽에서도 같은 trace 를 찾을 수 있도록 메시지에 id 와 시각을 싣는다.
+        message["trace"] = {
+            "id": trace.trace_id,
+            "audio_received_at": trace.audio_received_at,
+            "stt_sent_at": trace.stt_sent_at,
+            "stt_result_at": trace.stt_result_at,
+        }
+        return trace
+
+    def finish(self, message: dict) -> None:
+        trace = self._pending.pop(message.get("trace", {}).get("id"), None)
+        if trace is None:
+            return
+
+        trace.broadcast_at = int(time.time() * 1000)
+        self._finished[trace.meeting_id].append(trace)
+        self.finished += 1
+
+        if self.export_path is not None:
+            self._lines.append(json.dumps({**asdict(trace), **trace.spans()}) + "\n")
+
+    def report(self, meeting_id: int) -> dict:
+        traces = list(self._finished.get(meeting_id, ()))
+        by_client: dict[int, List[UtteranceTrace]] = defaultdict(list)
+        for trace in traces:
+            by_client[trace.client_id].append(trace)
+
+        return {
+            "meeting_id": meeting_id,
+            "traces": len(traces),
+            "stages": self._summarize(traces),
+            "clients": {client_id: self._summarize(items) for client_id, items in by_client.items()},
+        }
+
+    def stats(self) -> dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "sampled": self.sampled,
+            "finished": self.finished,
+            "abandoned": self.abandoned,
+            "pending": len(self._pending),
+            "unexported_lines": len(self._lines),
+        }
+
+    async def flush(self) -> None:
+        if not self._lines or self.export_path is None:
+            return
+
+        lines, self._lines = self._lines, []
+        try:
+            await asyncio.to_thread(self._write, lines)
+        except OSError as e:
+            self.logger.error(f"Failed to export {len(lines)} utterance traces : {e}")
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.export_path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    @staticmethod
+    def _summarize(traces: List[UtteranceTrace]) -> dict[str, dict]:
+        summary = {}
+        spans = [trace.spans() for trace in traces]
+        for stage in STAGES:
+            values = sorted(x[stage] for x in spans if x[stage] is not None)
+            if not values:
+                summary[stage] = {"count": 0}
+                continue
+
+            summary[stage] = {
+                "count": len(values),
+                "p50": values[len(values) // 2],
+                "p90": values[int(len(values) * 0.9)],
+                "p99": values[int(len(values) * 0.99)],
+                "max": values[-1],
+            }
+
+        return summary
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,231 @@
+import time
+import bisect
+from typing import Callable, Iterable, List, Optional, Sequence
+
+
+# 초 단위 지연에 맞춘 기본 bucket. 5ms 부터 1분까지.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FAST_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("_registry", "value")
+
+    def __init__(self, registry: "MetricsRegistry") -> None:
+        self._registry = registry
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if self._registry.enabled:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("_registry", "value")
+
+    def __init__(self, registry: "MetricsRegistry") -> None:
+        self._registry = registry
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("_registry", "_buckets", "counts", "sum", "count")
+
+    def __init__(self, registry: "MetricsRegistry", buckets: Sequence[float]) -> None:
+        self._registry = registry
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        if not self._registry.enabled:
+            return
+
+        self.counts[bisect.bisect_left(self._buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_child", "_started")
+
+    def __init__(self, child: _HistogramChild) -> None:
+        self._child = child
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._child.observe(time.perf_counter() - self._started)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        # 넘겨받은 값 그대로를 key 로 한 번 더 찾아서, 자주 부르는 곳에서 str 변환을 건너뛴다.
+        self._lookup: dict[tuple, object] = {}
+
+    def labels(self, *values) -> object:
+        child = self._lookup.get(values)
+        if child is not None:
+            return child
+
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children[key] = self._new_child()
+        self._lookup[values] = child
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+        self._lookup.clear()
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def _label_text(self, key: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for key, child in list(self._children.items()):
+            yield from self._render_child(key, child)
+
+    def _render_child(self, key: tuple, child) -> Iterable[str]:
+        yield f"{self.name}{self._label_text(key)} {_format_value(child.value)}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._registry)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild(self._registry)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._registry, self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, key: tuple, child: _HistogramChild) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), child.counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            yield f"{self.name}_bucket{self._label_text(key, le)} {cumulative}"
+        yield f"{self.name}_sum{self._label_text(key)} {_format_value(child.sum)}"
+        yield f"{self.name}_count{self._label_text(key)} {child.count}"
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms rendered in the Prometheus text format.
+
+    Metrics are updated from the event loop without locks; the hot paths
+    bind their labelled child once and only pay for an attribute check and
+    an addition per update. Values that already live on objects, such as
+    queue depths, are copied into gauges by collectors when ``render`` is
+    called instead of being tracked on every change. Each worker process
+    keeps its own registry.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Metric) -> Metric:
+        # 같은 module 이 두 번 import 되어도 값이 나뉘지 않도록 이미 있는 metric 을 돌려준다.
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with a different type or labels")
+            return existing
+
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()
@@ -1,6 +1,15 @@
+import re
 from datetime import datetime, timezone, timedelta
 
 
+KST = timezone(+timedelta(hours=9))
+# migration v5 가 기존 row 에서 읽는 형식과 같다. 초 아래 자리는 DATETIME 에 남지 않는다.
+DATETIME_PATTERN = re.compile(
+    r"(?P<year>\d{2}|\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})"
+    r"(?:[ T](?P<hour>\d{1,2}):(?P<minute>\d{1,2})(?::(?P<second>\d{1,2})(?:\.\d+)?)?(?P<utc>Z)?)?"
+)
+
+
 class TimeUtil:
     def __init__(self) -> None:
         pass
@@ -11,6 +20,34 @@ class TimeUtil:
         digit_diff = 10 - num_digit
         
         timestamp = int((10 ** digit_diff) * timestamp)
-        tz = timezone(+timedelta(hours=9))
-            
-        return datetime.fromtimestamp(timestamp, tz).strftime("%y-%m-%d %H:%M:%S")
+
+        return datetime.fromtimestamp(timestamp, KST).strftime("%y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def convert_datetime_to_timestamp(value: datetime) -> str:
+        return value.strftime("%y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def normalize_timestamp(value: str) -> str:
+        """Parses a client supplied time into the "YYYY-MM-DD HH:MM:SS" KST form DATETIME columns take.
+
+        Raises ValueError when the value is not one of the accepted formats.
+        """
+        match = DATETIME_PATTERN.fullmatch(value.strip())
+        if match is None:
+            raise ValueError(f"Unsupported time format : {value}")
+
+        year = int(match["year"])
+        if len(match["year"]) == 2:
+            # MySQL 처럼 70 이상은 1900 년대로 읽지 않고, TimeUtil 이 만든 값이므로 모두 2000 년대다.
+            year += 2000
+
+        parsed = datetime(
+            year, int(match["month"]), int(match["day"]),
+            int(match["hour"] or 0), int(match["minute"] or 0), int(match["second"] or 0),
+        )
+        if match["utc"]:
+            parsed = parsed.replace(tzinfo=timezone.utc).astimezone(KST).replace(tzinfo=None)
+
+        return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
@@ -0,0 +1,156 @@
+"""화자 N 명의 audio 를 AudioArchiver 로 디스크에 남길 때 receive loop 가 막히지 않는지, 디스크가 따라오는지 잰다.
+
+화자 --streams 명이 각자 --chunk-ms 마다 16 kHz LINEAR16 chunk 를 append 한다. --speedup 을 1 보다 크게 하면
+실시간보다 그만큼 빨리 보내서 감당할 수 있는 처리량을 본다. fsync 정책마다 따로 돌리고 다음을 본다.
+
+- MB/s        : 실제로 file 에 쓴 양. 실시간 100 명이면 3.2 MB/s 다.
+- dropped     : max_pending_bytes 를 넘어서 버린 양
+- flush ms    : 한 batch 를 writer thread 가 쓰는 데 걸린 시간 (p50 / max)
+- loop lag ms : 10 ms 마다 깨는 task 가 늦게 깬 정도 (p99 / max). receive loop 가 밀리는 정도다.
+- append us   : append 한 번의 비용
+
+DB 는 색인 row 만 세는 fake 를 쓴다.
+
+    python -m benchmark.audio_archive --streams 100 --seconds 20 --segment-seconds 5 --fsync never segment always
+"""
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from typing import List
+
+from app.service.audio_archiver import AudioArchiver, MB
+from app.service.broker.memory_broker import InProcessBroker
+
+
+class FakeDatabaseManager:
+    def __init__(self):
+        self.rows = 0
+
+    async def upsert_audio_segment_table_bulk(self, data_list: List[dict]) -> None:
+        self.rows += len(data_list)
+
+    async def update_audio_segment_storage_key(self, segment_key: str, storage_key: str) -> None:
+        pass
+
+
+class TimedArchiver(AudioArchiver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_seconds: List[float] = []
+
+    def _written(self, finished, errors, started):
+        self.flush_seconds.append(time.monotonic() - started)
+        super()._written(finished, errors, started)
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def measure_lag(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.monotonic()
+        await asyncio.sleep(0.01)
+        lags.append(time.monotonic() - started - 0.01)
+
+
+async def speaker(archiver: AudioArchiver, speaker_id: int, args: argparse.Namespace, append_seconds: List[float]) -> None:
+    chunk = os.urandom(16 * args.chunk_ms * 2)
+    interval = args.chunk_ms / 1000 / args.speedup
+    chunks = int(args.seconds * 1000 / args.chunk_ms)
+
+    started = time.monotonic()
+    for n in range(chunks):
+        await asyncio.sleep(max(0.0, started + n * interval - time.monotonic()))
+        begin = time.perf_counter()
+        archiver.append(1, speaker_id, chunk)
+        append_seconds.append(time.perf_counter() - begin)
+    archiver.close_stream(1, speaker_id)
+
+
+async def run(fsync: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(dir=args.dir) as root:
+        db = FakeDatabaseManager()
+        broker = InProcessBroker()
+        archiver = TimedArchiver(
+            root, db, broker,
+            format=args.format,
+            segment_seconds=args.segment_seconds,
+            flush_interval=args.flush_interval,
+            max_batch_bytes=int(args.batch_mb * MB),
+            max_pending_bytes=int(args.max_pending_mb * MB),
+            fsync=fsync,
+        )
+        await broker.start()
+        archiver.start()
+
+        lags: List[float] = []
+        append_seconds: List[float] = []
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_lag(lags, stop))
+
+        started = time.monotonic()
+        await asyncio.gather(*(speaker(archiver, n, args, append_seconds) for n in range(args.streams)))
+        await archiver.stop()
+        elapsed = time.monotonic() - started
+
+        stop.set()
+        await lag_task
+        await broker.close()
+
+        files = sum(len(names) for _, _, names in os.walk(root))
+
+    return {
+        "mbps": archiver.written_bytes / MB / elapsed,
+        "dropped": archiver.dropped_bytes / MB,
+        "flush_p50": statistics.median(archiver.flush_seconds) if archiver.flush_seconds else 0.0,
+        "flush_max": max(archiver.flush_seconds, default=0.0),
+        "lag_p99": percentile(lags, 0.99),
+        "lag_max": max(lags, default=0.0),
+        "append": statistics.mean(append_seconds),
+        "segments": archiver.segments,
+        "files": files,
+        "indexed": db.rows,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    print(
+        f"{args.streams} streams x {args.seconds:.0f} s at {args.speedup:g}x real time, "
+        f"{args.segment_seconds:g} s {args.format} segments, flush every {args.flush_interval:g} s"
+    )
+    print(
+        f"{'fsync':<9}{'MB/s':>7}{'dropped MB':>12}{'flush p50':>11}{'flush max':>11}"
+        f"{'lag p99':>9}{'lag max':>9}{'append us':>11}{'segments':>10}{'indexed':>9}"
+    )
+    for fsync in args.fsync:
+        result = await run(fsync, args)
+        print(
+            f"{fsync:<9}{result['mbps']:>7.2f}{result['dropped']:>12.1f}"
+            f"{result['flush_p50'] * 1000:>11.1f}{result['flush_max'] * 1000:>11.1f}"
+            f"{result['lag_p99'] * 1000:>9.1f}{result['lag_max'] * 1000:>9.1f}{result['append'] * 1e6:>11.2f}"
+            f"{result['segments']:>10}{result['indexed']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=20, help="화자마다 보내는 audio 길이")
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--segment-seconds", type=float, default=5)
+    parser.add_argument("--format", choices=["wav", "flac"], default="wav")
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--batch-mb", type=float, default=4)
+    parser.add_argument("--max-pending-mb", type=float, default=64)
+    parser.add_argument("--fsync", nargs="+", choices=["never", "segment", "always"], default=["never", "segment", "always"])
+    parser.add_argument("--dir", default=None, help="segment 를 쓸 디렉터리. 기본값은 시스템 임시 디렉터리")
+    asyncio.run(main(parser.parse_args()))
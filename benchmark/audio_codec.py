@@ -0,0 +1,138 @@
+"""압축 audio 를 받으면 websocket 대역폭이 얼마나 줄고, server 의 decode 비용이 얼마인지 잰다.
+
+말소리와 비슷하게 켜졌다 꺼지는 16 kHz mono LINEAR16 을 만들고 ffmpeg 로 webm/ogg(opus) 와 flac 으로 encode 한다.
+화자 --speakers 명이 각자 AudioDecoderPool 의 decoder 하나에 --chunk-ms 단위로 실시간처럼 보내고 다음을 본다.
+
+- kbit/s      : client 가 보내는 bitrate. pcm 은 256 kbit/s 다.
+- saved       : pcm 대비 줄어든 대역폭
+- cpu ms/s    : decoder process 들이 쓴 CPU 를 화자 한 명, audio 1 초 기준으로 나눈 값
+- first pcm   : 첫 chunk 를 넣고 decode 된 PCM 이 처음 나올 때까지의 시간 (중앙값)
+- lag         : 마지막 chunk 를 넣고 그 chunk 의 PCM 이 다 나올 때까지의 시간 (중앙값, close 로 flush 하기 전)
+
+    python -m benchmark.audio_codec --speakers 50 --seconds 10 --ffmpeg ffmpeg
+"""
+import math
+import time
+import random
+import struct
+import asyncio
+import argparse
+import resource
+import statistics
+import subprocess
+
+from app.provider.audio_decoder import AudioDecoderPool
+
+
+SAMPLE_RATE = 16000
+PCM_KBITS = SAMPLE_RATE * 16 / 1000
+
+# streaming client 처럼 encoder 도 짧게 끊어서 내보낸다.
+# ogg 는 page 를 20 ms 마다, flac 은 frame 을 20 ms 로 만든다. ffmpeg 기본값은 각각 1 초, 256 ms 다.
+ENCODERS = {
+    "webm": ["-c:a", "libopus", "-b:a", "24k", "-f", "webm"],
+    "ogg": ["-c:a", "libopus", "-b:a", "24k", "-page_duration", "20000", "-f", "ogg"],
+    "flac": ["-c:a", "flac", "-frame_size", "320", "-f", "flac"],
+}
+
+
+def synthesize(seconds: float, seed: int = 0) -> bytes:
+    # 1 초 말하고 0.5 초 쉬는 것을 반복한다. 말하는 구간은 pitch 가 흔들리는 배음과 약한 잡음이다.
+    rng = random.Random(seed)
+    samples = []
+    for i in range(int(seconds * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        level = 1.0 if t % 1.5 < 1.0 else 0.02
+        pitch = 180 * (1 + 0.1 * math.sin(2 * math.pi * 3 * t))
+        value = 0.3 * math.sin(2 * math.pi * pitch * t) + 0.15 * math.sin(4 * math.pi * pitch * t)
+        samples.append(int(level * (value + 0.05 * rng.uniform(-1, 1)) * 12000))
+    return struct.pack(f"<{len(samples)}h", *samples)
+
+
+def encode(ffmpeg: str, pcm: bytes, codec: str) -> bytes:
+    result = subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1",
+         "-i", "pipe:0", *ENCODERS[codec], "pipe:1"],
+        input=pcm, capture_output=True, check=True,
+    )
+    return result.stdout
+
+
+async def speaker(pool: AudioDecoderPool, codec: str, data: bytes, seconds: float, chunk_ms: int, report: dict) -> None:
+    decoded = [0]
+    first = []
+    started = time.monotonic()
+
+    def on_pcm(pcm: bytes) -> None:
+        if not first:
+            first.append(time.monotonic() - started)
+        decoded[0] += len(pcm)
+
+    _, decoder = await pool.open([codec], on_pcm)
+    chunks = max(1, int(seconds * 1000 / chunk_ms))
+    size = math.ceil(len(data) / chunks)
+
+    # 실제 client 처럼 chunk_ms 마다 그만큼의 압축 data 를 보낸다.
+    for n in range(chunks):
+        await asyncio.sleep(max(0.0, started + n * chunk_ms / 1000 - time.monotonic()))
+        await decoder.feed(data[n * size:(n + 1) * size])
+    sent_at = time.monotonic()
+
+    # 다 보낸 뒤에도 stream 은 열어 둔 채 decode 가 따라오는 것을 본다.
+    expected = int(seconds * SAMPLE_RATE) * 2 * 0.95
+    while decoded[0] < expected and time.monotonic() - sent_at < 5:
+        await asyncio.sleep(0.005)
+    report["lag"].append(time.monotonic() - sent_at)
+
+    await pool.release(decoder)
+    report["first"].append(first[0] if first else float("nan"))
+    report["decoded"].append(decoder.decoded_bytes)
+
+
+async def run(codec: str, data: bytes, args: argparse.Namespace) -> dict:
+    pool = AudioDecoderPool(ffmpeg=args.ffmpeg, max_decoders=args.speakers)
+    report = {"first": [], "lag": [], "decoded": []}
+
+    cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+    await asyncio.gather(*(speaker(pool, codec, data, args.seconds, args.chunk_ms, report) for _ in range(args.speakers)))
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    child_cpu = (after.ru_utime - cpu.ru_utime) + (after.ru_stime - cpu.ru_stime)
+    return {
+        "kbits": len(data) * 8 / 1000 / args.seconds,
+        "cpu_ms": child_cpu * 1000 / args.speakers / args.seconds,
+        "first": statistics.median(report["first"]),
+        "lag": statistics.median(report["lag"]),
+        "decoded": sum(report["decoded"]) / (args.speakers * args.seconds * SAMPLE_RATE * 2),
+        "fallbacks": pool.fallbacks,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    pool = AudioDecoderPool(ffmpeg=args.ffmpeg)
+    if pool.ffmpeg is None:
+        raise SystemExit(f"{args.ffmpeg} was not found")
+
+    pcm = synthesize(args.seconds)
+    print(f"{args.speakers} speakers, {args.seconds:.0f} s each, {args.chunk_ms} ms chunks")
+    print(f"{'codec':<7}{'kbit/s':>9}{'saved':>8}{'cpu ms/s':>10}{'first pcm ms':>14}{'lag ms':>9}{'decoded':>9}")
+    print(f"{'pcm':<7}{PCM_KBITS:>9.1f}{0:>7.0f}%{0:>10.1f}{'-':>14}{'-':>9}{1:>9.0%}")
+    for codec in args.codecs:
+        result = await run(codec, encode(pool.ffmpeg, pcm, codec), args)
+        print(
+            f"{codec:<7}{result['kbits']:>9.1f}{(1 - result['kbits'] / PCM_KBITS) * 100:>7.0f}%"
+            f"{result['cpu_ms']:>10.1f}{result['first'] * 1000:>14.1f}{result['lag'] * 1000:>9.1f}{result['decoded']:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--speakers", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--codecs", nargs="+", default=list(ENCODERS))
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    asyncio.run(main(parser.parse_args()))
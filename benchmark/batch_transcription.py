@@ -0,0 +1,155 @@
+"""녹음 파일 batch 변환이 동시 STT session 수에 따라 얼마나 빨라지는지 잰다.
+
+말하는 구간과 침묵이 섞인 --minutes 분짜리 16 kHz 녹음을 만들어 --format 으로 저장하고,
+BatchTranscriptionService 로 --concurrency 값마다 처음부터 끝까지 변환한다.
+STT 는 LocalSttBackend 에 받은 audio 를 --stt-speed 배속으로만 처리하는 지연을 더한 fake 를 쓴다.
+Google 의 streaming 인식처럼 session 하나는 실시간보다 크게 빠르지 않다고 보고 기본값은 1 배속이다.
+
+- decode s   : worker process 에서 ffmpeg 로 decode 하고 침묵에서 자르는 데 걸린 시간
+- speed      : audio 분 / 걸린 분 (decode 포함)
+- ordered    : 내보낸 발언의 시작 offset 이 줄어들지 않았는지
+
+    python -m benchmark.batch_transcription --minutes 60 --concurrency 1 4 8 16 --stt-speed 1 --format flac
+"""
+import os
+import logging
+import math
+import time
+import wave
+import random
+import struct
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import AsyncIterator
+
+from app.service.batch_transcription_service import BatchTranscriptionService, SAMPLE_RATE
+from app.service.stt.base import SttResult
+from app.service.stt.local_backend import LocalSttBackend
+from app.service.transcribe_service import TranscriptionService
+
+
+class PacedSttBackend(LocalSttBackend):
+    def __init__(self, speed: float, **kwargs):
+        super().__init__(**kwargs)
+        self.speed = speed
+
+    def streaming_recognize(self, audio: AsyncIterator[bytes]) -> AsyncIterator[SttResult]:
+        async def paced():
+            async for chunk in audio:
+                await asyncio.sleep(len(chunk) / self.bytes_per_ms / 1000 / self.speed)
+                yield chunk
+
+        return super().streaming_recognize(paced())
+
+
+def synthesize(path: str, minutes: float, seed: int = 0) -> None:
+    # 2~8 초 말하고 0.3~1.5 초 쉬기를 반복한다. 1 초 단위로 만들어서 memory 를 적게 쓴다.
+    rng = random.Random(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+
+        written, speaking, remaining = 0, True, 0
+        while written < total:
+            samples = []
+            for i in range(written, min(total, written + SAMPLE_RATE)):
+                if remaining <= 0:
+                    speaking = not speaking
+                    remaining = int((rng.uniform(2, 8) if speaking else rng.uniform(0.3, 1.5)) * SAMPLE_RATE)
+                remaining -= 1
+
+                t = i / SAMPLE_RATE
+                if speaking:
+                    pitch = 160 * (1 + 0.15 * math.sin(2 * math.pi * 2.5 * t))
+                    value = 0.3 * math.sin(2 * math.pi * pitch * t) + 0.1 * math.sin(6 * math.pi * pitch * t)
+                    value += 0.05 * rng.uniform(-1, 1)
+                else:
+                    value = 0.002 * rng.uniform(-1, 1)
+                samples.append(int(value * 12000))
+
+            f.writeframesraw(struct.pack(f"<{len(samples)}h", *samples))
+            written += len(samples)
+
+
+def encode(ffmpeg: str, wav_path: str, codec: str) -> str:
+    if codec == "wav":
+        return wav_path
+
+    target = os.path.splitext(wav_path)[0] + f".{codec}"
+    subprocess.run([ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", wav_path, target], check=True)
+    return target
+
+
+async def run(source: str, concurrency: int, args: argparse.Namespace) -> dict:
+    backend = PacedSttBackend(args.stt_speed, latency_ms=args.stt_latency_ms, ms_per_word=300, interim_results=False)
+    service = BatchTranscriptionService(
+        TranscriptionService(backend, logger=logging.getLogger("uvicorn")),
+        max_concurrency=concurrency,
+        ffmpeg=args.ffmpeg,
+        target_segment_seconds=args.segment_seconds,
+        overlap_ms=args.overlap_ms,
+    )
+
+    # run 이 끝나면 파일을 지우므로 복사본을 넘긴다.
+    with open(source, "rb") as f:
+        path = await service.save_upload(f, source)
+
+    started = time.monotonic()
+    decoded, done, starts = {}, {}, []
+    async for event in service.run(path, "recording", int(time.time() * 1000)):
+        if event["type"] == "decoded":
+            decoded = event
+        elif event["type"] == "utterance":
+            starts.append(event["start_ms"])
+        elif event["type"] == "done":
+            done = event
+    elapsed = time.monotonic() - started
+    await service.close()
+
+    return {
+        "decode": decoded["decode_seconds"],
+        "segments": decoded["segments"],
+        "elapsed": elapsed,
+        "speed": done["duration_ms"] / 1000 / elapsed,
+        "utterances": done["utterances"],
+        "failed": done["failed_segments"],
+        "ordered": all(a <= b for a, b in zip(starts, starts[1:])),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        wav_path = os.path.join(directory, "recording.wav")
+        synthesize(wav_path, args.minutes)
+        source = encode(args.ffmpeg, wav_path, args.format)
+
+        print(
+            f"{args.minutes:g} min {args.format} recording ({os.path.getsize(source) / 1024 / 1024:.1f} MiB), "
+            f"{args.segment_seconds:g} s segments, fake STT at {args.stt_speed:g}x real time"
+        )
+        print(f"{'sessions':>9}{'segments':>10}{'decode s':>10}{'wall s':>9}{'speed':>9}{'utterances':>12}{'failed':>8}{'ordered':>9}")
+        for concurrency in args.concurrency:
+            result = await run(source, concurrency, args)
+            print(
+                f"{concurrency:>9}{result['segments']:>10}{result['decode']:>10.2f}{result['elapsed']:>9.1f}"
+                f"{result['speed']:>8.1f}x{result['utterances']:>12}{result['failed']:>8}{str(result['ordered']):>9}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--stt-speed", type=float, default=1.0, help="STT session 하나가 처리하는 배속")
+    parser.add_argument("--stt-latency-ms", type=int, default=300)
+    parser.add_argument("--segment-seconds", type=float, default=30)
+    parser.add_argument("--overlap-ms", type=int, default=1000)
+    parser.add_argument("--format", choices=["wav", "flac", "mp3"], default="flac")
+    parser.add_argument("--ffmpeg", default="ffmpeg")
+    asyncio.run(main(parser.parse_args()))
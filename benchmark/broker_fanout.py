@@ -0,0 +1,149 @@
+"""worker process 수에 따라 broker 를 거친 fan-out 지연이 어떻게 바뀌는지 잰다.
+
+회의 하나의 참석자 --clients 명을 worker N 개에 나눠 붙이고, 첫 worker 가 ChatServiceManager.broadcast 로
+발언을 --rate 로 보낸다. 모든 worker 의 fake websocket 이 frame 을 받은 시각에서 보낸 시각을 빼서
+참석자가 어느 worker 에 붙어 있든 받는지(delivered)와 지연 분포를 본다.
+
+- memory: 기존처럼 한 process 안에서만 전달한다. worker 1 개일 때의 기준값이다.
+- unix  : UnixSocketBroker. 먼저 lock 을 잡은 worker 가 hub 를 띄운다.
+- redis : RedisBroker. --redis-url 의 서버가 떠 있어야 한다.
+
+    python -m benchmark.broker_fanout --workers 1 2 4 8 --clients 400 --messages 200 --rate 50
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+from typing import List
+
+from app.service.chat_service import ChatServiceManager
+from app.service.broker.base import MessageBroker
+from app.service.broker.memory_broker import InProcessBroker
+from app.service.broker.unix_broker import UnixSocketBroker
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.latencies: List[float] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        message = json.loads(data)
+        if message.get("type") == "q&a":
+            self.latencies.append(time.time() - message["sent"])
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def build_broker(backend: str, path: str, redis_url: str) -> MessageBroker:
+    if backend == "unix":
+        return UnixSocketBroker(path)
+    if backend == "redis":
+        from app.service.broker.redis_broker import RedisBroker
+
+        return RedisBroker(redis_url, prefix=f"broker_fanout:{os.path.basename(path)}:")
+    return InProcessBroker()
+
+
+async def run_worker(index: int, workers: int, args: argparse.Namespace, path: str, barrier, results) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    broker = build_broker(args.broker, path, args.redis_url)
+    await broker.start()
+    chat = ChatServiceManager(max_queue_size=args.messages + 8, broker=broker, channel="meeting:1:chat")
+
+    # connect 는 broker 의 state 를 한번 왕복하므로, 끝나면 hub 가 이 worker 의 구독을 이미 받은 상태다.
+    sockets = [FakeWebSocket() for _ in range(index, args.clients, workers)]
+    for i, websocket in enumerate(sockets):
+        await chat.connect(websocket, index + i * workers)
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, barrier.wait)
+
+    cpu_started = time.process_time()
+    if index == 0:
+        started = time.monotonic()
+        for n in range(args.messages):
+            await asyncio.sleep(max(0.0, started + n / args.rate - time.monotonic()))
+            await chat.broadcast_json({"type": "q&a", "id": 1, "message": f"발언 {n}", "is_done": True, "sent": time.time()})
+
+    deadline = time.monotonic() + args.messages / args.rate + args.timeout
+    while any(len(websocket.latencies) < args.messages for websocket in sockets) and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    cpu = time.process_time() - cpu_started
+
+    results.put({
+        "latencies": [x for websocket in sockets for x in websocket.latencies],
+        "cpu": cpu,
+        "hub": broker.stats().get("hub", False),
+    })
+
+    # 다른 worker 가 다 받을 때까지 hub 를 띄운 worker 가 먼저 내려가지 않도록 기다린다.
+    await loop.run_in_executor(None, barrier.wait)
+    chat.end_meeting()
+    await broker.close()
+
+
+def worker_main(index: int, workers: int, args: argparse.Namespace, path: str, barrier, results) -> None:
+    asyncio.run(run_worker(index, workers, args, path, barrier, results))
+
+
+def run(workers: int, args: argparse.Namespace) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "broker.sock")
+        processes = [
+            context.Process(target=worker_main, args=(index, workers, args, path, barrier, results))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    latencies = sorted(x for report in reports for x in report["latencies"])
+    return {
+        "delivered": len(latencies),
+        "expected": args.clients * args.messages,
+        "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        "max": latencies[-1] if latencies else 0.0,
+        "cpu": sum(report["cpu"] for report in reports),
+        "hub_cpu": sum(report["cpu"] for report in reports if report["hub"]),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'broker':>8}{'workers':>9}{'delivered':>14}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'cpu s':>8}{'hub cpu s':>11}")
+    for workers in args.workers:
+        # memory 로 worker 를 2 개 이상 띄우면 첫 worker 에 붙은 참석자만 받는 것이 delivered 에 드러난다.
+        result = run(workers, args)
+        delivered = f"{result['delivered']}/{result['expected']}"
+        print(
+            f"{args.broker:>8}{workers:>9}{delivered:>14}"
+            f"{result['p50'] * 1000:>9.2f}{result['p99'] * 1000:>9.2f}{result['max'] * 1000:>9.2f}"
+            f"{result['cpu']:>8.2f}{result['hub_cpu']:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--broker", choices=["memory", "unix", "redis"], default="unix")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=400, help="회의 하나의 전체 참석자 수")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50, help="초당 broadcast 수")
+    parser.add_argument("--timeout", type=float, default=5.0, help="마지막 발언 뒤에 기다리는 시간")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    main(parser.parse_args())
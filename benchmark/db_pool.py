@@ -0,0 +1,124 @@
+"""/meeting_detail, /attend 의 DB 부하를 per-call connection 과 pool 로 비교한다.
+
+MySQL 호환 서버가 필요하다. 로컬에서는 아래처럼 띄우면 된다.
+
+    docker run --rm -d -p 3306:3306 -e MARIADB_ROOT_PASSWORD=bench -e MARIADB_DATABASE=bench mariadb:11
+    DB_USER=root DB_PASSWORD=bench DB_HOST=127.0.0.1 DB_NAME=bench python -m benchmark.db_pool
+
+before 는 기존 구현처럼 handler 안에서 pymysql 로 매번 연결을 열고 동기로 query 하고,
+after 는 DatabaseManager 의 aiomysql pool 을 사용한다.
+"""
+import os
+import time
+import asyncio
+import argparse
+
+import pymysql
+
+from app.provider.database_manager import DatabaseManager
+
+
+class LegacyDatabaseManager(DatabaseManager):
+    """baseline: query 마다 pymysql connection 을 새로 열고 event loop 위에서 동기로 실행한다."""
+
+    def _connect(self):
+        return pymysql.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            db=self.db_name,
+            charset="utf8",
+        )
+
+    async def _execute_select_query(self, select_table_query, params=None):
+        with self._connect() as connection:
+            cursor = connection.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(select_table_query, params)
+            return [self._format_row(row) for row in cursor.fetchall()]
+
+    async def _execute_commit_query(self, query, params):
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, params)
+            connection.commit()
+
+
+async def meeting_detail(db: DatabaseManager) -> None:
+    meetings = await db.select_all_meeting_table()
+    meeting = meetings[-1] if len(meetings) >= 1 else {}
+    attendees = await db.select_all_attendee_table()
+    _ = {"meeting": meeting, "attendees": list(attendees)}
+
+
+async def attend(db: DatabaseManager) -> None:
+    await db.update_attendee_attendance_info_table(
+        {"id": 1, "attendance_status": True, "initial_attendance_time": "24-06-01 10:00:00", "connected_device": "bench"}
+    )
+
+
+async def run_load(db: DatabaseManager, handler, concurrency: int, duration: float) -> float:
+    completed = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            await handler(db)
+            completed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return completed / (time.perf_counter() - started)
+
+
+async def seed(db: DatabaseManager, attendees: int) -> None:
+    await db.migrate()
+    await db.delete_all_meeting_table()
+    await db.delete_all_attendee_table()
+    await db.insert_meeting_with_attendees(
+        {
+            "name": "bench", "start_time": "24-06-01 10:00:00", "end_time": "24-06-01 11:00:00", "room": "A",
+            "subject": "bench", "topic": "bench", "files": "[]", "pt_contents": "", "status": "회의 시작 전",
+        },
+        [
+            {
+                "meeting_name": "bench", "name": f"attendee{i}", "organization": "org", "position": "pos",
+                "email_address": f"attendee{i}@example.com", "role": "member", "email_delivery_status": True,
+            }
+            for i in range(attendees)
+        ],
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    kwargs = dict(
+        user=os.environ["DB_USER"],
+        password=os.environ["DB_PASSWORD"],
+        host=os.environ["DB_HOST"],
+        database_name=os.environ["DB_NAME"],
+        port=int(os.environ.get("DB_PORT", 3306)),
+    )
+    pooled = DatabaseManager(**kwargs, max_pool_size=args.pool_size)
+    legacy = LegacyDatabaseManager(**kwargs)
+    pooled.logger.setLevel("WARNING")
+
+    await seed(pooled, args.attendees)
+
+    print(f"{'endpoint':<16}{'concurrency':>12}{'before req/s':>15}{'after req/s':>15}")
+    for name, handler in (("/meeting_detail", meeting_detail), ("/attend", attend)):
+        for concurrency in args.concurrency:
+            before = await run_load(legacy, handler, concurrency, args.duration)
+            after = await run_load(pooled, handler, concurrency, args.duration)
+            print(f"{name:<16}{concurrency:>12}{before:>15.1f}{after:>15.1f}")
+
+    await pooled.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--attendees", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,156 @@
+"""schema migration 전후(v4: TEXT column, v5: DATETIME/VARCHAR 와 시간 index)의 조회 지연을 비교한다.
+
+version 마다 table 을 지우고 그 version 까지만 migrate 한 뒤, 같은 데이터(기본 100k 발언)를 넣고 조회한다.
+회의 여러 개가 동시에 진행된 것처럼 발언은 회의끼리 섞여서 들어간다.
+
+MySQL 호환 서버가 필요하다. 로컬에서는 아래처럼 띄우면 된다.
+
+    docker run --rm -d -p 3306:3306 -e MARIADB_ROOT_PASSWORD=bench -e MARIADB_DATABASE=bench mariadb:11
+    DB_USER=root DB_PASSWORD=bench DB_HOST=127.0.0.1 DB_NAME=bench python -m benchmark.db_schema --versions 4 5
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List
+
+from app.provider.database_manager import DatabaseManager
+
+
+TABLES = ["qa", "attendee", "summary_state", "mail_outbox", "mail_job", "meeting", "schema_version"]
+BASE_TIME = datetime(2024, 6, 1, 9, 0, 0)
+
+
+def format_time(value: datetime) -> str:
+    return value.strftime("%y-%m-%d %H:%M:%S")
+
+
+async def reset(db: DatabaseManager, version: int) -> None:
+    for table in TABLES:
+        await db._execute_query(f"DROP TABLE IF EXISTS {table}")
+
+    await db.migrate(target_version=version)
+
+
+async def insert_qa(db: DatabaseManager, batch: List[dict]) -> None:
+    # v6 전에는 utterance_key 가 없어서 서버가 쓰는 upsert_qa_table_bulk 대신 plain INSERT 로 넣는다.
+    if batch:
+        await db._execute_transaction_query([db._build_insert_qa_table_bulk_query(batch)])
+
+
+async def seed(db: DatabaseManager, meetings: int, attendees: int, utterances: int) -> List[int]:
+    meeting_ids = []
+    for m in range(meetings):
+        meeting_ids.append(await db.insert_meeting_with_attendees(
+            {
+                "name": f"bench{m}", "start_time": format_time(BASE_TIME), "end_time": format_time(BASE_TIME),
+                "room": "A", "subject": "bench", "topic": "bench", "files": "[]", "pt_contents": "", "status": "Q&A",
+            },
+            [
+                {
+                    "meeting_name": f"bench{m}", "name": f"attendee{i}", "organization": "org", "position": "pos",
+                    "email_address": f"m{m}.attendee{i}@example.com", "role": "member", "email_delivery_status": True,
+                }
+                for i in range(attendees)
+            ],
+        ))
+
+    batch = []
+    for i in range(utterances):
+        batch.append({
+            "meeting_id": meeting_ids[i % meetings],
+            "speaker": str(i % attendees + 1),
+            "timestamp": format_time(BASE_TIME + timedelta(seconds=i)),
+            "message": f"발언 {i} 회의 안건에 대한 의견입니다.",
+        })
+        if len(batch) == 5000:
+            await insert_qa(db, batch)
+            batch = []
+    await insert_qa(db, batch)
+
+    return meeting_ids
+
+
+async def measure(query: Callable[[], Awaitable], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await query()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return latencies
+
+
+async def explain(db: DatabaseManager, query: str, params=None) -> str:
+    rows = await db._execute_select_query(f"EXPLAIN {query}", params)
+
+    return ",".join(f"{row['key'] or 'ALL'}:{row['rows']}" for row in rows)
+
+
+async def main(args: argparse.Namespace) -> None:
+    db = DatabaseManager(
+        user=os.environ["DB_USER"],
+        password=os.environ["DB_PASSWORD"],
+        host=os.environ["DB_HOST"],
+        database_name=os.environ["DB_NAME"],
+        port=int(os.environ.get("DB_PORT", 3306)),
+    )
+    db.logger.setLevel("WARNING")
+    rng = random.Random(0)
+    window = timedelta(minutes=args.window_minutes)
+    span = timedelta(seconds=args.utterances) - window
+
+    print(f"{'version':>8}  {'query':<22}{'p50 ms':>9}{'p95 ms':>9}  explain(key:rows)")
+    for version in args.versions:
+        await reset(db, version)
+        started = time.perf_counter()
+        meeting_ids = await seed(db, args.meetings, args.attendees, args.utterances)
+        print(f"{version:>8}  seeded {args.utterances} utterances in {time.perf_counter() - started:.1f}s")
+
+        def random_window():
+            start = BASE_TIME + span * rng.random()
+            return format_time(start), format_time(start + window)
+
+        meeting_id = meeting_ids[len(meeting_ids) // 2]
+        start, end = random_window()
+        queries = {
+            "transcript": (
+                lambda: db.select_qa_table_with_meeting_id(rng.choice(meeting_ids)),
+                db._build_select_qa_table_with_meeting_id_query(meeting_id), None,
+            ),
+            "transcript window": (
+                lambda: db.select_qa_table_with_time_range(rng.choice(meeting_ids), *random_window()),
+                *db._build_select_qa_table_with_time_range_query(meeting_id, start, end),
+            ),
+            "attendees": (
+                lambda: db.select_attendee_table_with_meeting_id(rng.choice(meeting_ids)),
+                db._build_select_attendee_table_with_meeting_id_query(meeting_id), None,
+            ),
+            "meeting detail": (
+                lambda: db.select_meeting_table_with_id(rng.choice(meeting_ids)),
+                db._build_select_meeting_table_query(meeting_id), None,
+            ),
+        }
+        for name, (query, sql, params) in queries.items():
+            latencies = sorted(await measure(query, args.repeat))
+            plan = await explain(db, sql, params)
+            print(
+                f"{version:>8}  {name:<22}{statistics.median(latencies):>9.2f}"
+                f"{latencies[int(len(latencies) * 0.95)]:>9.2f}  {plan}"
+            )
+
+    await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--versions", type=int, nargs="+", default=[4, 5])
+    parser.add_argument("--utterances", type=int, default=100000)
+    parser.add_argument("--meetings", type=int, default=100)
+    parser.add_argument("--attendees", type=int, default=20)
+    parser.add_argument("--window-minutes", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
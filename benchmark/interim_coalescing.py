@@ -0,0 +1,100 @@
+"""녹음된 STT response 순서를 재생해서 interim coalescing 전후의 frame 수와 전송량을 비교한다.
+
+    python -m benchmark.interim_coalescing --clients 50
+    python -m benchmark.interim_coalescing --replay responses.jsonl --rates 0 2 5 10
+
+--replay 파일은 한 줄에 {"offset_ms": 120, "transcript": "...", "is_final": false} 형식이다.
+파일을 주지 않으면 Google STT 의 interim 주기(약 100ms)를 흉내낸 sequence 를 만든다.
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import List
+
+from app.service.transcript_coalescer import InterimCoalescer
+
+
+def synthesize_responses(sentences: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    words = ["회의", "안건", "일정", "예산", "검토", "진행", "결과", "보고", "다음", "분기", "계획", "확인"]
+    responses = []
+    offset_ms = 0
+
+    for _ in range(sentences):
+        sentence = []
+        for _ in range(rng.randint(6, 16)):
+            sentence.append(rng.choice(words))
+            # 단어 하나에 interim 이 2~4 번 갱신된다.
+            for _ in range(rng.randint(2, 4)):
+                offset_ms += rng.randint(60, 140)
+                responses.append({"offset_ms": offset_ms, "transcript": " ".join(sentence), "is_final": False})
+
+        offset_ms += rng.randint(200, 400)
+        responses.append({"offset_ms": offset_ms, "transcript": " ".join(sentence), "is_final": True})
+        offset_ms += rng.randint(500, 1500)
+
+    return responses
+
+
+def load_responses(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def replay(responses: List[dict], max_interim_per_second: float, speed: float, clients: int) -> dict:
+    frames = 0
+    wire_bytes = 0
+
+    async def send(message: dict):
+        nonlocal frames, wire_bytes
+        frames += clients
+        wire_bytes += len(json.dumps(message).encode("utf-8")) * clients
+
+    # 재생 속도를 높이면 허용 rate 도 같은 비율로 올려야 결과가 실시간 재생과 같아진다.
+    coalescer = InterimCoalescer(send, max_interim_per_second * speed)
+    started = time.monotonic()
+
+    with coalescer:
+        for response in responses:
+            delay = response["offset_ms"] / 1000 / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            await coalescer.push({
+                "type": "q&a",
+                "id": 1,
+                "message": response["transcript"],
+                "is_done": response["is_final"],
+                "timestamp": int(time.time()),
+            })
+
+    return {"frames": frames, "bytes": wire_bytes}
+
+
+async def main(args: argparse.Namespace) -> None:
+    responses = load_responses(args.replay) if args.replay else synthesize_responses(args.sentences)
+    interim = sum(1 for x in responses if not x["is_final"])
+    duration = responses[-1]["offset_ms"] / 1000
+
+    print(f"responses={len(responses)} (interim={interim}) audio={duration:.1f}s clients={args.clients}")
+    print(f"{'max interim/s':>14}{'frames':>12}{'bytes':>14}{'vs off':>10}")
+
+    baseline = None
+    for rate in args.rates:
+        result = await replay(responses, rate, args.speed, args.clients)
+        baseline = baseline or result
+        ratio = result["bytes"] / baseline["bytes"]
+        label = "off" if rate == 0 else f"{rate:g}"
+        print(f"{label:>14}{result['frames']:>12}{result['bytes']:>14}{ratio:>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--replay", default=None)
+    parser.add_argument("--sentences", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--rates", type=float, nargs="+", default=[0, 10, 5, 2])
+    parser.add_argument("--speed", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
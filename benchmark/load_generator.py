@@ -0,0 +1,235 @@
+"""동시 회의 부하 테스트.
+
+회의 하나에 chat socket(/meetings/{meeting_id}/ws/{client_id}) N 개와
+audio socket(/meetings/{meeting_id}/ws/transcribe/{client_id}) M 개를 열고,
+WAV 를 실시간 속도로 흘려보내면서 audio 가 서버에 도착한 시각부터 chat client 가
+broadcast 를 받은 시각까지의 latency 를 잰다. 서버는 local STT backend 로 띄운다.
+
+    STT_BACKEND=local TRACE_SAMPLE_RATE=1 uvicorn app.main:app --port 8080 &
+    pip install websockets
+    python -m benchmark.load_generator --steps 10:2 50:10 100:20 --duration 30 --server-pid $(pgrep -f "uvicorn app.main")
+
+서버는 없는 회의의 socket 을 1008 로 닫으므로 시작할 때 /reserve 로 부하용 회의를 하나 예약한다.
+이미 있는 회의에 붙으려면 --meeting-id 로 그 id 를 넘긴다.
+
+latency 는 message 의 trace.audio_received_at 을 기준으로 하므로 모든 발언에 trace 가 붙도록
+TRACE_SAMPLE_RATE=1 로 띄우고, load generator 와 서버가 같은 host (같은 시계) 에 있어야 한다.
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+from collections import defaultdict
+from typing import List, Optional
+
+import websockets
+
+from benchmark.vad_suppression import load_wav, synthesize
+
+
+SAMPLE_RATE = 16000
+
+
+class ProcessSampler:
+    """/proc 에서 서버 process 들의 CPU 시간과 RSS 를 읽는다."""
+
+    def __init__(self, pids: List[int]):
+        self.pids = pids
+        self._ticks = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self) -> float:
+        total = 0
+        for pid in self.pids:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += int(fields[11]) + int(fields[12])
+
+        return total / self._ticks
+
+    def rss_bytes(self) -> int:
+        total = 0
+        for pid in self.pids:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+
+        return total
+
+
+class StepResult:
+    def __init__(self):
+        self.latency = {"interim": [], "final": []}
+        self.received = defaultdict(int)
+        self.sent_chunks = 0
+        self.late_chunks = 0
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def chat_client(url: str, client_id: int, result: StepResult, stop: asyncio.Event) -> None:
+    async with websockets.connect(f"{url}/ws/{client_id}", max_queue=None) as websocket:
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(websocket.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+
+            received_at = time.time() * 1000
+            message = json.loads(raw)
+            audio_received_at = message.get("trace", {}).get("audio_received_at")
+            if message.get("type") != "q&a" or audio_received_at is None:
+                continue
+
+            kind = "final" if message["is_done"] else "interim"
+            result.latency[kind].append(received_at - audio_received_at)
+            if kind == "final":
+                result.received[(message["id"], message["timestamp"], message["message"])] += 1
+
+
+async def speaker_client(url: str, client_id: int, audio: bytes, chunk_ms: int, result: StepResult, stop: asyncio.Event) -> None:
+    chunk_bytes = SAMPLE_RATE * 2 * chunk_ms // 1000
+
+    async with websockets.connect(f"{url}/ws/transcribe/{client_id}") as websocket:
+        started = time.monotonic()
+        offset = 0
+        index = 0
+
+        while not stop.is_set():
+            chunk = audio[offset:offset + chunk_bytes]
+            if len(chunk) < chunk_bytes:
+                offset = 0
+                continue
+
+            await websocket.send(chunk)
+            result.sent_chunks += 1
+            offset += chunk_bytes
+            index += 1
+
+            # 실시간 속도 유지: 다음 chunk 를 보낼 시각까지 기다린다.
+            delay = started + index * chunk_ms / 1000 - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                result.late_chunks += 1
+
+
+def reserve_meeting(http_url: str) -> int:
+    now = datetime.now()
+    reserve_data = {
+        "name": "load test",
+        "start_time": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "end_time": (now + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+        "room": "load test",
+        "subject": "load test",
+        "topic": "load test",
+    }
+    body = urllib.parse.urlencode(
+        {"reserve_data": json.dumps(reserve_data), "attendees_data": "[]"}
+    ).encode()
+    with urllib.request.urlopen(f"{http_url}/reserve", data=body, timeout=10) as response:
+        return json.loads(response.read())["meeting_id"]
+
+
+def fetch_fanout_status(http_url: str) -> Optional[dict]:
+    try:
+        with urllib.request.urlopen(f"{http_url}/fanout_status", timeout=5) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+
+def count_dropped(status: Optional[dict]) -> int:
+    if status is None:
+        return 0
+
+    # fanout_status 는 회의별로 나뉘어 있다.
+    return sum(
+        x["dropped"] for room in status.values() for group in ("chat", "audio") for x in room[group].values()
+    )
+
+
+def to_http_url(url: str) -> str:
+    return url.replace("ws://", "http://").replace("wss://", "https://")
+
+
+async def run_step(args: argparse.Namespace, chats: int, speakers: int, audio: bytes, sampler: Optional[ProcessSampler]) -> None:
+    result = StepResult()
+    stop = asyncio.Event()
+    http_url = to_http_url(args.url)
+    meeting_url = f"{args.url}/meetings/{args.meeting_id}"
+
+    # chat client id 1..N 중 앞의 M 명이 발언자다.
+    tasks = [asyncio.create_task(chat_client(meeting_url, i, result, stop)) for i in range(1, chats + 1)]
+    await asyncio.sleep(1)
+    tasks += [
+        asyncio.create_task(speaker_client(meeting_url, i, audio, args.chunk_ms, result, stop))
+        for i in range(1, speakers + 1)
+    ]
+
+    cpu_before = sampler.cpu_seconds() if sampler else 0.0
+    started = time.monotonic()
+    await asyncio.sleep(args.duration)
+
+    elapsed = time.monotonic() - started
+    cpu = (sampler.cpu_seconds() - cpu_before) / elapsed if sampler else float("nan")
+    rss = sampler.rss_bytes() if sampler else 0
+    fanout = fetch_fanout_status(http_url)
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    missing_finals = sum(chats - count for count in result.received.values())
+    connections = chats + speakers
+
+    for kind in ("interim", "final"):
+        values = result.latency[kind]
+        print(
+            f"{chats:>6}{speakers:>9}{kind:>9}{len(values):>9}"
+            f"{percentile(values, 50):>9.1f}{percentile(values, 95):>9.1f}{percentile(values, 99):>9.1f}"
+        )
+
+    print(
+        f"{'':>6}{'':>9}  missing finals={missing_finals} server dropped={count_dropped(fanout)} "
+        f"late chunks={result.late_chunks}/{result.sent_chunks} cpu={cpu:.1%} "
+        f"rss={rss / 2 ** 20:.1f}MiB ({rss / connections / 2 ** 10:.1f}KiB/conn)"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    audio = b"".join(load_wav(path) for path in args.wav) if args.wav else synthesize(60)
+    sampler = ProcessSampler(args.server_pid) if args.server_pid else None
+    if args.meeting_id is None:
+        args.meeting_id = reserve_meeting(to_http_url(args.url))
+    print(f"meeting #{args.meeting_id}")
+
+    print(f"{'chats':>6}{'speakers':>9}{'kind':>9}{'count':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for step in args.steps:
+        chats, speakers = (int(x) for x in step.split(":"))
+        await run_step(args, chats, speakers, audio, sampler)
+        await asyncio.sleep(args.cooldown)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="ws://127.0.0.1:8080")
+    parser.add_argument("--meeting-id", type=int, default=None, help="없으면 시작할 때 회의를 예약한다")
+    parser.add_argument("--steps", nargs="+", default=["10:2", "50:10"], help="chat:speaker 연결 수")
+    parser.add_argument("--wav", nargs="*", default=[])
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--cooldown", type=float, default=3.0)
+    parser.add_argument("--server-pid", type=int, nargs="*", default=[])
+    asyncio.run(main(parser.parse_args()))
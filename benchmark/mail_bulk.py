@@ -0,0 +1,97 @@
+"""회의록 메일을 수신자마다 새로 만들어 보내는 기존 방식과, 한번만 encode 해서 재사용하는 방식을 비교한다.
+
+client 의 CPU 시간과 SMTP round trip 수를 잰다. sink(aiosmtpd) 는 CPU 시간이 섞이지 않도록 별도 process 에서 띄운다.
+round trip 은 transaction 마다 MAIL, DATA, 본문 끝 3번과 수신자마다 RCPT 1번으로 센다.
+
+    pip install aiosmtpd
+    python -m benchmark.mail_bulk --recipients 500 --batch-sizes 1 50
+"""
+import time
+import asyncio
+import argparse
+import multiprocessing
+from typing import List
+
+from app.service.mail_service import MailServiceManager
+from app.service.mail_dispatcher import MailDispatcher
+from benchmark.mail_throughput import SUMMARY, MemoryOutbox, make_mail_service, send_legacy
+
+
+def run_sink(port: int, transactions, recipients, ready) -> None:
+    from aiosmtpd.controller import Controller
+
+    class CountingHandler:
+        async def handle_DATA(self, server, session, envelope):
+            with transactions.get_lock():
+                transactions.value += 1
+                recipients.value += len(envelope.rcpt_tos)
+            return "250 OK"
+
+    controller = Controller(CountingHandler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    ready.set()
+    while True:
+        time.sleep(3600)
+
+
+def run_legacy(mail_service: MailServiceManager, addresses: List[str]) -> None:
+    smtp = mail_service.connect()
+    for address in addresses:
+        send_legacy(mail_service, smtp, address, SUMMARY)
+    smtp.quit()
+
+
+async def run_dispatcher(mail_service: MailServiceManager, addresses: List[str], batch_size: int) -> None:
+    outbox = MemoryOutbox()
+    outbox.expected = len(addresses)
+    dispatcher = MailDispatcher(mail_service, outbox, pool_size=1, recipients_per_transaction=batch_size)
+    await dispatcher.start()
+    await dispatcher.submit(SUMMARY, addresses)
+    await outbox.done.wait()
+    await dispatcher.stop()
+
+
+def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    transactions = multiprocessing.Value("i", 0)
+    recipients = multiprocessing.Value("i", 0)
+    ready = multiprocessing.Event()
+    sink = multiprocessing.Process(target=run_sink, args=(args.port, transactions, recipients, ready), daemon=True)
+    sink.start()
+    ready.wait()
+
+    mail_service = make_mail_service(args.port)
+    addresses = [f"attendee{i}@example.com" for i in range(args.recipients)]
+
+    print(f"{'mode':<16}{'cpu ms':>9}{'wall s':>9}{'transactions':>14}{'round trips':>13}{'delivered':>11}")
+    try:
+        for mode in ["per-recipient"] + [f"render-once/{size}" for size in args.batch_sizes]:
+            transactions.value = 0
+            recipients.value = 0
+
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            if mode == "per-recipient":
+                run_legacy(mail_service, addresses)
+            else:
+                asyncio.run(run_dispatcher(mail_service, addresses, int(mode.split("/")[1])))
+            elapsed = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+
+            round_trips = transactions.value * 3 + recipients.value
+            print(
+                f"{mode:<16}{cpu * 1000:>9.1f}{elapsed:>9.2f}{transactions.value:>14}"
+                f"{round_trips:>13}{recipients.value:>11}"
+            )
+    finally:
+        sink.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 50])
+    parser.add_argument("--port", type=int, default=8027)
+    main(parser.parse_args())
@@ -0,0 +1,164 @@
+"""/mail_send 의 발송 처리량을 기존 방식(연결 하나로 순서대로 발송)과 mail dispatcher 로 비교한다.
+
+local SMTP sink 로 aiosmtpd 를 띄우고, --server-delay-ms 로 실제 SMTP 서버의 응답 지연을 흉내낸다.
+DB 대신 memory outbox 를 쓴다.
+
+    pip install aiosmtpd
+    python -m benchmark.mail_throughput --recipients 200 --pool-sizes 1 2 4 8
+"""
+import time
+import asyncio
+import argparse
+import threading
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import List
+
+from aiosmtpd.controller import Controller
+
+from app.service.mail_service import MailServiceManager
+from app.service.mail_dispatcher import MailDispatcher
+
+
+SUMMARY = "제목: 주간 회의\n참석자: 참석자1, 참석자2\n회의 요약:\n" + "회의 요약 내용입니다. " * 200
+
+
+class SinkHandler:
+    def __init__(self, delay_ms: float, fail_every: int):
+        self.delay_ms = delay_ms
+        self.fail_every = fail_every
+        self.messages = 0
+        self.transactions = 0
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.delay_ms / 1000)
+        with self._lock:
+            self.transactions += 1
+            if self.fail_every and self.transactions % self.fail_every == 0:
+                return "451 Temporary failure"
+            self.messages += len(envelope.rcpt_tos)
+
+        return "250 OK"
+
+
+class MemoryOutbox:
+    """MailDispatcher 가 쓰는 DatabaseManager method 만 memory 로 구현한다."""
+
+    def __init__(self):
+        self.jobs: dict[int, dict] = {}
+        self.rows: dict[int, dict] = {}
+        self.done = asyncio.Event()
+        self.expected = 0
+
+    async def insert_mail_job_table(self, data: dict, addresses: List[str]) -> int:
+        job_id = len(self.jobs) + 1
+        self.jobs[job_id] = {"id": job_id, **data}
+        for address in addresses:
+            row_id = len(self.rows) + 1
+            self.rows[row_id] = {
+                "id": row_id, "job_id": job_id, "address": address, "status": "pending", "attempts": 0, "last_error": None,
+            }
+
+        return job_id
+
+    async def select_mail_job_table_with_id(self, id: int) -> List[dict]:
+        return [self.jobs[id]] if id in self.jobs else []
+
+    async def select_mail_outbox_table_with_job_id(self, job_id: int) -> List[dict]:
+        return [dict(row) for row in self.rows.values() if row["job_id"] == job_id]
+
+    async def select_pending_mail_outbox_table(self) -> List[dict]:
+        return []
+
+    async def update_mail_outbox_table(self, data: dict) -> None:
+        self.rows[data["id"]].update(data)
+        if sum(row["status"] != "pending" for row in self.rows.values()) >= self.expected:
+            self.done.set()
+
+
+def make_mail_service(port: int) -> MailServiceManager:
+    return MailServiceManager("minutes@example.com", "", host="127.0.0.1", port=port, use_ssl=False)
+
+
+def send_legacy(mail_service: MailServiceManager, smtp, address: str, content: str) -> None:
+    # 기존 handler 가 하던 대로 수신자마다 MIME message 를 새로 만들어 한 명씩 보낸다.
+    msg = MIMEMultipart()
+    msg["Subject"] = "회의록"
+    msg["From"] = mail_service._account
+    msg["To"] = address
+    msg.attach(MIMEText(content, "plain"))
+
+    smtp.sendmail(mail_service._account, address, msg.as_string())
+
+
+def run_legacy(port: int, addresses: List[str]) -> float:
+    mail_service = make_mail_service(port)
+    smtp = mail_service.connect()
+
+    started = time.perf_counter()
+    for address in addresses:
+        try:
+            send_legacy(mail_service, smtp, address, SUMMARY)
+        except Exception:
+            # 기존 handler 는 실패한 수신자를 다시 보내지 않는다.
+            pass
+    elapsed = time.perf_counter() - started
+    smtp.quit()
+
+    return elapsed
+
+
+async def run_dispatcher(port: int, addresses: List[str], pool_size: int) -> tuple:
+    outbox = MemoryOutbox()
+    outbox.expected = len(addresses)
+    dispatcher = MailDispatcher(make_mail_service(port), outbox, pool_size=pool_size, base_backoff=0.05)
+    await dispatcher.start()
+
+    started = time.perf_counter()
+    await dispatcher.submit(SUMMARY, addresses)
+    enqueued = time.perf_counter() - started
+    await outbox.done.wait()
+    elapsed = time.perf_counter() - started
+
+    await dispatcher.stop()
+    failed = sum(row["status"] == "failed" for row in outbox.rows.values())
+
+    return enqueued, elapsed, dispatcher.retried, failed
+
+
+async def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    addresses = [f"attendee{i}@example.com" for i in range(args.recipients)]
+
+    print(f"{'mode':<14}{'enqueue ms':>12}{'total s':>10}{'mails/s':>10}{'retried':>9}{'failed':>8}{'delivered':>11}")
+    for mode in ["legacy"] + [f"pool={size}" for size in args.pool_sizes]:
+        handler = SinkHandler(args.server_delay_ms, args.fail_every)
+        controller = Controller(handler, hostname="127.0.0.1", port=args.port)
+        controller.start()
+        try:
+            if mode == "legacy":
+                elapsed = await asyncio.to_thread(run_legacy, args.port, addresses)
+                enqueued, retried, failed = elapsed, 0, args.recipients - handler.messages
+            else:
+                pool_size = int(mode.split("=")[1])
+                enqueued, elapsed, retried, failed = await run_dispatcher(args.port, addresses, pool_size)
+        finally:
+            controller.stop()
+
+        print(
+            f"{mode:<14}{enqueued * 1000:>12.1f}{elapsed:>10.2f}{args.recipients / elapsed:>10.1f}"
+            f"{retried:>9}{failed:>8}{handler.messages:>11}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=200)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--server-delay-ms", type=float, default=20.0, help="sink 가 DATA 에 응답하기 전 지연")
+    parser.add_argument("--fail-every", type=int, default=0, help="N 번째 transaction 마다 451 로 실패시킨다")
+    parser.add_argument("--port", type=int, default=8025)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,155 @@
+"""metrics 를 켰을 때 websocket hot path 가 얼마나 느려지는지 잰다.
+
+- update  : bound child 의 Counter.inc / Histogram.observe 한 번의 비용
+- chat    : 채팅 websocket 이 받은 메시지를 ChatServiceManager.broadcast_json 으로 참석자 전원에게 보내는 경로.
+            fanout_broadcast_seconds 와 fanout_frames_total 이 갱신된다.
+- stt     : listen_print_loop 가 STT 결과를 메시지로 바꾸는 경로. stt_results_total 이 갱신된다.
+- render  : 회의 N 개, 화자 M 명일 때 /metrics 응답을 만드는 시간
+
+같은 작업을 METRICS_ENABLED=0 과 같은 상태(REGISTRY.enabled = False)와 번갈아 돌려서 중앙값을 비교한다.
+
+    python -m benchmark.metrics_overhead --attendees 20 --messages 2000 --rounds 7
+"""
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+from app.util.metrics import REGISTRY, MetricsRegistry
+from app.service.chat_service import ChatServiceManager
+from app.service.stt.base import SttResult
+from app.provider.audio_manager import ResumableMicrophoneSocketStream, listen_print_loop
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def time_updates(count: int) -> dict:
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "").labels()
+    histogram = registry.histogram("bench_seconds", "").labels()
+
+    result = {}
+    for name, update in (("counter", lambda: counter.inc()), ("histogram", lambda: histogram.observe(0.003))):
+        for enabled in (True, False):
+            registry.enabled = enabled
+            started = time.perf_counter()
+            for _ in range(count):
+                update()
+            result[(name, enabled)] = (time.perf_counter() - started) / count
+
+    return result
+
+
+async def chat_round(attendees: int, messages: int) -> float:
+    chat = ChatServiceManager(max_queue_size=messages + 8)
+    sockets = [FakeWebSocket() for _ in range(attendees)]
+    for client_id, websocket in enumerate(sockets):
+        await chat.connect(websocket, client_id)
+
+    payloads = [
+        json.dumps({"type": "q&a", "id": n % attendees, "message": f"발언 {n}", "is_done": True})
+        for n in range(messages)
+    ]
+
+    # 받은 text 를 json 으로 읽고 다시 broadcast 하는 websocket loop 와 같은 일을 한다.
+    started = time.process_time()
+    for data in payloads:
+        json_data = json.loads(data)
+        await chat.broadcast(data, None if json_data["is_done"] else f"q&a:{json_data['id']}")
+    while sum(websocket.frames for websocket in sockets) < attendees * (messages + 2):
+        await asyncio.sleep(0)
+    elapsed = time.process_time() - started
+
+    chat.end_meeting()
+    return elapsed / messages
+
+
+async def stt_round(results: int) -> float:
+    stream = ResumableMicrophoneSocketStream()
+
+    async def fake_results():
+        for n in range(results):
+            yield SttResult(transcript=f"회의 안건 {n}", is_final=n % 20 == 19, result_end_time=n * 100)
+
+    started = time.process_time()
+    async for _ in listen_print_loop(fake_results(), stream, 1):
+        pass
+    return (time.process_time() - started) / results
+
+
+def render_time(meetings: int, speakers: int) -> tuple[float, int]:
+    registry = MetricsRegistry()
+    queue = registry.gauge("audio_queue_chunks", "", ["meeting_id", "client_id"])
+    restarts = registry.gauge("stt_session_restarts", "", ["meeting_id", "client_id"])
+    latency = registry.histogram("db_query_seconds", "", ["method"])
+    for method in range(35):
+        latency.labels(f"method_{method}").observe(0.004)
+
+    def collect():
+        queue.clear()
+        restarts.clear()
+        for meeting_id in range(meetings):
+            for client_id in range(speakers):
+                queue.labels(meeting_id, client_id).set(3)
+                restarts.labels(meeting_id, client_id).set(1)
+
+    registry.add_collector(collect)
+    started = time.perf_counter()
+    body = registry.render()
+    return time.perf_counter() - started, len(body)
+
+
+async def compare(label: str, rounds: int, run) -> None:
+    timings = {True: [], False: []}
+    for _ in range(rounds):
+        for enabled in (True, False):
+            REGISTRY.enabled = enabled
+            timings[enabled].append(await run())
+    REGISTRY.enabled = True
+
+    on, off = statistics.median(timings[True]), statistics.median(timings[False])
+    print(f"{label:<8}{on * 1e6:>12.2f}{off * 1e6:>12.2f}{(on - off) * 1e6:>12.2f}{(on / off - 1) * 100:>11.1f}%")
+
+
+async def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    updates = time_updates(args.updates)
+    print(f"{'update':<12}{'on ns':>10}{'off ns':>10}")
+    for name in ("counter", "histogram"):
+        print(f"{name:<12}{updates[(name, True)] * 1e9:>10.0f}{updates[(name, False)] * 1e9:>10.0f}")
+
+    print()
+    print(f"{'path':<8}{'on us/msg':>12}{'off us/msg':>12}{'delta us':>12}{'overhead':>12}")
+    await compare("chat", args.rounds, lambda: chat_round(args.attendees, args.messages))
+    await compare("stt", args.rounds, lambda: stt_round(args.results))
+
+    print()
+    seconds, size = render_time(args.meetings, args.speakers)
+    print(f"render  {args.meetings} meetings x {args.speakers} speakers : {seconds * 1000:.2f} ms, {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attendees", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--results", type=int, default=20000)
+    parser.add_argument("--updates", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--meetings", type=int, default=50)
+    parser.add_argument("--speakers", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
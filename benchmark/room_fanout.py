@@ -0,0 +1,99 @@
+"""회의별 room 으로 나눈 fan-out 과, 모든 참석자를 하나의 global room 에 둔 기존 방식을 비교한다.
+
+회의 N 개에 참석자 M 명씩 붙이고, 회의마다 발언을 broadcast 한다.
+client 가 받은 frame 중 다른 회의의 발언(cross-room)이 있는지 세고, 전송 frame 수와 CPU 시간을 잰다.
+실제 socket 대신 받은 frame 만 기록하는 fake websocket 을 쓴다.
+
+    python -m benchmark.room_fanout --meetings 1 10 50 --attendees 20 --messages 50
+"""
+import json
+import time
+import asyncio
+import argparse
+from typing import List
+
+from app.service.chat_service import ChatServiceManager
+
+
+class FakeWebSocket:
+    def __init__(self, meeting_id: int):
+        self.meeting_id = meeting_id
+        self.frames = 0
+        self.cross_room = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.frames += 1
+        message = json.loads(data)
+        if message.get("type") == "q&a" and message["meeting_id"] != self.meeting_id:
+            self.cross_room += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def run(meetings: int, attendees: int, messages: int, scoped: bool) -> dict:
+    rooms = {meeting_id: ChatServiceManager(max_queue_size=messages + 8) for meeting_id in range(1, meetings + 1)}
+    if not scoped:
+        shared = ChatServiceManager(max_queue_size=messages * meetings + 8)
+        rooms = {meeting_id: shared for meeting_id in rooms}
+
+    sockets: List[FakeWebSocket] = []
+    for meeting_id, room in rooms.items():
+        for i in range(attendees):
+            websocket = FakeWebSocket(meeting_id)
+            # global room 에서는 client id 가 회의끼리 겹치지 않아야 한다.
+            await room.connect(websocket, meeting_id * 10000 + i)
+            sockets.append(websocket)
+
+    # connect 때 보내는 mic 상태와 q&a 목록 frame 은 세지 않는다.
+    while any(websocket.frames < 2 for websocket in sockets):
+        await asyncio.sleep(0.001)
+    for websocket in sockets:
+        websocket.frames = 0
+
+    cpu_started = time.process_time()
+    for n in range(messages):
+        for meeting_id, room in rooms.items():
+            await room.broadcast_json(
+                {"type": "q&a", "meeting_id": meeting_id, "id": 1, "message": f"발언 {n}", "is_done": True}
+            )
+    expected = meetings * attendees * messages
+    while sum(websocket.frames for websocket in sockets) < (expected if scoped else expected * meetings):
+        await asyncio.sleep(0.001)
+    cpu = time.process_time() - cpu_started
+
+    writers = [subscriber._task for room in set(rooms.values()) for subscriber in room.fanout.subscribers.values()]
+    for room in set(rooms.values()):
+        room.end_meeting()
+    await asyncio.gather(*writers, return_exceptions=True)
+
+    return {
+        "frames": sum(websocket.frames for websocket in sockets),
+        "cross_room": sum(websocket.cross_room for websocket in sockets),
+        "cpu": cpu,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+
+    print(f"{'meetings':>9}{'mode':>8}{'frames':>10}{'cross-room':>12}{'cpu ms':>10}{'us/frame':>10}")
+    for meetings in args.meetings:
+        for scoped in (False, True):
+            result = await run(meetings, args.attendees, args.messages, scoped)
+            print(
+                f"{meetings:>9}{'rooms' if scoped else 'global':>8}{result['frames']:>10}{result['cross_room']:>12}"
+                f"{result['cpu'] * 1000:>10.1f}{result['cpu'] * 1e6 / result['frames']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meetings", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--attendees", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
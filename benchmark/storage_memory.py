@@ -0,0 +1,128 @@
+"""object storage upload / download 의 메모리 사용량을 기존 방식과 streaming 방식으로 비교한다.
+
+S3 호환 서버가 필요하다. 로컬에서는 moto 나 MinIO 를 쓰면 된다.
+
+    pip install "moto[server]" && moto_server -p 5000 &
+    python -m benchmark.storage_memory --endpoint-url http://127.0.0.1:5000 --size-mb 500
+
+각 방식은 새 process 에서 돌리고, 그 process 의 peak RSS 에서 시작 시점 RSS 를 뺀 값을 보고한다.
+"""
+import io
+import os
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+import boto3
+
+from app.service.storage_service import StorageServiceManager, MB
+
+
+BUCKET = "benchmark"
+KEY = "benchmark.bin"
+
+
+def current_rss() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+
+    return 0
+
+
+def peak_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_client(endpoint_url: str):
+    return boto3.client(
+        "s3",
+        aws_access_key_id="benchmark",
+        aws_secret_access_key="benchmark",
+        region_name="us-east-1",
+        endpoint_url=endpoint_url,
+    )
+
+
+def legacy_upload(client, path: str) -> None:
+    with open(path, "rb") as f:
+        client.put_object(Bucket=BUCKET, Key=KEY, Body=f)
+
+
+def stream_upload(client, path: str) -> None:
+    storage = StorageServiceManager(client, BUCKET)
+    with open(path, "rb") as f:
+        asyncio.run(storage.upload(f, KEY))
+
+
+def legacy_download(client, path: str) -> None:
+    s3_object = client.get_object(Bucket=BUCKET, Key=KEY)
+    body = io.BytesIO(s3_object["Body"].read())
+    while body.read(MB):
+        pass
+
+
+def stream_download(client, path: str) -> None:
+    storage = StorageServiceManager(client, BUCKET)
+
+    async def run():
+        size = await storage.get_size(KEY)
+        for _ in await storage.open_range(KEY, 0, size - 1):
+            pass
+
+    asyncio.run(run())
+
+
+def worker(mode: str, endpoint_url: str, path: str, queue: multiprocessing.Queue) -> None:
+    client = make_client(endpoint_url)
+    client.list_buckets()
+    baseline = current_rss()
+
+    started = time.perf_counter()
+    globals()[mode](client, path)
+    elapsed = time.perf_counter() - started
+
+    queue.put((peak_rss() - baseline, elapsed))
+
+
+def make_file(size_mb: int) -> str:
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    with os.fdopen(fd, "wb") as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(MB))
+
+    return path
+
+
+def main(args: argparse.Namespace) -> None:
+    client = make_client(args.endpoint_url)
+    try:
+        client.create_bucket(Bucket=BUCKET)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    path = make_file(args.size_mb)
+    print(f"file size : {args.size_mb} MB")
+    print(f"{'mode':<18}{'peak RSS delta MB':>20}{'seconds':>10}")
+
+    try:
+        for mode in ("legacy_upload", "stream_upload", "legacy_download", "stream_download"):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=worker, args=(mode, args.endpoint_url, path, queue))
+            process.start()
+            rss, elapsed = queue.get()
+            process.join()
+            print(f"{mode:<18}{rss / MB:>20.1f}{elapsed:>10.2f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoint-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--size-mb", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,112 @@
+"""회의 길이에 따른 요약 wall time 을 single pass 와 map-reduce 로 비교한다.
+
+OpenAI 대신 가짜 completion client 를 쓰고, 응답 시간은 prompt / 출력 token 수로 흉내낸다.
+
+    python -m benchmark.summarize_scaling --utterances 100 1000 5000 --concurrency 8
+"""
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+from typing import List
+
+from app.model.utterance import Utterance
+from app.service.llm.gpt_service import GptServiceManager
+
+
+class FakeCompletionClient:
+    """chat.completions.create 만 흉내내는 client. 호출 수와 token 수를 센다."""
+
+    def __init__(self, base_ms: float, prefill_ms_per_1k: float, output_ms_per_token: float, output_tokens: int, time_scale: float):
+        self.base_ms = base_ms
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self.output_ms_per_token = output_ms_per_token
+        self.output_tokens = output_tokens
+        self.time_scale = time_scale
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.max_prompt_tokens = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model: str, messages: List[dict], stream: bool = False, **kwargs):
+        prompt = messages[0]["content"][0]["text"]
+        tokens = GptServiceManager.estimate_tokens(prompt)
+        self.calls += 1
+        self.prompt_tokens += tokens
+        self.max_prompt_tokens = max(self.max_prompt_tokens, tokens)
+
+        first_token_ms = self.base_ms + tokens / 1000 * self.prefill_ms_per_1k
+        if stream:
+            await asyncio.sleep(first_token_ms / 1000 * self.time_scale)
+            return self._stream()
+
+        await asyncio.sleep((first_token_ms + self.output_tokens * self.output_ms_per_token) / 1000 * self.time_scale)
+
+        content = "요약 " * self.output_tokens
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def _stream(self):
+        # token 마다 짧게 sleep 하면 timer 오차가 쌓이므로 도착 예정 시각에 맞춰 기다린다.
+        started = time.perf_counter()
+        for i in range(self.output_tokens):
+            delay = started + i * self.output_ms_per_token / 1000 * self.time_scale - time.perf_counter()
+            await asyncio.sleep(delay if delay > 0.001 else 0)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="요약 "))])
+
+
+class NullLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+
+def make_utterances(count: int, seed: int = 0) -> List[Utterance]:
+    rng = random.Random(seed)
+    words = ["회의", "안건", "일정", "예산", "검토", "진행", "결과", "보고", "다음", "분기", "계획", "확인", "의견", "공유"]
+
+    return [
+        Utterance(
+            timestamp=f"24-06-01 10:{i // 60 % 60:02d}:{i % 60:02d}",
+            speaker=f"참석자{rng.randint(1, 8)}",
+            text=" ".join(rng.choice(words) for _ in range(rng.randint(5, 30))),
+        )
+        for i in range(count)
+    ]
+
+
+async def run(utterances: List[Utterance], budget: int, args: argparse.Namespace) -> tuple:
+    client = FakeCompletionClient(args.base_ms, args.prefill_ms_per_1k, args.output_ms_per_token, args.output_tokens, args.time_scale)
+    service = GptServiceManager(NullLogger(), client=client, chunk_token_budget=budget, max_concurrency=args.concurrency)
+
+    started = time.perf_counter()
+    await service.summarize(utterances)
+    elapsed = (time.perf_counter() - started) / args.time_scale
+
+    return elapsed, client
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'utterances':>10}{'mode':>12}{'calls':>7}{'max prompt tok':>16}{'total prompt tok':>18}{'wall s':>9}")
+    for count in args.utterances:
+        utterances = make_utterances(count)
+        for mode, budget in (("single", 10 ** 9), ("map-reduce", args.chunk_tokens)):
+            elapsed, client = await run(utterances, budget, args)
+            note = "  (context 초과)" if client.max_prompt_tokens > args.context_tokens else ""
+            print(
+                f"{count:>10}{mode:>12}{client.calls:>7}{client.max_prompt_tokens:>16}"
+                f"{client.prompt_tokens:>18}{elapsed:>9.2f}{note}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, nargs="+", default=[100, 500, 2000, 5000])
+    parser.add_argument("--chunk-tokens", type=int, default=24000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--context-tokens", type=int, default=128000)
+    parser.add_argument("--base-ms", type=float, default=400)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=60)
+    parser.add_argument("--output-ms-per-token", type=float, default=15)
+    parser.add_argument("--output-tokens", type=int, default=500)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="가짜 latency 를 실제로 기다리는 비율")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,65 @@
+"""요약 cache 의 hit ratio 와 절약한 token / 시간을 잰다.
+
+회의가 진행되면서 발언이 조금씩 늘어나고, 그 사이 의장이 요약 버튼을 여러 번 누르는 상황을 흉내낸다.
+가짜 completion client 는 benchmark.summarize_scaling 의 것을 쓴다.
+
+    python -m benchmark.summary_cache --utterances 2000 --step 50 --presses 3
+    python -m benchmark.summary_cache --cache-dir /tmp/summary-cache   # disk tier 포함
+"""
+import time
+import asyncio
+import argparse
+from typing import Optional
+
+from app.service.llm.gpt_service import GptServiceManager
+from app.service.llm.summary_cache import SummaryCache
+from benchmark.summarize_scaling import FakeCompletionClient, NullLogger, make_utterances
+
+
+async def run(args: argparse.Namespace, cache: Optional[SummaryCache]) -> tuple:
+    client = FakeCompletionClient(args.base_ms, args.prefill_ms_per_1k, args.output_ms_per_token, args.output_tokens, args.time_scale)
+    service = GptServiceManager(
+        NullLogger(), client=client, chunk_token_budget=args.chunk_tokens, max_concurrency=args.concurrency, cache=cache
+    )
+    utterances = make_utterances(args.utterances)
+
+    started = time.perf_counter()
+    for count in range(args.step, args.utterances + 1, args.step):
+        # 같은 시점에 버튼을 여러 번 누르면 동시에 요청이 들어온다.
+        await asyncio.gather(*(service.summarize(utterances[:count]) for _ in range(args.presses)))
+    elapsed = (time.perf_counter() - started) / args.time_scale
+
+    return elapsed, client
+
+
+async def main(args: argparse.Namespace) -> None:
+    baseline, baseline_client = await run(args, None)
+    cache = SummaryCache(max_entries=args.max_entries, directory=args.cache_dir)
+    elapsed, client = await run(args, cache)
+    stats = cache.stats()
+
+    print(f"{'mode':<10}{'calls':>8}{'prompt tok':>14}{'wall s':>10}")
+    print(f"{'no cache':<10}{baseline_client.calls:>8}{baseline_client.prompt_tokens:>14}{baseline:>10.2f}")
+    print(f"{'cache':<10}{client.calls:>8}{client.prompt_tokens:>14}{elapsed:>10.2f}")
+    print(
+        f"hit ratio={stats['hit_ratio']:.1%} (memory {stats['memory_hits']}, disk {stats['disk_hits']}, "
+        f"coalesced {stats['coalesced']}, miss {stats['misses']}) "
+        f"saved tokens={stats['saved_tokens']} saved model time={stats['saved_seconds'] / args.time_scale:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, default=2000)
+    parser.add_argument("--step", type=int, default=100, help="요약 요청 사이에 늘어나는 발언 수")
+    parser.add_argument("--presses", type=int, default=3, help="한 시점에 들어오는 같은 요약 요청 수")
+    parser.add_argument("--max-entries", type=int, default=1024)
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--chunk-tokens", type=int, default=24000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-ms", type=float, default=400)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=60)
+    parser.add_argument("--output-ms-per-token", type=float, default=15)
+    parser.add_argument("--output-tokens", type=int, default=500)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="가짜 latency 를 실제로 기다리는 비율")
+    asyncio.run(main(parser.parse_args()))
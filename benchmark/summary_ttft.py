@@ -0,0 +1,67 @@
+"""요약을 한번에 받을 때와 streaming 으로 받을 때의 time-to-first-token 을 비교한다.
+
+가짜 completion client 는 benchmark.summarize_scaling 의 것을 쓴다.
+
+    python -m benchmark.summary_ttft --utterances 100 1000 5000
+"""
+import time
+import asyncio
+import argparse
+from typing import List
+
+from app.model.utterance import Utterance
+from app.service.llm.gpt_service import GptServiceManager
+from benchmark.summarize_scaling import FakeCompletionClient, NullLogger, make_utterances
+
+
+def make_service(args: argparse.Namespace) -> tuple:
+    client = FakeCompletionClient(args.base_ms, args.prefill_ms_per_1k, args.output_ms_per_token, args.output_tokens, args.time_scale)
+    service = GptServiceManager(NullLogger(), client=client, chunk_token_budget=args.chunk_tokens, max_concurrency=args.concurrency)
+
+    return service, client
+
+
+async def blocking(utterances: List[Utterance], args: argparse.Namespace) -> tuple:
+    service, _ = make_service(args)
+
+    started = time.perf_counter()
+    await service.summarize(utterances)
+    elapsed = (time.perf_counter() - started) / args.time_scale
+
+    # 한번에 받으면 첫 글자를 보는 시각이 곧 전체 완료 시각이다.
+    return elapsed, elapsed
+
+
+async def streaming(utterances: List[Utterance], args: argparse.Namespace) -> tuple:
+    service, _ = make_service(args)
+
+    started = time.perf_counter()
+    first_token = None
+    async for _ in service.summarize_stream(utterances):
+        if first_token is None:
+            first_token = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+
+    return first_token / args.time_scale, elapsed / args.time_scale
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'utterances':>10}{'mode':>11}{'ttft s':>9}{'total s':>9}")
+    for count in args.utterances:
+        utterances = make_utterances(count)
+        for mode, run in (("blocking", blocking), ("streaming", streaming)):
+            ttft, total = await run(utterances, args)
+            print(f"{count:>10}{mode:>11}{ttft:>9.2f}{total:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--chunk-tokens", type=int, default=24000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-ms", type=float, default=400)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=60)
+    parser.add_argument("--output-ms-per-token", type=float, default=15)
+    parser.add_argument("--output-tokens", type=int, default=500)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="가짜 latency 를 실제로 기다리는 비율")
+    asyncio.run(main(parser.parse_args()))
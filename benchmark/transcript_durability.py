@@ -0,0 +1,171 @@
+"""확정된 발언을 저장하는 방식별로 처리량과, 프로세스가 죽었을 때 잃을 수 있는 구간(loss window)을 잰다.
+
+- memory      : 기존 방식. qa_list 에만 두므로 /update_qa 전에 죽으면 회의 전체를 잃는다.
+- sync        : 발언마다 insert 를 기다린다. 잃는 것은 없지만 STT loop 가 DB 를 기다린다.
+- write-behind: TranscriptWriter 로 batch 를 모아서 background 에서 쓴다.
+
+DB 대신 commit 지연을 흉내내는 memory 저장소를 쓴다. --lost-ack-every 를 주면 N 번째 batch 마다
+commit 은 되었는데 응답을 못 받은 것처럼 예외를 내서, 재시도 때 중복이 생기지 않는지 확인한다.
+
+    python -m benchmark.transcript_durability --rate 1000 --duration 20 --batch-sizes 10 50
+"""
+import time
+import random
+import asyncio
+import argparse
+from typing import List
+
+from app.model.utterance import Utterance
+from app.service.transcript_writer import TranscriptWriter
+
+
+class MemoryQa:
+    """TranscriptWriter 와 sync 방식이 쓰는 DatabaseManager method 만 memory 로 구현한다."""
+
+    def __init__(self, commit_ms: float, row_ms: float, lost_ack_every: int = 0):
+        self.commit_ms = commit_ms
+        self.row_ms = row_ms
+        self.lost_ack_every = lost_ack_every
+        self.rows: List[dict] = []
+        self.keys: set = set()
+        self.transactions = 0
+        self.ignored = 0
+        self._lock = asyncio.Lock()
+
+    async def _commit(self, rows: List[dict]) -> None:
+        # connection 하나로 쓰는 것처럼 transaction 은 한번에 하나씩 처리한다.
+        async with self._lock:
+            await asyncio.sleep((self.commit_ms + self.row_ms * len(rows)) / 1000)
+            self.transactions += 1
+            for row in rows:
+                # qa.utterance_key 의 UNIQUE index 처럼 같은 key 는 한번만 저장된다.
+                if row.get("utterance_key") is not None and row["utterance_key"] in self.keys:
+                    self.ignored += 1
+                    continue
+                self.keys.add(row.get("utterance_key"))
+                self.rows.append(row)
+
+            if self.lost_ack_every and self.transactions % self.lost_ack_every == 0:
+                raise ConnectionError("Lost connection to MySQL server during query")
+
+    async def upsert_qa_table_bulk(self, data_list: List[dict]) -> None:
+        await self._commit(data_list)
+
+    async def insert_qa_table(self, data: dict) -> None:
+        await self._commit([data])
+
+    async def select_qa_table_with_meeting_id(self, meeting_id: int) -> List[dict]:
+        return [row for row in self.rows if row["meeting_id"] == meeting_id]
+
+
+def make_utterance(i: int) -> Utterance:
+    return Utterance(timestamp="24-06-01 10:00:00", speaker=str(i % 8 + 1), text=f"발언 {i} 회의 안건에 대한 의견입니다.")
+
+
+async def run(mode: str, args: argparse.Namespace, batch_size: int) -> dict:
+    db = MemoryQa(args.commit_ms, args.row_ms, args.lost_ack_every)
+    writer = TranscriptWriter(db, batch_size=batch_size, flush_interval=args.flush_interval, max_backoff=1.0)
+    writer.start()
+
+    rng = random.Random(0)
+    total = int(args.rate * args.duration / 60)
+    interval = 60 / args.rate
+    queued_at: List[float] = []
+    append_latency: List[float] = []
+    worst_unsaved = 0
+    worst_window = 0.0
+
+    started = time.monotonic()
+    for i in range(total):
+        # 발언은 평균 rate 로 들어오지만 간격은 들쭉날쭉하다.
+        await asyncio.sleep(max(0.0, started + i * interval * rng.uniform(0.5, 1.0) - time.monotonic()))
+
+        utterance = make_utterance(i)
+        append_started = time.monotonic()
+        if mode == "sync":
+            row = {"meeting_id": 1, "speaker": utterance.speaker, "timestamp": utterance.timestamp, "message": utterance.text}
+            try:
+                await db.insert_qa_table(row)
+            except ConnectionError:
+                # key 가 없으니 다시 보내면 같은 발언이 두 번 저장된다.
+                await db.insert_qa_table(dict(row))
+        elif mode == "write-behind":
+            writer.append(1, utterance)
+        append_latency.append(time.monotonic() - append_started)
+        queued_at.append(append_started)
+
+        # 지금 죽으면 잃는 발언 수와, 그 중 가장 오래된 발언이 기다린 시간.
+        unsaved = len(queued_at) - len(db.rows)
+        worst_unsaved = max(worst_unsaved, unsaved)
+        if unsaved > 0:
+            worst_window = max(worst_window, time.monotonic() - queued_at[len(db.rows)])
+    elapsed = time.monotonic() - started
+
+    if mode == "write-behind":
+        await writer.stop()
+
+    append_latency.sort()
+    return {
+        "utterances": total,
+        "stored": len(db.rows) if mode != "memory" else 0,
+        "ignored": db.ignored,
+        "transactions": db.transactions,
+        "p99_append_ms": append_latency[int(len(append_latency) * 0.99)] * 1000,
+        "worst_unsaved": worst_unsaved if mode != "memory" else total,
+        "worst_window": worst_window if mode != "memory" else elapsed,
+        "retries": writer.failures,
+    }
+
+
+async def drain_throughput(args: argparse.Namespace, batch_size: int) -> float:
+    db = MemoryQa(args.commit_ms, args.row_ms)
+    writer = TranscriptWriter(db, batch_size=batch_size, flush_interval=args.flush_interval)
+    writer.start()
+
+    started = time.monotonic()
+    for i in range(args.flood):
+        writer.append(1, make_utterance(i))
+    while len(db.rows) < args.flood:
+        await asyncio.sleep(0.001)
+    elapsed = time.monotonic() - started
+    await writer.stop()
+
+    return args.flood / elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    import logging
+    logging.getLogger("uvicorn").setLevel(logging.CRITICAL)
+
+    sync_throughput = 1000 / (args.commit_ms + args.row_ms)
+    print(
+        f"{'mode':<18}{'stored':>8}{'dup ignored':>12}{'tx':>6}{'p99 append ms':>15}"
+        f"{'worst unsaved':>15}{'loss window s':>15}{'max rows/s':>12}"
+    )
+    for mode, batch_size in [("memory", 0), ("sync", 1)] + [("write-behind", size) for size in args.batch_sizes]:
+        result = await run(mode, args, max(batch_size, 1))
+        if mode == "memory":
+            throughput = "-"
+        elif mode == "sync":
+            throughput = f"{sync_throughput:.0f}"
+        else:
+            throughput = f"{await drain_throughput(args, batch_size):.0f}"
+
+        label = mode if mode != "write-behind" else f"{mode}/{batch_size}"
+        print(
+            f"{label:<18}{result['stored']:>8}{result['ignored']:>12}{result['transactions']:>6}"
+            f"{result['p99_append_ms']:>15.2f}{result['worst_unsaved']:>15}{result['worst_window']:>15.2f}{throughput:>12}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=1000, help="분당 확정 발언 수")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--commit-ms", type=float, default=5.0, help="transaction 하나의 고정 지연")
+    parser.add_argument("--row-ms", type=float, default=0.05, help="row 하나당 추가 지연")
+    parser.add_argument("--lost-ack-every", type=int, default=0)
+    parser.add_argument("--flood", type=int, default=5000, help="처리량을 잴 때 한번에 넣는 발언 수")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""WAV 파일에 VAD 를 돌려서 STT 로 보내지 않고 버리는 audio 의 비율을 잰다.
+
+    python -m benchmark.vad_suppression meeting1.wav meeting2.wav
+    python -m benchmark.vad_suppression --energy-threshold 200 --pause-after-ms 3000 meeting.wav
+
+WAV 는 16 kHz mono 16-bit 로 변환해서 websocket 과 같은 100ms chunk 단위로 흘려보낸다.
+파일을 주지 않으면 발화와 배경 잡음이 섞인 1분짜리 신호를 만들어서 쓴다.
+"""
+import math
+import time
+import wave
+import random
+import audioop
+import argparse
+from array import array
+
+from app.provider.audio_manager import SAMPLE_RATE, VoiceActivityDetector
+
+
+def load_wav(path: str) -> bytes:
+    with wave.open(path, "rb") as f:
+        data = f.readframes(f.getnframes())
+        width, channels, rate = f.getsampwidth(), f.getnchannels(), f.getframerate()
+
+    if width != 2:
+        data = audioop.lin2lin(data, width, 2)
+    if channels == 2:
+        data = audioop.tomono(data, 2, 0.5, 0.5)
+    if rate != SAMPLE_RATE:
+        data, _ = audioop.ratecv(data, 2, 1, rate, SAMPLE_RATE, None)
+
+    return data
+
+
+def synthesize(seconds: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    samples = array("h")
+    speaking = False
+
+    for second in range(seconds):
+        # 5초 단위로 40% 확률로 발화, 나머지는 잡음만 있는 침묵
+        if second % 5 == 0:
+            speaking = rng.random() < 0.4
+        for i in range(SAMPLE_RATE):
+            noise = rng.gauss(0, 60)
+            voice = 0.0
+            if speaking:
+                t = (second * SAMPLE_RATE + i) / SAMPLE_RATE
+                envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 3 * t)
+                voice = 3000 * envelope * math.sin(2 * math.pi * 180 * t)
+            samples.append(max(-32768, min(32767, int(voice + noise))))
+
+    return samples.tobytes()
+
+
+def run(name: str, data: bytes, args: argparse.Namespace) -> None:
+    vad = VoiceActivityDetector(
+        energy_threshold=args.energy_threshold,
+        hangover_ms=args.hangover_ms,
+        preroll_ms=args.preroll_ms,
+        pause_after_ms=args.pause_after_ms,
+    )
+    chunk_bytes = SAMPLE_RATE * 2 * args.chunk_ms // 1000
+    forwarded = 0
+
+    started = time.perf_counter()
+    for offset in range(0, len(data), chunk_bytes):
+        forwarded += len(vad.process(data[offset:offset + chunk_bytes]))
+    elapsed = time.perf_counter() - started
+
+    duration = len(data) / (SAMPLE_RATE * 2)
+    print(
+        f"{name:<30}{duration:>9.1f}s{1 - forwarded / len(data):>12.1%}"
+        f"{vad.pauses:>8}{vad.resumes:>9}{elapsed / duration * 1000:>16.3f}"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'file':<30}{'duration':>10}{'suppressed':>12}{'pauses':>8}{'resumes':>9}{'cpu ms/audio s':>16}")
+
+    if not args.files:
+        run("synthetic", synthesize(args.synthetic_seconds), args)
+
+    for path in args.files:
+        run(path, load_wav(path), args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--energy-threshold", type=int, default=300)
+    parser.add_argument("--hangover-ms", type=int, default=400)
+    parser.add_argument("--preroll-ms", type=int, default=300)
+    parser.add_argument("--pause-after-ms", type=int, default=5000)
+    parser.add_argument("--synthetic-seconds", type=int, default=60)
+    main(parser.parse_args())
@@ -0,0 +1,45 @@
+import asyncio
+from typing import List
+
+from app.service.audio_archiver import AudioArchiver, BYTES_PER_MS
+from app.service.broker.memory_broker import InProcessBroker
+
+
+class FakeDatabaseManager:
+    def __init__(self):
+        self.rows: List[dict] = []
+
+    async def upsert_audio_segment_table_bulk(self, data_list: List[dict]) -> None:
+        self.rows.extend(data_list)
+
+
+class FailingArchiver(AudioArchiver):
+    """Fails to open the second segment of speaker 2, as a full disk would."""
+
+    def _open_segment(self, stream, started_at):
+        if stream.speaker == 2 and stream.sequence == 1:
+            raise OSError("No space left on device")
+        super()._open_segment(stream, started_at)
+
+
+def test_segments_closed_before_a_write_error_are_indexed(tmp_path):
+    db = FakeDatabaseManager()
+    # segment 하나가 10 ms 이다.
+    archiver = FailingArchiver(str(tmp_path), db, InProcessBroker(), segment_seconds=0.01)
+
+    async def scenario():
+        archiver.append(1, 1, b"\0" * 25 * BYTES_PER_MS)
+        archiver.append(1, 2, b"\0" * 25 * BYTES_PER_MS)
+        await archiver.flush()
+        stats = archiver.stats()
+        rows = list(db.rows)
+        # 열려 있는 speaker 1 의 마지막 segment 를 닫는다.
+        await archiver.stop()
+        return stats, rows
+
+    stats, rows = asyncio.run(scenario())
+
+    indexed = sorted((row["speaker"], row["sequence"]) for row in rows)
+    assert indexed == [("1", 0), ("1", 1), ("2", 0)]
+    assert stats["write_failures"] == 1
+    assert stats["segments"] == 3
@@ -0,0 +1,66 @@
+import random
+
+from app.provider.audio_buffer import AudioRingBuffer
+
+
+def pcm(start: int, size: int) -> bytes:
+    return bytes((start + i) % 251 for i in range(size))
+
+
+def test_read_returns_written_audio():
+    buffer = AudioRingBuffer(capacity_ms=100, rate=1000, sample_width=2, initial_ms=10)
+    buffer.write(pcm(0, 50))
+    buffer.write(pcm(50, 70))
+
+    assert buffer.end == 120
+    assert buffer.read(0, 120) == pcm(0, 120)
+    assert buffer.read(30, 80) == pcm(30, 50)
+
+
+def test_grows_lazily_up_to_capacity():
+    buffer = AudioRingBuffer(capacity_ms=100, rate=1000, sample_width=2, initial_ms=10)
+    assert buffer.memory_usage == 20
+
+    buffer.write(pcm(0, 30))
+    assert buffer.memory_usage == 40
+
+    buffer.write(pcm(30, 500))
+    assert buffer.memory_usage == buffer.capacity == 200
+
+
+def test_wraps_and_keeps_only_the_last_capacity_bytes():
+    buffer = AudioRingBuffer(capacity_ms=100, rate=1000, sample_width=2, initial_ms=10)
+    rng = random.Random(0)
+    written = 0
+    while written < 1000:
+        size = rng.randint(1, 60)
+        buffer.write(pcm(written, size))
+        written += size
+
+    assert buffer.start == written - 200
+    assert buffer.read(0, written) == pcm(written - 200, 200)
+    assert len(buffer.segments(written - 200, written)) in (1, 2)
+
+
+def test_write_larger_than_capacity_keeps_the_tail():
+    buffer = AudioRingBuffer(capacity_ms=100, rate=1000, sample_width=2, initial_ms=10)
+    buffer.write(pcm(0, 10))
+    buffer.write(pcm(10, 450))
+
+    assert buffer.end == 460
+    assert buffer.read(buffer.start, buffer.end) == pcm(260, 200)
+
+
+def test_segments_clamp_to_retained_audio():
+    buffer = AudioRingBuffer(capacity_ms=100, rate=1000, sample_width=2)
+    buffer.write(pcm(0, 300))
+
+    assert buffer.segments(0, 50) == []
+    assert buffer.read(50, 400) == pcm(100, 200)
+
+
+def test_ms_conversion_aligns_to_samples():
+    buffer = AudioRingBuffer(capacity_ms=1000, rate=16000, sample_width=2)
+
+    assert buffer.ms_to_bytes(10) == 320
+    assert buffer.bytes_to_ms(320) == 10
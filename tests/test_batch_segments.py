@@ -0,0 +1,69 @@
+import os
+import math
+import wave
+import shutil
+import struct
+
+import pytest
+
+from app.service.batch_transcription_service import SAMPLE_RATE, prepare_recording
+
+FFMPEG = shutil.which(os.environ.get("FFMPEG_BINARY", "ffmpeg"))
+
+pytestmark = pytest.mark.skipif(FFMPEG is None, reason="ffmpeg is not installed")
+
+
+def write_wav(path: str, parts: list) -> None:
+    # parts 는 (ms, 소리 여부) 의 목록이다.
+    samples = []
+    for ms, voiced in parts:
+        count = SAMPLE_RATE * ms // 1000
+        samples += [int(5000 * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE)) if voiced else 0 for i in range(count)]
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def plan(tmp_path, parts: list):
+    source = str(tmp_path / "recording.wav")
+    write_wav(source, parts)
+    duration_ms, segments = prepare_recording(
+        FFMPEG, source, str(tmp_path / "recording.pcm"),
+        target_ms=2500, max_ms=5000, overlap_ms=200, min_silence_ms=300,
+    )
+
+    return duration_ms, [(x.start_ms, x.end_ms, x.audio_start_ms, x.audio_end_ms) for x in segments]
+
+
+def test_cuts_in_the_middle_of_silences(tmp_path):
+    duration_ms, segments = plan(tmp_path, [(3000, True), (600, False), (3000, True), (600, False), (900, True)])
+
+    assert duration_ms == 8100
+    assert segments == [
+        (0, 3150, 0, 3350),
+        (3150, 6750, 2950, 6950),
+        (6750, 8100, 6550, 8100),
+    ]
+
+
+def test_cuts_at_max_length_without_silence(tmp_path):
+    _, segments = plan(tmp_path, [(12000, True)])
+
+    assert [(start, end) for start, end, _, _ in segments] == [(0, 5000), (5000, 10000), (10000, 12000)]
+
+
+def test_short_tail_joins_previous_segment(tmp_path):
+    _, segments = plan(tmp_path, [(5200, True)])
+
+    assert [(start, end) for start, end, _, _ in segments] == [(0, 5200)]
+
+
+def test_undecodable_file_is_rejected(tmp_path):
+    source = tmp_path / "broken.wav"
+    source.write_bytes(b"not audio")
+
+    with pytest.raises(ValueError):
+        prepare_recording(FFMPEG, str(source), str(tmp_path / "broken.pcm"), 2500, 5000, 200, 300)
@@ -0,0 +1,49 @@
+import json
+import asyncio
+
+import pytest
+
+from app.service.broker.base import BrokerError
+from app.service.broker.memory_broker import InProcessBroker
+from app.service.broker.unix_broker import UnixSocketBroker
+from app.service.chat_service import ChatServiceManager
+
+
+class UnreachableBroker(InProcessBroker):
+    async def get_state(self, key: str) -> dict[str, str]:
+        raise BrokerError("unreachable")
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def test_unix_broker_raises_broker_error_when_disconnected(tmp_path):
+    broker = UnixSocketBroker(str(tmp_path / "broker.sock"))
+
+    with pytest.raises(BrokerError):
+        asyncio.run(broker.get_state("chat:mic"))
+
+
+def test_chat_falls_back_to_local_mic_status():
+    async def scenario():
+        manager = ChatServiceManager(broker=UnreachableBroker())
+        websocket = RecordingWebSocket()
+        await manager.connect(websocket, 3)
+        await manager.drain()
+        manager.end_meeting()
+
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+    assert sent[0] == {"type": "micList", "message": [{"id": 3, "type": "mic", "status": "on"}]}
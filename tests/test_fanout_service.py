@@ -0,0 +1,37 @@
+import asyncio
+
+from app.service.chat_service import ChatServiceManager
+
+
+class StalledWebSocket:
+    def __init__(self):
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        # 받지 않는 client 처럼 영원히 끝나지 않는다.
+        await asyncio.Event().wait()
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+def test_evicted_subscriber_is_disconnected_from_chat():
+    async def scenario():
+        manager = ChatServiceManager(send_timeout=0.05)
+        websocket = StalledWebSocket()
+        await manager.connect(websocket, 7)
+        assert manager.active_connections == {7: websocket}
+
+        await asyncio.sleep(0.2)
+
+        assert 7 not in manager.active_connections
+        assert 7 not in manager.mic_status
+        assert 7 not in manager.fanout.subscribers
+        assert manager.fanout.evicted == 1
+        assert await manager.broker.get_state(manager.mic_key) == {}
+        assert websocket.closed_with == 1008
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+
+from app.service.llm.gpt_service import GptServiceManager
+
+
+class FakeGptService(GptServiceManager):
+    """Answers every prompt with a short fixed text and records the prompts."""
+
+    def __init__(self, chunk_token_budget: int):
+        super().__init__(logging.getLogger("test"), client=object(), chunk_token_budget=chunk_token_budget)
+        self.prompts = []
+
+    async def _complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return f"요약{len(self.prompts)}"
+
+
+def test_split_windows_respects_budget():
+    service = FakeGptService(chunk_token_budget=10)
+    items = ["a" * 12, "b" * 12, "c" * 12, "d" * 40]
+
+    windows = service._split_windows(items)
+
+    # 12 byte 는 5 token 이므로 둘씩 묶이고, budget 보다 큰 항목은 혼자 한 구간이 된다.
+    assert windows == [["a" * 12, "b" * 12], ["c" * 12], ["d" * 40]]
+    assert [item for window in windows for item in window] == items
+
+
+def test_split_windows_keeps_small_input_in_one_window():
+    service = FakeGptService(chunk_token_budget=1000)
+
+    assert service._split_windows(["a", "b", "c"]) == [["a", "b", "c"]]
+    assert service._split_windows([]) == [[]]
+
+
+def test_merge_until_fits_reduces_oversized_summaries():
+    service = FakeGptService(chunk_token_budget=10)
+    summaries = ["가" * 30] * 5
+
+    merged = asyncio.run(service._merge_until_fits(summaries))
+
+    assert len(service._split_windows(merged)) == 1
+    assert len(service.prompts) >= 3
+
+
+def test_reduce_summaries_merges_then_reduces_once():
+    service = FakeGptService(chunk_token_budget=1000)
+
+    result = asyncio.run(service.reduce_summaries(["첫 구간", "둘째 구간"]))
+
+    assert result == "요약1"
+    assert len(service.prompts) == 1
+    assert "첫 구간" in service.prompts[0] and "둘째 구간" in service.prompts[0]
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("boto3")
+
+from fastapi import HTTPException
+
+from app.service.storage_service import StorageServiceManager
+
+parse_range = StorageServiceManager.parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        (" bytes=0-0 ", (0, 0)),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=-", "items=0-10", "bytes=0-10,20-30", "bytes=1000-", "bytes=50-10"])
+def test_invalid_range_is_416(header):
+    with pytest.raises(HTTPException) as error:
+        parse_range(header, 1000)
+
+    assert error.value.status_code == 416
+    assert error.value.headers == {"Content-Range": "bytes */1000"}
@@ -0,0 +1,117 @@
+import time
+import asyncio
+
+import pytest
+
+from app.service.llm.summary_cache import CacheEntry, SummaryCache
+
+
+def make_entry(value: str, created_at: float = None) -> CacheEntry:
+    return CacheEntry(value=value, tokens=10, seconds=1.5, created_at=time.time() if created_at is None else created_at)
+
+
+def test_make_key_separates_parts():
+    assert SummaryCache.make_key("ab", "c") != SummaryCache.make_key("a", "bc")
+    assert SummaryCache.make_key("model", "prompt") == SummaryCache.make_key("model", "prompt")
+
+
+def test_get_or_compute_caches_value():
+    cache = SummaryCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return make_entry("summary")
+
+    async def run():
+        first = await cache.get_or_compute("key", compute)
+        second = await cache.get_or_compute("key", compute)
+        return first, second
+
+    assert asyncio.run(run()) == ("summary", "summary")
+    assert len(calls) == 1
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["saved_tokens"] == 10
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_concurrent_requests_share_one_call():
+    cache = SummaryCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return make_entry("summary")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["summary"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_failure_is_not_cached():
+    cache = SummaryCache()
+
+    async def fail():
+        raise RuntimeError("upstream")
+
+    async def compute():
+        return make_entry("summary")
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("key", fail)
+        return await cache.get_or_compute("key", compute)
+
+    assert asyncio.run(run()) == "summary"
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction():
+    cache = SummaryCache(max_entries=2)
+
+    async def run():
+        await cache.put("a", make_entry("A"))
+        await cache.put("b", make_entry("B"))
+        await cache.get("a")
+        await cache.put("c", make_entry("C"))
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    # "b" 가 가장 오래 안 쓰였으므로 밀려난다.
+    assert asyncio.run(run()) == ["A", None, "C"]
+
+
+def test_expired_entry_is_a_miss():
+    cache = SummaryCache(ttl=60)
+
+    async def run():
+        await cache.put("key", make_entry("summary", created_at=time.time() - 120))
+        return await cache.get("key")
+
+    assert asyncio.run(run()) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_entries_survive_restart(tmp_path):
+    async def run():
+        await SummaryCache(directory=str(tmp_path)).put("key", make_entry("summary"))
+        restarted = SummaryCache(directory=str(tmp_path))
+        return await restarted.get("key"), restarted.stats()
+
+    value, stats = asyncio.run(run())
+    assert value == "summary"
+    assert stats["disk_hits"] == 1
+
+
+def test_record_miss_counts_in_stats():
+    cache = SummaryCache()
+    cache.record_miss()
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["requests"] == 1
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+
+from app.provider.migrations import DATETIME_FORMATS, DATETIME_PATTERN
+from app.util.time_util import TimeUtil
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-06-01 10:00", "2024-06-01 10:00:00"),
+        ("2024-06-01 10:00:05", "2024-06-01 10:00:05"),
+        ("2024-6-1 9:5", "2024-06-01 09:05:00"),
+        ("2024-06-01", "2024-06-01 00:00:00"),
+        ("24-06-01 10:00:00", "2024-06-01 10:00:00"),
+        ("99-01-01 00:00:00", "2099-01-01 00:00:00"),
+        ("2024-06-01T10:00:00", "2024-06-01 10:00:00"),
+        ("2024-06-01T10:00:00.123Z", "2024-06-01 19:00:00"),
+        ("2024-06-01T20:30Z", "2024-06-02 05:30:00"),
+        (" 2024-06-01 10:00 ", "2024-06-01 10:00:00"),
+    ],
+)
+def test_normalize_timestamp(value, expected):
+    assert TimeUtil.normalize_timestamp(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["", "tomorrow 10am", "2024-06-01T10:00+09:00", "2024-13-01 10:00", "2024-06-31", "2024/06/01 10:00", "2024-06-01Z"],
+)
+def test_normalize_timestamp_rejects_unsupported_values(value):
+    with pytest.raises(ValueError):
+        TimeUtil.normalize_timestamp(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["24-06-01 10:00:00", "2024-06-01 10:00", "2024-06-01T10:00:00.123Z", "2024-06-01", "tomorrow 10am"],
+)
+def test_migration_accepts_the_same_formats(value):
+    # migration v5 의 SQL 이 기존 row 를 읽는 규칙과 /reserve 가 새 값을 읽는 규칙이 같아야 한다.
+    try:
+        TimeUtil.normalize_timestamp(value)
+        accepted = True
+    except ValueError:
+        accepted = False
+
+    assert bool(re.match(DATETIME_PATTERN, value)) == accepted
+
+    if accepted:
+        trimmed = value.replace("T", " ").split(".")[0].rstrip("Z")
+        if re.match(r"^[0-9]{2}-", trimmed):
+            trimmed = "20" + trimmed
+        assert any(re.match(pattern, trimmed) for pattern, _ in DATETIME_FORMATS)
@@ -0,0 +1,83 @@
+import asyncio
+
+from app.service.transcript_coalescer import InterimCoalescer
+
+
+def interim(text: str) -> dict:
+    return {"message": text, "is_done": False}
+
+
+def final(text: str) -> dict:
+    return {"message": text, "is_done": True}
+
+
+def run(scenario):
+    sent = []
+
+    async def send(message: dict) -> None:
+        sent.append(message["message"])
+
+    async def main():
+        with InterimCoalescer(send, max_interim_per_second=10) as coalescer:
+            await scenario(coalescer)
+            return coalescer.received, coalescer.sent
+
+    received, count = asyncio.run(main())
+    assert count == len(sent)
+    return sent, received
+
+
+def test_burst_sends_first_and_latest_interim():
+    async def scenario(coalescer):
+        for text in ("안", "안녕", "안녕하", "안녕하세"):
+            await coalescer.push(interim(text))
+        await asyncio.sleep(0.15)
+
+    sent, received = run(scenario)
+    assert sent == ["안", "안녕하세"]
+    assert received == 4
+
+
+def test_final_is_sent_at_once_and_drops_pending_interim():
+    async def scenario(coalescer):
+        await coalescer.push(interim("안"))
+        await coalescer.push(interim("안녕"))
+        await coalescer.push(final("안녕하세요"))
+        await asyncio.sleep(0.15)
+
+    sent, _ = run(scenario)
+    assert sent == ["안", "안녕하세요"]
+
+
+def test_spaced_interims_are_all_sent():
+    async def scenario(coalescer):
+        for text in ("하나", "하나 둘", "하나 둘 셋"):
+            await coalescer.push(interim(text))
+            await asyncio.sleep(0.12)
+
+    sent, _ = run(scenario)
+    assert sent == ["하나", "하나 둘", "하나 둘 셋"]
+
+
+def test_zero_rate_disables_coalescing():
+    sent = []
+
+    async def send(message: dict) -> None:
+        sent.append(message["message"])
+
+    async def main():
+        coalescer = InterimCoalescer(send, max_interim_per_second=0)
+        for text in ("a", "ab", "abc"):
+            await coalescer.push(interim(text))
+
+    asyncio.run(main())
+    assert sent == ["a", "ab", "abc"]
+
+
+def test_exit_cancels_pending_interim():
+    async def scenario(coalescer):
+        await coalescer.push(interim("안"))
+        await coalescer.push(interim("안녕"))
+
+    sent, _ = run(scenario)
+    assert sent == ["안"]
@@ -0,0 +1,119 @@
+import asyncio
+from typing import List
+
+from app.model.utterance import Utterance
+from app.service.transcript_writer import TranscriptWriter
+
+
+class FakeDatabaseManager:
+    """Stores qa rows by utterance_key; fails the next ``fail`` writes."""
+
+    def __init__(self, fail: int = 0, commit_then_fail: bool = False):
+        self.rows: dict[str, dict] = {}
+        self.calls = 0
+        self.fail = fail
+        self.commit_then_fail = commit_then_fail
+
+    async def upsert_qa_table_bulk(self, data_list: List[dict]) -> None:
+        self.calls += 1
+        if self.fail > 0:
+            self.fail -= 1
+            if self.commit_then_fail:
+                # commit 은 됐지만 응답을 받지 못한 경우
+                for data in data_list:
+                    self.rows.setdefault(data["utterance_key"], data)
+            raise ConnectionError("lost connection")
+
+        for data in data_list:
+            self.rows.setdefault(data["utterance_key"], data)
+
+    async def select_qa_table_with_meeting_id(self, meeting_id: int) -> List[dict]:
+        return [row for row in self.rows.values() if row["meeting_id"] == meeting_id]
+
+
+def utterance(i: int) -> Utterance:
+    return Utterance(timestamp=f"24-06-01 10:00:{i:02d}", speaker="1", text=f"발언 {i}")
+
+
+def test_flush_writes_in_batches_and_order():
+    db = FakeDatabaseManager()
+    writer = TranscriptWriter(db, batch_size=2)
+    for i in range(5):
+        writer.append(7, utterance(i))
+
+    asyncio.run(writer.flush())
+
+    assert db.calls == 3
+    assert [row["message"] for row in db.rows.values()] == [f"발언 {i}" for i in range(5)]
+    assert writer.stats()["pending"] == 0
+    assert writer.stats()["written"] == 5
+
+
+def test_failed_batch_is_retried_without_duplicates():
+    db = FakeDatabaseManager(fail=1, commit_then_fail=True)
+    writer = TranscriptWriter(db, batch_size=10)
+    for i in range(3):
+        writer.append(7, utterance(i))
+
+    async def scenario():
+        try:
+            await writer.flush()
+        except ConnectionError:
+            pass
+        assert writer.stats()["pending"] == 3
+        await writer.flush()
+
+    asyncio.run(scenario())
+
+    assert len(db.rows) == 3
+    assert writer.stats()["pending"] == 0
+
+
+def test_load_includes_unwritten_utterances_once():
+    db = FakeDatabaseManager()
+    writer = TranscriptWriter(db, batch_size=2)
+
+    async def scenario():
+        writer.append(7, utterance(0))
+        writer.append(7, utterance(1))
+        await writer.flush()
+        writer.append(7, utterance(2))
+        writer.append(8, utterance(3))
+        return await writer.load(7)
+
+    loaded = asyncio.run(scenario())
+
+    assert [x.text for x in loaded] == ["발언 0", "발언 1", "발언 2"]
+
+
+def test_background_task_flushes_after_interval_and_stop_drains():
+    db = FakeDatabaseManager()
+    writer = TranscriptWriter(db, batch_size=100, flush_interval=0.05)
+
+    async def scenario():
+        writer.start()
+        writer.append(7, utterance(0))
+        await asyncio.sleep(0.2)
+        written = len(db.rows)
+        writer.append(7, utterance(1))
+        await writer.stop()
+        return written
+
+    assert asyncio.run(scenario()) == 1
+    assert len(db.rows) == 2
+
+
+def test_run_backs_off_after_failure():
+    db = FakeDatabaseManager(fail=1)
+    writer = TranscriptWriter(db, batch_size=1, flush_interval=0.02)
+
+    async def scenario():
+        writer.start()
+        writer.append(7, utterance(0))
+        await asyncio.sleep(0.2)
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert writer.stats()["failures"] == 1
+    assert len(db.rows) == 1
@@ -0,0 +1,76 @@
+import math
+import struct
+
+from app.provider.audio_manager import VoiceActivityDetector
+
+RATE = 16000
+FRAME_BYTES = RATE * 2 * 20 // 1000
+
+
+def silence(ms: int) -> bytes:
+    return b"\0" * (RATE * 2 * ms // 1000)
+
+
+def tone(ms: int, amplitude: int = 5000, frequency: int = 220) -> bytes:
+    samples = RATE * ms // 1000
+    return struct.pack(
+        f"<{samples}h", *(int(amplitude * math.sin(2 * math.pi * frequency * i / RATE)) for i in range(samples))
+    )
+
+
+def make_detector() -> VoiceActivityDetector:
+    return VoiceActivityDetector(hangover_ms=100, preroll_ms=60, pause_after_ms=400)
+
+
+def test_silence_is_suppressed():
+    vad = make_detector()
+
+    assert vad.process(silence(1000)) == b""
+    assert vad.suppressed_ratio == 1.0
+    assert vad.paused
+
+
+def test_speech_is_forwarded_with_preroll_and_hangover():
+    vad = make_detector()
+    forwarded = vad.process(silence(200) + tone(200) + silence(400))
+
+    # 발화 앞 60 ms, 발화 200 ms, 뒤 100 ms
+    assert len(forwarded) == len(silence(60) + tone(200) + silence(100))
+    assert forwarded.startswith(silence(60) + tone(200)[:FRAME_BYTES])
+    assert vad.resumes == 1
+
+
+def test_long_silence_pauses_until_speech_returns():
+    vad = make_detector()
+    vad.process(tone(100))
+    assert not vad.paused
+
+    vad.process(silence(500))
+    assert vad.paused
+    assert vad.pauses == 1
+
+    vad.process(tone(40))
+    assert not vad.paused
+    assert vad.resumes == 2
+
+
+def test_chunks_need_not_align_with_frames():
+    audio = silence(100) + tone(300) + silence(300)
+    whole = make_detector().process(audio)
+
+    vad = make_detector()
+    pieces = b"".join(vad.process(audio[offset:offset + 333]) for offset in range(0, len(audio), 333))
+
+    assert pieces == whole
+
+
+def test_threshold_follows_noise_floor():
+    hum = tone(100, amplitude=550, frequency=50)
+    assert make_detector().process(hum) != b""
+
+    vad = make_detector()
+    # 기준보다 작은 잡음이 계속되면 noise floor 가 올라가서 비슷한 크기의 소리는 더 이상 발화가 아니다.
+    vad.process(tone(2000, amplitude=200, frequency=50))
+    assert vad.noise_floor > 100
+
+    assert vad.process(hum) == b""